@@ -18,9 +18,8 @@ class AdminWindow:
 
     def ver_usuarios(self):
         try:
-            with open("usuarios.json", "r") as f:
-                import json
-                usuarios = json.load(f)
+            from user_manager import coleccion_usuarios
+            usuarios = dict(coleccion_usuarios().items())
             mensaje = "\n".join([f"{u} - {data['email']}" for u, data in usuarios.items()])
             messagebox.showinfo("Usuarios Registrados", mensaje)
         except Exception as e:
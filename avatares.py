@@ -0,0 +1,190 @@
+import hashlib
+import os
+
+from PIL import Image, ImageOps, ImageTk, features
+
+from storage import ajustar_contador, transaccion
+
+# -----------------------------------------------------------------------------
+# avatares.py – Avatares de usuario con miniaturas y caché de imágenes
+# -----------------------------------------------------------------------------
+# Antes el perfil abría la imagen original (a veces de varios MB) con PIL y la
+# redimensionaba cada vez que se mostraba. Ahora, al subir un avatar se generan
+# miniaturas cuadradas de tamaño fijo (TAMANOS) en avatars/miniaturas, en WebP
+# si PIL lo soporta (PNG si no). Mostrar un avatar solo decodifica la miniatura
+# de unos pocos KB, y los ImageTk.PhotoImage ya creados se guardan en una caché
+# LRU de MAX_IMAGENES_EN_CACHE imágenes, así que perfiles, chats y listas de
+# miembros pueden mostrar el mismo avatar sin volver a decodificarlo.
+#
+# Los avatares se guardan por contenido: avatars/contenido/<sha256><ext>, donde
+# el hash es el del archivo subido. La misma imagen subida por muchos usuarios
+# se guarda una sola vez y cada ruta es inmutable (se puede cachear para
+# siempre). Al guardarla se reduce a MAX_LADO_AVATAR px como máximo, así que
+# ningún avatar ocupa más que unos pocos KB. Un contador de referencias en la
+# base (storage.ajustar_contador) dice cuántos usuarios la usan: el archivo se
+# borra cuando el último deja de usarla. Sumar una referencia y mirar si el
+# archivo existe, o restarla y borrarlo, se hace dentro de una transacción
+# (con el bloqueo de escritura de la base), así que otro proceso no puede
+# reutilizar un avatar mientras se borra.
+#
+# Los avatares subidos antes de este cambio (avatars/<usuario><ext>) y el
+# avatar por defecto siguen funcionando y obtienen sus miniaturas la primera
+# vez que se muestran.
+# -----------------------------------------------------------------------------
+
+DIRECTORIO_AVATARES = "avatars"
+DIRECTORIO_CONTENIDO = os.path.join(DIRECTORIO_AVATARES, "contenido")
+DIRECTORIO_MINIATURAS = os.path.join(DIRECTORIO_AVATARES, "miniaturas")
+AVATAR_PREDETERMINADO = os.path.join(DIRECTORIO_AVATARES, "default_avatar.png")
+
+TAMANOS = (100, 48, 32)  # Perfil, listas, listas compactas
+MAX_IMAGENES_EN_CACHE = 256
+MAX_LADO_AVATAR = 256
+MAX_BYTES_ORIGEN = 20 * 1024 * 1024
+
+if features.check("webp"):
+    FORMATO, EXTENSION = "WEBP", ".webp"
+else:
+    FORMATO, EXTENSION = "PNG", ".png"
+
+# ruta de la miniatura -> (intérprete Tk, PhotoImage), de la menos a la más usada
+_imagenes = {}
+
+
+def ruta_avatar(datos):
+    """Ruta del avatar de un usuario (sus datos), o la del avatar por defecto."""
+    ruta = (datos or {}).get("avatar")
+    return ruta if ruta and os.path.exists(ruta) else AVATAR_PREDETERMINADO
+
+
+def ruta_miniatura(ruta, tamano):
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return os.path.join(DIRECTORIO_MINIATURAS, f"{nombre}_{tamano}{EXTENSION}")
+
+
+def _hash_de(ruta):
+    """sha256 hexadecimal del contenido del archivo, leído por bloques."""
+    resumen = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 16), b""):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+def _contador(ruta):
+    """Nombre del contador de referencias de un avatar por contenido, o None."""
+    if os.path.normpath(os.path.dirname(ruta)) != os.path.normpath(DIRECTORIO_CONTENIDO):
+        return None
+    return "avatar:" + os.path.splitext(os.path.basename(ruta))[0]
+
+
+def _abrir(ruta):
+    """Imagen RGBA orientada según EXIF (los JPEG se decodifican ya reducidos)."""
+    with Image.open(ruta) as original:
+        original.draft("RGB", (MAX_LADO_AVATAR, MAX_LADO_AVATAR))
+        return ImageOps.exif_transpose(original).convert("RGBA")
+
+
+def generar_miniaturas(ruta, imagen=None):
+    """Crea (o rehace) las miniaturas de TAMANOS para el avatar en *ruta*."""
+    os.makedirs(DIRECTORIO_MINIATURAS, exist_ok=True)
+    if imagen is None:
+        imagen = _abrir(ruta)
+    for tamano in TAMANOS:
+        miniatura = ruta_miniatura(ruta, tamano)
+        ImageOps.fit(imagen, (tamano, tamano), Image.LANCZOS).save(miniatura, FORMATO)
+        _imagenes.pop(miniatura, None)
+
+
+def imagen_avatar(ruta, tamano, master):
+    """
+    PhotoImage cuadrada de *tamano* px (uno de TAMANOS) del avatar en *ruta*.
+
+    Args:
+        ruta (str): Ruta del avatar (ver ruta_avatar()).
+        tamano (int): Lado de la miniatura.
+        master (tk.Misc): Widget de la ventana donde se mostrará.
+
+    Returns:
+        ImageTk.PhotoImage o None si la imagen no existe o no se puede leer.
+    """
+    miniatura = ruta_miniatura(ruta, tamano)
+    entrada = _imagenes.pop(miniatura, None)
+    # Las imágenes de Tk pertenecen a un intérprete: tras cerrar la ventana raíz no sirven
+    if entrada is None or entrada[0] is not master.tk:
+        try:
+            # Un avatar por contenido nunca cambia; uno antiguo puede haberse reemplazado
+            if not os.path.exists(miniatura) or (
+                    _contador(ruta) is None and os.path.getmtime(miniatura) < os.path.getmtime(ruta)):
+                generar_miniaturas(ruta)
+            with Image.open(miniatura) as imagen:
+                entrada = (master.tk, ImageTk.PhotoImage(imagen, master=master))
+        except OSError:
+            return None
+        if len(_imagenes) >= MAX_IMAGENES_EN_CACHE:
+            del _imagenes[next(iter(_imagenes))]  # La menos usada
+    _imagenes[miniatura] = entrada
+    return entrada[1]
+
+
+def guardar_avatar(ruta_origen):
+    """
+    Guarda la imagen elegida como avatar (una vez por contenido) y suma una referencia.
+
+    Quien la usa debe guardar la ruta devuelta en el campo "avatar" del
+    usuario y llamar a liberar_avatar() con la ruta anterior.
+
+    Returns:
+        str: Ruta del avatar guardado.
+
+    Raises:
+        ValueError: Si el archivo supera MAX_BYTES_ORIGEN.
+        OSError: Si el archivo no se puede leer o no es una imagen.
+    """
+    if os.path.getsize(ruta_origen) > MAX_BYTES_ORIGEN:
+        raise ValueError(f"La imagen no puede superar {MAX_BYTES_ORIGEN // (1024 * 1024)} MB.")
+    resumen = _hash_de(ruta_origen)
+    ruta = os.path.join(DIRECTORIO_CONTENIDO, resumen + EXTENSION)
+
+    # Con el bloqueo de la transacción, liberar_avatar() no puede estar borrándolo
+    # a la vez; una vez sumada la referencia ya no lo borrará
+    with transaccion():
+        ajustar_contador(_contador(ruta), 1)
+        if os.path.exists(ruta):
+            return ruta
+    try:
+        imagen = _abrir(ruta_origen)
+        imagen.thumbnail((MAX_LADO_AVATAR, MAX_LADO_AVATAR), Image.LANCZOS)
+        os.makedirs(DIRECTORIO_CONTENIDO, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        imagen.save(temporal, FORMATO)
+        os.replace(temporal, ruta)  # Nunca queda un avatar a medio escribir
+        generar_miniaturas(ruta, imagen)
+    except OSError:
+        ajustar_contador(_contador(ruta), -1)
+        raise
+    return ruta
+
+
+def liberar_avatar(ruta):
+    """
+    Quita una referencia al avatar en *ruta* y lo borra si ya nadie lo usa.
+
+    Los avatares antiguos (uno por usuario) se borran directamente; el avatar
+    por defecto nunca.
+    """
+    if not ruta or os.path.normpath(ruta) == os.path.normpath(AVATAR_PREDETERMINADO):
+        return
+    contador = _contador(ruta)
+    # Restar y borrar en la misma transacción: ningún guardar_avatar() de otro
+    # proceso puede sumar una referencia y dar el archivo por existente en medio
+    with transaccion():
+        if contador is not None and ajustar_contador(contador, -1) > 0:
+            return
+        for tamano in TAMANOS:
+            miniatura = ruta_miniatura(ruta, tamano)
+            _imagenes.pop(miniatura, None)
+            if os.path.exists(miniatura):
+                os.remove(miniatura)
+        if os.path.exists(ruta):
+            os.remove(ruta)
@@ -0,0 +1,112 @@
+"""
+Mide el tiempo de arranque hasta la ventana de login y hasta la ventana principal.
+
+Cada medición se hace en un proceso nuevo con `python -X importtime`, así que
+refleja un arranque en frío de los módulos de Teamder (los .pyc ya compilados).
+Para cada etapa se muestra el tiempo total de importación (mediana de
+--repeticiones) y los módulos que más pesan. Con --ventanas también se crean
+las ventanas de verdad (hace falta un display, p. ej. xvfb-run) y se mide el
+tiempo hasta que quedan dibujadas.
+
+Uso:
+    python benchmarks/bench_arranque.py
+    python benchmarks/bench_arranque.py --repeticiones 10 --detalle 15
+    xvfb-run python benchmarks/bench_arranque.py --ventanas
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# etapa -> código que la alcanza
+IMPORTACIONES = {
+    "login": "import login_window",
+    "principal": "import login_window, main_window",
+}
+
+VENTANAS = {
+    "login": (
+        "import tkinter as tk\n"
+        "from login_window import LoginWindow\n"
+        "root = tk.Tk()\n"
+        "LoginWindow(root)\n"
+    ),
+    "principal": (
+        "import tkinter as tk\n"
+        "import login_window\n"
+        "from main_window import MainWindow\n"
+        "root = tk.Tk()\n"
+        "MainWindow(root, 'benchmark')\n"
+    ),
+}
+
+
+def importar(codigo):
+    """
+    Ejecuta *codigo* con -X importtime.
+
+    Returns:
+        tuple: (tiempo total de importación en ms, lista de (ms acumulados, módulo)).
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    modulos = []
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        acumulado = int(acumulado) / 1000
+        modulos.append((acumulado, nombre.strip()))
+        if not nombre.startswith("  "):  # Solo los de primer nivel, para no contar dos veces
+            total += acumulado
+    return total, modulos
+
+
+def abrir(codigo):
+    """Tiempo (ms) desde el inicio del proceso hasta que la ventana queda dibujada."""
+    programa = (
+        "import time\n"
+        "inicio = time.perf_counter()\n"
+        + codigo +
+        "root.update()\n"
+        "print((time.perf_counter() - inicio) * 1000)\n"
+        "root.destroy()\n"
+    )
+    resultado = subprocess.run([sys.executable, "-c", programa], cwd=RAIZ,
+                               capture_output=True, text=True, check=True)
+    return float(resultado.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--detalle", type=int, default=10, help="módulos más lentos a mostrar por etapa")
+    parser.add_argument("--ventanas", action="store_true", help="crear las ventanas (requiere display)")
+    args = parser.parse_args()
+
+    for etapa, codigo in IMPORTACIONES.items():
+        tiempos = []
+        for _ in range(args.repeticiones):
+            total, modulos = importar(codigo)
+            tiempos.append(total)
+        print(f"\n== {etapa}: importaciones {statistics.median(tiempos):.1f} ms "
+              f"(mín {min(tiempos):.1f}, máx {max(tiempos):.1f})")
+        for acumulado, nombre in sorted(modulos, reverse=True)[:args.detalle]:
+            print(f"{acumulado:>10.1f} ms  {nombre}")
+
+    if args.ventanas:
+        print()
+        for etapa, codigo in VENTANAS.items():
+            tiempos = [abrir(codigo) for _ in range(args.repeticiones)]
+            print(f"hasta ventana {etapa}: {statistics.median(tiempos):.1f} ms "
+                  f"(mín {min(tiempos):.1f}, máx {max(tiempos):.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Mide cuánto tarda verificar una contraseña con distintos costes de hash.
+
+Sirve para elegir SCRYPT_N (o PBKDF2_ITERACIONES) en user_manager.py de modo
+que un login tarde menos de --objetivo milisegundos en la máquina actual.
+
+Uso:
+    python benchmarks/bench_claves.py
+    python benchmarks/bench_claves.py --repeticiones 20 --objetivo 100
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_manager  # noqa: E402
+
+
+def medir(guardada, repeticiones):
+    """Tiempos (ms) de verificar_clave sobre una clave ya hasheada."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        user_manager.verificar_clave("contraseña de prueba", guardada)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--objetivo", type=float, default=100.0, help="latencia máxima de login en ms")
+    args = parser.parse_args()
+
+    if user_manager._HAY_SCRYPT:
+        nombre = "scrypt n"
+        costes = [2 ** k for k in range(12, 19)]
+        hashear = lambda coste: user_manager.hashear_clave("contraseña de prueba", n=coste)
+        actual = user_manager.SCRYPT_N
+    else:
+        nombre = "pbkdf2 iteraciones"
+        costes = [50_000, 100_000, 200_000, 400_000, 800_000, 1_600_000]
+        hashear = lambda coste: user_manager.hashear_clave("contraseña de prueba", iteraciones=coste)
+        actual = user_manager.PBKDF2_ITERACIONES
+
+    print(f"{nombre:>20} {'mediana ms':>12} {'p95 ms':>10} {'logins/s':>10}")
+    recomendado = None
+    for coste in costes:
+        tiempos = sorted(medir(hashear(coste), args.repeticiones))
+        mediana = statistics.median(tiempos)
+        p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+        marca = "  (actual)" if coste == actual else ""
+        print(f"{coste:>20} {mediana:>12.1f} {p95:>10.1f} {1000 / mediana:>10.1f}{marca}")
+        if p95 <= args.objetivo:
+            recomendado = coste
+
+    if recomendado is None:
+        print(f"\nNingún coste probado queda por debajo de {args.objetivo:.0f} ms.")
+    else:
+        print(f"\nMayor coste con p95 <= {args.objetivo:.0f} ms: {recomendado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Mide la latencia de "Buscar coincidencias" (top K) con usuarios sintéticos.
+
+Genera --usuarios usuarios con juegos de JUEGOS_DISPONIBLES y juegos
+personalizados hasta tener --juegos juegos distintos (popularidad tipo Zipf),
+construye IndiceAficiones y compara, para cada similitud, el recorrido por
+candidatos en Python con la matriz dispersa de NumPy/SciPy (si está instalada).
+
+Uso:
+    python benchmarks/bench_emparejamiento.py
+    python benchmarks/bench_emparejamiento.py --usuarios 100000 --consultas 50 --k 20
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import emparejamiento  # noqa: E402
+from conexion_gamer_window import JUEGOS_DISPONIBLES  # noqa: E402
+
+
+class UsuariosSinteticos:
+    """Lo mínimo de ColeccionEnCache que usa IndiceAficiones, sin base de datos."""
+
+    version = 1
+
+    def __init__(self, registros):
+        self.registros = registros
+
+    def version_vigente(self):
+        return self.version
+
+    def items(self):
+        return self.registros.items()
+
+
+def generar(cantidad, juegos, semilla):
+    """Diccionario usuario -> datos con favoritos y, a veces, un juego personalizado."""
+    azar = random.Random(semilla)
+    personalizados = [f"Juego personalizado {i}" for i in range(juegos - len(JUEGOS_DISPONIBLES))]
+    pesos_lista = list(itertools.accumulate(1 / (i + 1) for i in range(len(JUEGOS_DISPONIBLES))))
+    pesos_otros = list(itertools.accumulate(1 / (i + 1) for i in range(len(personalizados))))
+
+    usuarios = {}
+    for i in range(cantidad):
+        favoritos = set(azar.choices(JUEGOS_DISPONIBLES, cum_weights=pesos_lista, k=azar.randint(1, 4)))
+        datos = {"juegos_favoritos": sorted(favoritos), "juegos_personalizados": []}
+        if personalizados and azar.random() < 0.6:
+            datos["juegos_personalizados"] = azar.choices(personalizados, cum_weights=pesos_otros)
+        usuarios[f"usuario{i}"] = datos
+    return usuarios
+
+
+def medir(indice, consultas, k, similitud):
+    """Tiempos (ms) de coincidencias() para cada usuario de *consultas*."""
+    tiempos = []
+    for usuario in consultas:
+        juegos = indice.juegos_por_usuario[usuario]
+        inicio = time.perf_counter()
+        indice.coincidencias(usuario, juegos, k, similitud)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return sorted(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, default=1_000_000)
+    parser.add_argument("--juegos", type=int, default=10_000, help="juegos distintos, incluidos los personalizados")
+    parser.add_argument("--consultas", type=int, default=20)
+    parser.add_argument("--k", type=int, default=emparejamiento.MAX_COINCIDENCIAS)
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    usuarios = generar(args.usuarios, args.juegos, args.semilla)
+    print(f"Generados {len(usuarios)} usuarios en {time.perf_counter() - inicio:.1f} s")
+
+    indice = emparejamiento.IndiceAficiones(UsuariosSinteticos(usuarios))
+    inicio = time.perf_counter()
+    indice._vigente()
+    print(f"Índice invertido: {len(indice.por_juego)} juegos en {time.perf_counter() - inicio:.1f} s")
+
+    rutas = [("python", float("inf"))]
+    if emparejamiento._HAY_NUMPY:
+        inicio = time.perf_counter()
+        indice._construir_matriz()
+        print(f"Matriz dispersa: {indice._matriz.nnz} elementos en {time.perf_counter() - inicio:.1f} s")
+        rutas.append(("matriz", 0))
+    else:
+        print("NumPy/SciPy no están instalados: solo se mide el recorrido en Python")
+
+    consultas = random.Random(args.semilla).sample(list(usuarios), min(args.consultas, len(usuarios)))
+
+    print(f"\n{'similitud':>10} {'ruta':>8} {'mediana ms':>12} {'p95 ms':>10}")
+    for similitud in emparejamiento.SIMILITUDES:
+        for ruta, umbral in rutas:
+            emparejamiento.UMBRAL_MATRIZ = umbral
+            tiempos = medir(indice, consultas, args.k, similitud)
+            p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+            print(f"{similitud:>10} {ruta:>8} {statistics.median(tiempos):>12.1f} {p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
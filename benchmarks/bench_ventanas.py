@@ -0,0 +1,326 @@
+"""
+Mide cuánto tardan en abrirse las ventanas de Teamder con muchos datos.
+
+Para cada escala (--escalas, por defecto 1k, 100k y 1M registros por
+colección) genera una teamder.db sintética (ver datos_sinteticos.py) y mide,
+cada vez en un proceso nuevo (en frío: sin cachés ni repositorios cargados):
+
+  - datos: lo que cada ventana lee de la base al abrirse ("carga") y sus
+    filtros ("filtro", "respuestas", "primera_busqueda", "busqueda"), sin Tk;
+  - ventana: la importación del módulo ("importacion"), la ventana real hasta
+    quedar dibujada ("apertura") y, en salas y foro, el filtro por juego desde
+    el combo hasta volver a dibujar ("filtro_ui"). Necesita un display; en un
+    servidor se puede usar xvfb-run. Sin display estas fases se omiten.
+
+Cada fase es la mediana de --repeticiones procesos. Los resultados se
+escriben como JSON Lines ({"ventana", "escala", "fase", "ms", "min", "max",
+"repeticiones"}) en la salida estándar y, con --salida, también en un
+archivo. Con --comparar se contrastan con una ejecución anterior y el
+programa termina con código 1 si alguna fase empeoró más de --tolerancia
+(y más de --margen ms).
+
+Uso:
+    python benchmarks/bench_ventanas.py --escalas 1k,100k
+    xvfb-run python benchmarks/bench_ventanas.py --salida base.jsonl
+    xvfb-run python benchmarks/bench_ventanas.py --comparar base.jsonl --directorio /tmp/teamder-bench
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, RAIZ)
+
+# Lo que leen las ventanas medidas (los chats no hacen falta)
+ALMACENES = ("usuarios", "salas", "foro", "eventos", "calendario", "equipos")
+
+USUARIO = "usuario0"
+JUEGO = "League of Legends"  # El más popular en los datos sintéticos: el peor filtro
+PAGINA = 20
+
+
+def _cronometrar(tiempos, fase, funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    tiempos[fase] = (time.perf_counter() - inicio) * 1000
+    return resultado
+
+# -----------------------------------------------------------------------------
+# Fases sin Tk (se ejecutan en el proceso hijo, con la base en el directorio actual)
+# -----------------------------------------------------------------------------
+
+def datos_salas(tiempos):
+    from storage import Coleccion
+    from repositorio import repositorio
+
+    repo = _cronometrar(tiempos, "carga", lambda: repositorio(Coleccion("salas", "salas_data.json")))
+    _cronometrar(tiempos, "filtro", lambda: [repo.obtener(sala_id) for sala_id in repo.ids(JUEGO)])
+
+
+def datos_foro(tiempos):
+    from storage import Coleccion, conexion
+    from repositorio import repositorio
+
+    def cargar():
+        Coleccion("respuestas")
+        return repositorio(Coleccion("foro", "foro_data.json"))
+
+    repo = _cronometrar(tiempos, "carga", cargar)
+    _cronometrar(tiempos, "filtro", lambda: repo.ids(JUEGO))
+
+    # El hilo más largo: contar sus respuestas y leer la primera página
+    tema, = conexion().execute(
+        "SELECT grupo FROM registros WHERE coleccion = 'respuestas' "
+        "GROUP BY grupo ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()
+    respuestas = Coleccion("respuestas")
+    _cronometrar(tiempos, "respuestas",
+                 lambda: (respuestas.contar(grupo=tema), respuestas.pagina(0, PAGINA, grupo=tema)))
+
+
+def datos_eventos(tiempos):
+    from storage import Coleccion
+
+    _cronometrar(tiempos, "carga", lambda: Coleccion("eventos", "eventos.json").todos())
+
+
+def datos_calendario(tiempos):
+    from storage import Coleccion, importar_agrupado
+
+    _cronometrar(tiempos, "carga",
+                 lambda: Coleccion("calendario", "calendario.json", importar_agrupado).items(grupo=USUARIO))
+
+
+def datos_equipos(tiempos):
+    from team_crud import _cargar_equipos
+
+    _cronometrar(tiempos, "carga", _cargar_equipos)
+
+
+def datos_conexion_gamer(tiempos):
+    from emparejamiento import indice_aficiones, juegos_de
+    from recomendaciones import recomendador
+    from user_manager import coleccion_usuarios
+
+    def cargar():
+        datos = coleccion_usuarios().obtener(USUARIO)
+        recomendador().fila(USUARIO)
+        return datos
+
+    juegos = juegos_de(_cronometrar(tiempos, "carga", cargar))
+    # La primera búsqueda construye el índice de aficiones
+    _cronometrar(tiempos, "primera_busqueda",
+                 lambda: indice_aficiones().buscar(USUARIO, juegos).pagina(0, PAGINA))
+    _cronometrar(tiempos, "busqueda",
+                 lambda: indice_aficiones().buscar(USUARIO, juegos).pagina(0, PAGINA))
+
+# -----------------------------------------------------------------------------
+# Fases con Tk
+# -----------------------------------------------------------------------------
+
+def _dibujar(tiempos, fase, root, funcion):
+    def abrir():
+        resultado = funcion()
+        root.update()
+        return resultado
+    return _cronometrar(tiempos, fase, abrir)
+
+
+def _filtrar(tiempos, root, ventana):
+    def filtrar():
+        ventana.combo_juegos.set(JUEGO)
+        ventana.filtrar_por_juego()
+    _dibujar(tiempos, "filtro_ui", root, filtrar)
+
+
+def ventana_salas(tiempos, root):
+    SalasWindow = _cronometrar(tiempos, "importacion", lambda: __import__("salas_window").SalasWindow)
+    ventana = _dibujar(tiempos, "apertura", root, lambda: SalasWindow(_toplevel(root), USUARIO))
+    _filtrar(tiempos, root, ventana)
+
+
+def ventana_foro(tiempos, root):
+    ForoWindow = _cronometrar(tiempos, "importacion", lambda: __import__("foro_window").ForoWindow)
+    ventana = _dibujar(tiempos, "apertura", root, lambda: ForoWindow(_toplevel(root), USUARIO))
+    _filtrar(tiempos, root, ventana)
+
+
+def ventana_eventos(tiempos, root):
+    EventosWindow = _cronometrar(tiempos, "importacion", lambda: __import__("eventos_window").EventosWindow)
+    _dibujar(tiempos, "apertura", root, lambda: EventosWindow(_toplevel(root), USUARIO, False))
+
+
+def ventana_calendario(tiempos, root):
+    CalendarioWindow = _cronometrar(tiempos, "importacion", lambda: __import__("calendario_window").CalendarioWindow)
+    _dibujar(tiempos, "apertura", root, lambda: CalendarioWindow(_toplevel(root), USUARIO))
+
+
+def ventana_equipos(tiempos, root):
+    abrir_crud_equipos = _cronometrar(tiempos, "importacion", lambda: __import__("team_crud").abrir_crud_equipos)
+    _dibujar(tiempos, "apertura", root, lambda: abrir_crud_equipos(_toplevel(root), USUARIO))
+
+
+def ventana_conexion_gamer(tiempos, root):
+    abrir_conexion_gamer = _cronometrar(tiempos, "importacion",
+                                        lambda: __import__("conexion_gamer_window").abrir_conexion_gamer)
+    _dibujar(tiempos, "apertura", root, lambda: abrir_conexion_gamer(_toplevel(root), USUARIO))
+
+
+def _toplevel(root):
+    import tkinter as tk
+    return tk.Toplevel(root)
+
+
+# ventana -> (fases sin Tk, fases con Tk)
+VENTANAS = {
+    "salas": (datos_salas, ventana_salas),
+    "foro": (datos_foro, ventana_foro),
+    "eventos": (datos_eventos, ventana_eventos),
+    "calendario": (datos_calendario, ventana_calendario),
+    "equipos": (datos_equipos, ventana_equipos),
+    "conexion_gamer": (datos_conexion_gamer, ventana_conexion_gamer),
+}
+
+
+def hijo(ventana, modo):
+    """Mide una ventana en este proceso e imprime {fase: ms} como JSON."""
+    tiempos = {}
+    datos, con_tk = VENTANAS[ventana]
+    if modo == "datos":
+        datos(tiempos)
+    else:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        con_tk(tiempos, root)
+        root.destroy()
+    print(json.dumps(tiempos))
+
+# -----------------------------------------------------------------------------
+# Proceso principal
+# -----------------------------------------------------------------------------
+
+def hay_display():
+    resultado = subprocess.run([sys.executable, "-c", "import tkinter; tkinter.Tk().destroy()"],
+                               capture_output=True)
+    return resultado.returncode == 0
+
+
+def medir(directorio, ventana, modo, repeticiones):
+    """fase -> lista de ms, con un proceso nuevo por repetición."""
+    fases = {}
+    for _ in range(repeticiones):
+        resultado = subprocess.run([sys.executable, os.path.abspath(__file__), "--hijo", ventana, modo],
+                                   cwd=directorio, capture_output=True, text=True)
+        if resultado.returncode != 0:
+            raise RuntimeError(f"{ventana} ({modo}) falló:\n{resultado.stderr}")
+        for fase, ms in json.loads(resultado.stdout.strip().splitlines()[-1]).items():
+            fases.setdefault(fase, []).append(ms)
+    return fases
+
+
+def preparar(directorio, cantidad, semilla):
+    """Genera la base de *cantidad* registros en *directorio* si aún no existe."""
+    if os.path.exists(os.path.join(directorio, "teamder.db")):
+        return
+    from datos_sinteticos import poblar
+
+    print(f"generando {cantidad} registros por colección en {directorio}...", file=sys.stderr)
+    inicio = time.perf_counter()
+    poblar(directorio, cantidad, semilla, almacenes=ALMACENES)
+    print(f"  listo en {time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+
+
+def comparar(resultados, archivo, tolerancia, margen):
+    """Muestra las fases que empeoraron respecto a *archivo*. Devuelve cuántas superan la tolerancia."""
+    with open(archivo, "r", encoding="utf-8") as f:
+        anteriores = {}
+        for linea in f:
+            if linea.strip():
+                r = json.loads(linea)
+                anteriores[(r["ventana"], r["escala"], r["fase"])] = r["ms"]
+    regresiones = 0
+    for r in resultados:
+        anterior = anteriores.get((r["ventana"], r["escala"], r["fase"]))
+        if not anterior:
+            continue
+        cambio = r["ms"] / anterior - 1
+        marca = ""
+        if cambio > tolerancia and r["ms"] - anterior > margen:
+            regresiones += 1
+            marca = "  <-- REGRESIÓN"
+        print(f"{r['ventana']:>15} {r['escala']:>8} {r['fase']:>17}: {anterior:9.1f} -> {r['ms']:9.1f} ms "
+              f"({cambio:+.0%}){marca}", file=sys.stderr)
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", default="1k,100k,1M", help="registros por colección, separados por comas")
+    parser.add_argument("--ventanas", default=",".join(VENTANAS), help="ventanas a medir, separadas por comas")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--directorio", help="dónde guardar (y reutilizar) las bases generadas; "
+                                             "por defecto, un directorio temporal que se borra al terminar")
+    parser.add_argument("--sin-ventanas", action="store_true", help="medir solo las fases sin Tk")
+    parser.add_argument("--salida", help="archivo JSON Lines donde guardar también los resultados")
+    parser.add_argument("--comparar", help="resultados anteriores (JSON Lines) con los que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="empeoramiento admitido (0.2 = 20%%)")
+    parser.add_argument("--margen", type=float, default=1.0,
+                        help="diferencia mínima en ms para contar como regresión (evita el ruido)")
+    parser.add_argument("--hijo", nargs=2, metavar=("VENTANA", "MODO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo:
+        hijo(*args.hijo)
+        return
+
+    modos = ["datos"]
+    if not args.sin_ventanas:
+        if hay_display():
+            modos.append("ventana")
+        else:
+            print("sin display: se omiten las fases con Tk (usa xvfb-run para medirlas)", file=sys.stderr)
+
+    from datos_sinteticos import escala
+
+    base = args.directorio or tempfile.mkdtemp(prefix="teamder-bench-")
+    resultados = []
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else None
+    try:
+        for texto in args.escalas.split(","):
+            directorio = os.path.join(base, texto)
+            preparar(directorio, escala(texto), args.semilla)
+            for ventana in args.ventanas.split(","):
+                for modo in modos:
+                    for fase, tiempos in medir(directorio, ventana, modo, args.repeticiones).items():
+                        resultado = {
+                            "ventana": ventana, "escala": texto, "fase": fase,
+                            "ms": round(statistics.median(tiempos), 3),
+                            "min": round(min(tiempos), 3), "max": round(max(tiempos), 3),
+                            "repeticiones": len(tiempos),
+                        }
+                        resultados.append(resultado)
+                        linea = json.dumps(resultado, ensure_ascii=False)
+                        print(linea, flush=True)
+                        if salida:
+                            print(linea, file=salida, flush=True)
+    finally:
+        if salida:
+            salida.close()
+        if not args.directorio:
+            shutil.rmtree(base, ignore_errors=True)
+
+    if args.comparar and comparar(resultados, args.comparar, args.tolerancia, args.margen):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
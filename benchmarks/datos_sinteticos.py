@@ -0,0 +1,515 @@
+"""
+Genera datos sintéticos con la forma exacta de los almacenes de Teamder.
+
+Sirve para dimensionar un despliegue o para los benchmarks: usuarios con
+juegos favoritos, salas con miembros, temas del foro con sus respuestas,
+eventos con inscritos, recordatorios del calendario, reportes, equipos,
+mensajes directos y chats de sala. Con la misma semilla se generan siempre los
+mismos datos, y los usuarios se llaman usuario0, usuario1, ... en todos los
+almacenes, así que las referencias entre ellos son coherentes. La popularidad
+de los juegos y la actividad de los usuarios siguen una distribución tipo Zipf
+y la longitud de los hilos y chats tiene cola larga (unos pocos muy largos).
+
+Todo se genera y se escribe registro a registro (nunca hay un almacén entero
+en memoria), así que se pueden crear conjuntos de varios GB. Dos formatos:
+
+  - base: lo que usa la aplicación: teamder.db (colecciones de storage.py,
+    incluido el resumen de conversaciones), la bitácora e índices de
+    chat_privado/ y las bitácoras de chat_salas/;
+  - json: los archivos antiguos que storage.py importa la primera vez
+    (usuarios.json, salas_data.json, foro_data.json con las respuestas dentro
+    de cada tema, mensajes_chat.json, chat_sala_<id>.json, ...).
+
+Uso:
+    python benchmarks/datos_sinteticos.py /tmp/teamder --registros 100k
+    python benchmarks/datos_sinteticos.py /tmp/grande --registros 1M --cantidad mensajes=50M
+    python benchmarks/datos_sinteticos.py /tmp/json --formato json --almacenes usuarios,foro
+
+Desde otro benchmark:
+    poblar(directorio, 100_000)
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+import chat_privado  # noqa: E402
+import chat_sala  # noqa: E402
+from storage import Coleccion  # noqa: E402
+from conexion_gamer_window import JUEGOS_DISPONIBLES  # noqa: E402
+
+JUEGOS_PERSONALIZADOS = 1_000
+USUARIOS_POR_DUENO = 10  # Solo uno de cada 10 usuarios usa el calendario
+RESPUESTAS_POR_TEMA = 3
+MENSAJES_POR_CONVERSACION = 20
+FECHA_INICIAL = datetime.datetime(2025, 1, 1)
+
+CATEGORIAS_REPORTE = ("Bug", "Ajustes de Perfil", "Acceder al Foro", "Salas de Juego", "Eventos")
+ESTADOS_REPORTE = ("pendiente", "pendiente", "resuelto")
+
+# Hash fijo: calcular scrypt para cada usuario sintético no aporta nada
+CLAVE = "scrypt$16384$8$1$" + "00" * 16 + "$" + "00" * 64
+
+ESCALAS = {"k": 1_000, "M": 1_000_000, "G": 1_000_000_000}
+
+
+class Zipf:
+    """Elige elementos de una lista con probabilidad proporcional a 1 / (posición + 1)."""
+
+    def __init__(self, elementos):
+        self.elementos = elementos
+        self.acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(len(elementos))))
+
+    def uno(self, azar):
+        return azar.choices(self.elementos, cum_weights=self.acumulados)[0]
+
+    def varios(self, azar, cantidad):
+        """Hasta *cantidad* elementos distintos."""
+        return list(dict.fromkeys(azar.choices(self.elementos, cum_weights=self.acumulados, k=cantidad)))
+
+
+def juegos():
+    """Juegos de la lista fija seguidos de los personalizados (de más a menos populares)."""
+    return JUEGOS_DISPONIBLES + [f"Juego personalizado {i}" for i in range(JUEGOS_PERSONALIZADOS)]
+
+
+class Universo:
+    """Usuarios, salas y juegos entre los que eligen todos los generadores."""
+
+    def __init__(self, usuarios, salas):
+        self.usuarios = max(2, usuarios)
+        self.salas = salas
+        self.juegos = Zipf(juegos())
+        self.juegos_fijos = Zipf(JUEGOS_DISPONIBLES)
+        # Con miles de usuarios basta con Zipf sobre una muestra de "activos"
+        self.activos = Zipf([f"usuario{i}" for i in range(min(self.usuarios, 10_000))])
+
+    def usuario(self, azar):
+        """Un usuario cualquiera (la mitad de las veces, uno de los más activos)."""
+        if azar.random() < 0.5:
+            return self.activos.uno(azar)
+        return f"usuario{azar.randrange(self.usuarios)}"
+
+    def usuarios_distintos(self, azar, cantidad):
+        return list(dict.fromkeys(self.usuario(azar) for _ in range(cantidad)))
+
+
+def fecha(azar, dias=365):
+    return (FECHA_INICIAL + datetime.timedelta(days=azar.randrange(dias))).strftime("%Y-%m-%d")
+
+
+def momento(azar, dias=365):
+    return FECHA_INICIAL + datetime.timedelta(seconds=azar.randrange(dias * 86400))
+
+
+def texto(azar, palabras):
+    return " ".join(azar.choice(PALABRAS) for _ in range(palabras)).capitalize()
+
+
+def largo(azar, media):
+    """Longitud de un hilo o chat: al menos 1, de media *media*, con cola larga (Pareto)."""
+    return max(1, int(azar.paretovariate(1.5) * media / 3))
+
+
+PALABRAS = ("busco", "equipo", "para", "rankeds", "torneo", "jugar", "esta", "noche", "nivel",
+            "platino", "diamante", "casual", "competitivo", "fin", "de", "semana", "con", "micro",
+            "serio", "divertido", "estrategia", "partida", "clasificatoria", "amigos")
+
+
+def escala(texto):
+    """"1k" -> 1000, "1M" -> 1000000, "500" -> 500."""
+    if texto[-1] in ESCALAS:
+        return int(float(texto[:-1]) * ESCALAS[texto[-1]])
+    return int(texto)
+
+# -----------------------------------------------------------------------------
+# Generadores
+# -----------------------------------------------------------------------------
+# Los de colecciones devuelven tuplas (clave, registro, grupo), como los
+# importadores de storage.py. Los de chats devuelven los mensajes agrupados por
+# conversación o por sala, en orden de envío.
+
+def usuarios(cantidad, azar, universo):
+    for i in range(cantidad):
+        favoritos = universo.juegos_fijos.varios(azar, azar.randint(1, 4))
+        personalizados = [universo.juegos.uno(azar)] if azar.random() < 0.3 else []
+        yield f"usuario{i}", {
+            "email": f"usuario{i}@teamder.test",
+            "clave": CLAVE,
+            "juegos_favoritos": favoritos,
+            "juegos_personalizados": personalizados,
+        }, None
+
+
+def salas(cantidad, azar, universo):
+    for i in range(1, cantidad + 1):
+        capacidad = azar.choice((2, 4, 5, 5, 6, 10))
+        creador = universo.usuario(azar)
+        miembros = list(dict.fromkeys([creador] + universo.usuarios_distintos(azar, azar.randint(0, capacidad - 1))))
+        yield i, {
+            "id": i,
+            "nombre": f"Sala {i}",
+            "juego": universo.juegos.uno(azar),
+            "creador": creador,
+            "descripcion": texto(azar, 12),
+            "fecha_creacion": fecha(azar),
+            "miembros": miembros,
+            "capacidad": capacidad,
+            "estado": "llena" if len(miembros) >= capacidad else "abierta",
+            "requisitos": azar.choice(("Cualquier nivel", "Oro+", "Platino+", "Diamante+")),
+        }, None
+
+
+def temas(cantidad, azar, universo):
+    """Temas del foro, sin respuestas (ver respuestas_de())."""
+    for i in range(1, cantidad + 1):
+        yield i, {
+            "id": i,
+            "usuario": universo.usuario(azar),
+            "fecha": fecha(azar),
+            "titulo": texto(azar, 5),
+            "contenido": texto(azar, 40),
+            "juego": universo.juegos.uno(azar),
+        }, None
+
+
+def respuestas_de(azar, universo):
+    """Respuestas de un tema (uno de cada diez no tiene ninguna)."""
+    if azar.random() < 0.1:
+        return
+    for id_respuesta in range(1, largo(azar, RESPUESTAS_POR_TEMA) + 1):
+        yield {
+            "id": id_respuesta,
+            "usuario": universo.usuario(azar),
+            "fecha": fecha(azar),
+            "contenido": texto(azar, 20),
+        }
+
+
+def respuestas(temas_totales, azar, universo):
+    """Respuestas de los temas 1..temas_totales, como las guarda foro_window (grupo = tema)."""
+    for tema in range(1, temas_totales + 1):
+        for respuesta in respuestas_de(azar, universo):
+            yield f"{tema}:{respuesta['id']}", respuesta, tema
+
+
+def eventos(cantidad, azar, universo):
+    for i in range(1, cantidad + 1):
+        yield i, {
+            "id": i,
+            "titulo": texto(azar, 4),
+            "descripcion": texto(azar, 25),
+            "fecha": fecha(azar),
+            "hora": f"{azar.randrange(24):02d}:{azar.choice((0, 15, 30, 45)):02d}",
+            "creador": universo.usuario(azar),
+            "inscritos": universo.usuarios_distintos(azar, azar.randint(0, 20)),
+        }, None
+
+
+def recordatorios(cantidad, azar, universo):
+    """Recordatorios agrupados por usuario (usuario0, usuario1, ...) hasta sumar *cantidad*."""
+    media = max(1, cantidad // max(1, universo.usuarios // USUARIOS_POR_DUENO))
+    dueno = 0
+    while cantidad > 0:
+        # El último usuario se queda con el resto: cada grupo aparece una sola vez
+        ultimo = dueno == universo.usuarios - 1
+        for _ in range(cantidad if ultimo else min(cantidad, largo(azar, media))):
+            yield None, {
+                "titulo": texto(azar, 4),
+                "fecha": fecha(azar),
+                "nota": texto(azar, 15),
+            }, f"usuario{dueno}"
+            cantidad -= 1
+        dueno += 1
+
+
+def reportes(cantidad, azar, universo):
+    for _ in range(cantidad):
+        yield None, {
+            "usuario": universo.usuario(azar),
+            "categoria": azar.choice(CATEGORIAS_REPORTE),
+            "contenido": texto(azar, 15),
+            "estado": azar.choice(ESTADOS_REPORTE),
+        }, None
+
+
+def equipos(cantidad, azar, universo):
+    for i in range(1, cantidad + 1):
+        creador = universo.usuario(azar)
+        yield i, {
+            "id": i,
+            "nombre": f"Equipo {i}",
+            "descripcion": texto(azar, 8),
+            "creador": creador,
+            "miembros": list(dict.fromkeys([creador] + universo.usuarios_distintos(azar, azar.randint(0, 7)))),
+        }, None
+
+
+def mensajes(cantidad, azar, universo):
+    """
+    *cantidad* mensajes directos, conversación por conversación.
+
+    La conversación k es entre usuario<k % U> y usuario<(k % U + 1 + k // U) % U>
+    (U = número de usuarios): así ningún par se repite sin tener que recordar
+    los ya generados.
+    """
+    u = universo.usuarios
+    for k in itertools.count():
+        if cantidad <= 0 or k // u >= (u - 1) // 2:
+            return
+        a = k % u
+        par = [f"usuario{a}", f"usuario{(a + 1 + k // u) % u}"]
+        cuando = momento(azar)
+        for _ in range(min(cantidad, largo(azar, MENSAJES_POR_CONVERSACION))):
+            remitente = azar.choice(par)
+            yield {
+                "remitente": remitente,
+                "destinatario": par[1] if remitente == par[0] else par[0],
+                "mensaje": texto(azar, azar.randint(1, 12)),
+                "fecha": cuando.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            cuando += datetime.timedelta(seconds=azar.randint(5, 3600))
+            cantidad -= 1
+
+
+def mensajes_sala(cantidad, azar, universo):
+    """Pares (id de sala, mensaje) sala por sala, empezando por el saludo del sistema."""
+    media = max(1, cantidad // max(1, universo.salas))
+    for sala_id in range(1, universo.salas + 1):
+        if cantidad <= 0:
+            return
+        cuando = momento(azar)
+        usuario = "Sistema"
+        contenido = "¡Bienvenido al chat de sala!"
+        for seq in range(1, min(cantidad, largo(azar, media)) + 1):
+            yield sala_id, {
+                "seq": seq,
+                "usuario": usuario,
+                "contenido": contenido,
+                "timestamp": cuando.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            usuario = universo.usuario(azar)
+            contenido = texto(azar, azar.randint(1, 12))
+            cuando += datetime.timedelta(seconds=azar.randint(5, 600))
+            cantidad -= 1
+
+# -----------------------------------------------------------------------------
+# Escritura
+# -----------------------------------------------------------------------------
+
+def _escribir_json(ruta, forma, tuplas):
+    """
+    Escribe un JSON antiguo a medida que llegan las tuplas. Devuelve cuántas escribió.
+
+    *forma* es "lista" ([registros]), "diccionario" ({clave: registro}) o
+    "agrupado" ({grupo: [registros]}, con las tuplas ya agrupadas).
+    """
+    cantidad = 0
+    grupo_actual = None
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("[" if forma == "lista" else "{")
+        for clave, registro, grupo in tuplas:
+            separador = ",\n" if cantidad else "\n"
+            valor = json.dumps(registro, ensure_ascii=False)
+            if forma == "lista":
+                f.write(separador + valor)
+            elif forma == "diccionario":
+                f.write(f"{separador}{json.dumps(clave, ensure_ascii=False)}: {valor}")
+            elif cantidad and grupo == grupo_actual:
+                f.write(separador + valor)
+            else:
+                cierre = "\n]" if cantidad else ""
+                f.write(f"{cierre}{separador}{json.dumps(grupo, ensure_ascii=False)}: [\n{valor}")
+                grupo_actual = grupo
+            cantidad += 1
+        if forma == "agrupado" and cantidad:
+            f.write("\n]")
+        f.write("\n]\n" if forma == "lista" else "\n}\n")
+    return cantidad
+
+
+class _Contador:
+    """Iterable que cuenta los elementos que deja pasar."""
+
+    def __init__(self, iterable):
+        self.iterable = iterable
+        self.cantidad = 0
+
+    def __iter__(self):
+        for elemento in self.iterable:
+            self.cantidad += 1
+            yield elemento
+
+
+def _escribir_mensajes(mensajes):
+    """
+    Escribe la bitácora y los índices de chat_privado.
+
+    Devuelve (a medida que termina cada conversación) las tuplas del resumen
+    de conversaciones, para insertarlas en la colección "conversaciones".
+    """
+    os.makedirs(chat_privado.DIRECTORIO_INDICES, exist_ok=True)
+    with open(chat_privado._bitacora.ruta, "ab") as bitacora:
+        conversaciones = itertools.groupby(
+            mensajes, key=lambda m: chat_privado.participantes(m["remitente"], m["destinatario"]))
+        for par, conversacion in conversaciones:
+            offsets = []
+            for mensaje in conversacion:
+                offsets.append(bitacora.tell())
+                bitacora.write((json.dumps(mensaje, ensure_ascii=False) + "\n").encode("utf-8"))
+            with open(chat_privado._ruta_indice(*par), "w", encoding="utf-8") as indice:
+                indice.write(json.dumps(par, ensure_ascii=False) + "\n")
+                indice.writelines(f"{offset}\n" for offset in offsets)
+            for usuario, otro in (par, par[::-1]):
+                entrada = {"usuario": otro, "mensaje": mensaje["mensaje"], "fecha": mensaje["fecha"], "no_leidos": 0}
+                yield chat_privado._clave_resumen(usuario, otro), entrada, usuario
+
+
+def _escribir_chats_sala(mensajes, formato):
+    """Una bitácora (base) o un chat_sala_<id>.json (json) por sala."""
+    if formato == "base":
+        os.makedirs(chat_sala.DIRECTORIO_CHATS, exist_ok=True)
+    for sala_id, grupo in itertools.groupby(mensajes, key=lambda par: par[0]):
+        if formato == "base":
+            with open(chat_sala.ruta_chat(sala_id), "ab") as f:
+                for _, mensaje in grupo:
+                    f.write((json.dumps(mensaje, ensure_ascii=False) + "\n").encode("utf-8"))
+        else:
+            # Los JSON antiguos no tenían "seq": se numeran al importarlos
+            _escribir_json(f"chat_sala_{sala_id}.json", "lista",
+                           ((None, {k: v for k, v in mensaje.items() if k != "seq"}, None) for _, mensaje in grupo))
+
+
+def _con_respuestas(tuplas, azar, universo):
+    """Temas con sus respuestas dentro, como en el antiguo foro_data.json."""
+    for clave, tema, grupo in tuplas:
+        tema["respuestas"] = list(respuestas_de(azar, universo))
+        yield clave, tema, grupo
+
+
+# almacén -> (generador, forma del JSON antiguo, archivo JSON antiguo); la colección se llama igual
+COLECCIONES = {
+    "usuarios": (usuarios, "diccionario", "usuarios.json"),
+    "salas": (salas, "lista", "salas_data.json"),
+    "foro": (temas, "lista", "foro_data.json"),
+    "eventos": (eventos, "lista", "eventos.json"),
+    "calendario": (recordatorios, "agrupado", "calendario.json"),
+    "reportes": (reportes, "lista", "reportes.json"),
+    "equipos": (equipos, "lista", "equipos.json"),
+}
+
+ALMACENES = list(COLECCIONES) + ["mensajes", "chat_salas"]
+
+
+def poblar(directorio, cantidad, semilla=1, almacenes=None, formato="base", cantidades=None, progreso=False):
+    """
+    Genera los almacenes de Teamder en *directorio*, que no debe tener datos.
+
+    Args:
+        directorio (str): Dónde escribirlos (se crea si no existe).
+        cantidad (int): Registros o mensajes por almacén.
+        semilla (int): Misma semilla, mismos datos.
+        almacenes (list): Nombres de ALMACENES a generar (por defecto, todos).
+        formato (str): "base" (teamder.db y bitácoras) o "json" (archivos antiguos).
+        cantidades (dict): Cantidad distinta para algunos almacenes.
+        progreso (bool): Mostrar en stderr cada almacén terminado.
+
+    En formato base las colecciones se registran vacías antes de insertar, así
+    que las ventanas no crean sus datos de ejemplo. En ambos formatos se
+    escribe también juegos_data.json.
+
+    Returns:
+        dict: almacén -> registros o mensajes escritos (y "respuestas" si hay foro).
+    """
+    cantidades = cantidades or {}
+    anterior = os.getcwd()
+    os.makedirs(directorio, exist_ok=True)
+    os.chdir(directorio)
+    try:
+        universo = Universo(cantidades.get("usuarios", cantidad), cantidades.get("salas", cantidad))
+        escritos = {}
+        for almacen in almacenes or ALMACENES:
+            inicio = time.perf_counter()
+            total = cantidades.get(almacen, cantidad)
+            azar = random.Random(f"{semilla}:{almacen}")
+            # Las respuestas tienen su propio generador para que sean las mismas en ambos formatos
+            azar_respuestas = random.Random(f"{semilla}:respuestas")
+
+            if almacen in COLECCIONES:
+                generador, forma, archivo = COLECCIONES[almacen]
+                tuplas = generador(total, azar, universo)
+                if formato == "json":
+                    if almacen == "foro":
+                        tuplas = _con_respuestas(tuplas, azar_respuestas, universo)
+                    escritos[almacen] = _escribir_json(archivo, forma, tuplas)
+                else:
+                    escritos[almacen] = Coleccion(almacen).insertar_varios(tuplas)
+                    if almacen == "foro":
+                        escritos["respuestas"] = Coleccion("respuestas").insertar_varios(
+                            respuestas(total, azar_respuestas, universo))
+            elif almacen == "mensajes":
+                contador = _Contador(mensajes(total, azar, universo))
+                if formato == "json":
+                    _escribir_json(chat_privado.ARCHIVO_JSON_ANTIGUO, "lista",
+                                   ((None, mensaje, None) for mensaje in contador))
+                else:
+                    Coleccion("conversaciones").insertar_varios(_escribir_mensajes(contador))
+                escritos[almacen] = contador.cantidad
+            else:
+                contador = _Contador(mensajes_sala(total, azar, universo))
+                _escribir_chats_sala(contador, formato)
+                escritos[almacen] = contador.cantidad
+
+            if progreso:
+                print(f"{almacen}: {escritos[almacen]} en {time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+
+        with open("juegos_data.json", "w", encoding="utf-8") as f:
+            json.dump(juegos()[:200], f, ensure_ascii=False)
+        return escritos
+    finally:
+        storage.cerrar()
+        os.chdir(anterior)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directorio", help="directorio de salida (vacío o inexistente)")
+    parser.add_argument("--registros", type=escala, default=escala("100k"),
+                        help="registros o mensajes por almacén (1k, 100k, 1M, ...)")
+    parser.add_argument("--cantidad", action="append", default=[], metavar="ALMACEN=N",
+                        help="cantidad distinta para un almacén (se puede repetir)")
+    parser.add_argument("--almacenes", default=",".join(ALMACENES), help="almacenes a generar, separados por comas")
+    parser.add_argument("--formato", choices=("base", "json"), default="base")
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+
+    almacenes = args.almacenes.split(",")
+    cantidades = {}
+    for opcion in args.cantidad:
+        almacen, _, valor = opcion.partition("=")
+        if almacen not in ALMACENES or not valor:
+            parser.error(f"--cantidad {opcion}: se esperaba ALMACEN=N con ALMACEN en {', '.join(ALMACENES)}")
+        cantidades[almacen] = escala(valor)
+    for almacen in almacenes:
+        if almacen not in ALMACENES:
+            parser.error(f"almacén desconocido: {almacen} (disponibles: {', '.join(ALMACENES)})")
+    if os.path.isdir(args.directorio) and os.listdir(args.directorio):
+        parser.error(f"{args.directorio} no está vacío")
+
+    inicio = time.perf_counter()
+    escritos = poblar(args.directorio, args.registros, args.semilla, almacenes, args.formato, cantidades,
+                      progreso=True)
+    tamano = sum(os.path.getsize(os.path.join(raiz, nombre))
+                 for raiz, _, nombres in os.walk(args.directorio) for nombre in nombres)
+    print(json.dumps({"escritos": escritos, "bytes": tamano, "segundos": round(time.perf_counter() - inicio, 1)}))
+
+
+if __name__ == "__main__":
+    main()
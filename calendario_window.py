@@ -1,8 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
 from datetime import datetime
+from storage import Coleccion, importar_agrupado
 
 class CalendarioWindow:
     def __init__(self, master, usuario):
@@ -12,27 +11,30 @@ class CalendarioWindow:
         self.usuario = usuario
         self.archivo = "calendario.json"
         self.recordatorios = []
+        self.claves = []  # Clave en storage de cada recordatorio (mismo orden)
 
         self.cargar_datos()
         self.crear_widgets()
         self.actualizar_lista()
 
     def cargar_datos(self):
-        if os.path.exists(self.archivo):
-            with open(self.archivo, "r", encoding="utf-8") as f:
-                datos = json.load(f)
-                self.recordatorios = datos.get(self.usuario, [])
+        # Un registro por recordatorio, agrupados por usuario
+        self.coleccion = Coleccion("calendario", self.archivo, importar_agrupado)
+        items = self.coleccion.items(grupo=self.usuario)
+        self.claves = [clave for clave, _ in items]
+        self.recordatorios = [rec for _, rec in items]
+
+    def guardar_recordatorio(self, index, recordatorio):
+        if index is not None:
+            self.recordatorios[index] = recordatorio
+            self.coleccion.actualizar(self.claves[index], recordatorio)
         else:
-            self.recordatorios = []
+            self.recordatorios.append(recordatorio)
+            self.claves.append(self.coleccion.insertar(recordatorio, grupo=self.usuario))
 
-    def guardar_datos(self):
-        datos = {}
-        if os.path.exists(self.archivo):
-            with open(self.archivo, "r", encoding="utf-8") as f:
-                datos = json.load(f)
-        datos[self.usuario] = self.recordatorios
-        with open(self.archivo, "w", encoding="utf-8") as f:
-            json.dump(datos, f, indent=4, ensure_ascii=False)
+    def eliminar_recordatorio(self, index):
+        self.coleccion.eliminar(self.claves.pop(index))
+        self.recordatorios.pop(index)
 
     def crear_widgets(self):
         tk.Button(self.master, text="Agregar Recordatorio", command=self.agregar_recordatorio).pack(pady=10)
@@ -108,12 +110,7 @@ class CalendarioWindow:
                 "nota": nota
             }
 
-            if index is not None:
-                self.recordatorios[index] = nuevo
-            else:
-                self.recordatorios.append(nuevo)
-
-            self.guardar_datos()
+            self.guardar_recordatorio(index, nuevo)
             self.actualizar_lista()
             ventana.destroy()
             messagebox.showinfo("Éxito", "Recordatorio guardado.")
@@ -121,8 +118,7 @@ class CalendarioWindow:
         def eliminar():
             if index is not None:
                 if messagebox.askyesno("Confirmar", "¿Eliminar este recordatorio?"):
-                    self.recordatorios.pop(index)
-                    self.guardar_datos()
+                    self.eliminar_recordatorio(index)
                     self.actualizar_lista()
                     ventana.destroy()
                     messagebox.showinfo("Eliminado", "Recordatorio eliminado.")
@@ -1,9 +1,8 @@
-# Importamos los módulos necesarios para crear la interfaz gráfica, mostrar mensajes emergentes,
-# trabajar con archivos JSON y verificar la existencia de archivos.
+# Importamos los módulos necesarios para crear la interfaz gráfica, mostrar mensajes emergentes
+# y acceder a los mensajes privados guardados.
 import tkinter as tk
 from tkinter import messagebox
-import json
-import os
+import chat_privado
 from chat_window import ChatWindow  # Importamos la ventana de chat individual
 
 def abrir_crud_chats(master, usuario_actual):
@@ -18,34 +17,12 @@ def abrir_crud_chats(master, usuario_actual):
     ventana.title("Chats activos")
     ventana.geometry("400x500")
 
-    archivo = "mensajes_chat.json"
-
-    # Si no existe el archivo de mensajes, lo creamos vacío
-    if not os.path.exists(archivo):
-        with open(archivo, "w") as f:
-            json.dump([], f)
-
-    # Cargamos todos los mensajes desde el archivo JSON
-    with open(archivo, "r") as f:
-        mensajes = json.load(f)
-
-    # Diccionario para almacenar el último mensaje de cada chat del usuario
+    # Resumen de cada chat del usuario (último mensaje y no leídos), ya ordenado
+    # del más reciente al más antiguo. No se lee ningún historial de mensajes.
     chats = {}
-    for m in mensajes:
-        u1, u2 = m["remitente"], m["destinatario"]
-
-        # Verificamos si el mensaje pertenece al usuario actual
-        if usuario_actual in (u1, u2):
-            otro = u2 if u1 == usuario_actual else u1
-            key = tuple(sorted([usuario_actual, otro]))
-
-            # Guardamos solo el mensaje más reciente para cada chat
-            if key not in chats or m["fecha"] > chats[key]["fecha"]:
-                chats[key] = {
-                    "usuario": otro,
-                    "mensaje": m["mensaje"],
-                    "fecha": m["fecha"]
-                }
+    for info in chat_privado.conversaciones(usuario_actual):
+        key = chat_privado.participantes(usuario_actual, info["usuario"])
+        chats[key] = info
 
     # Creamos una lista donde se mostrarán los chats activos
     lista = tk.Listbox(ventana, font=("Arial", 11))
@@ -54,8 +31,9 @@ def abrir_crud_chats(master, usuario_actual):
     chat_keys = list(chats.keys())
     for key in chat_keys:
         info = chats[key]
-        # Mostramos el nombre del otro usuario y un preview del mensaje
-        lista.insert(tk.END, f"{info['usuario']} → {info['mensaje'][:30]}...")
+        # Mostramos el nombre del otro usuario, un preview del mensaje y los no leídos
+        no_leidos = f" ({info['no_leidos']} sin leer)" if info["no_leidos"] else ""
+        lista.insert(tk.END, f"{info['usuario']}{no_leidos} → {info['mensaje'][:30]}...")
 
     def abrir_chat():
         """
@@ -70,7 +48,7 @@ def abrir_crud_chats(master, usuario_actual):
 
     def eliminar_chat():
         """
-        Elimina toda la conversación con el usuario seleccionado del archivo JSON.
+        Elimina toda la conversación con el usuario seleccionado.
         """
         seleccion = lista.curselection()
         if not seleccion:
@@ -82,15 +60,8 @@ def abrir_crud_chats(master, usuario_actual):
         if not messagebox.askyesno("Confirmar", f"¿Eliminar conversación con {chats[key]['usuario']}?"):
             return
 
-        # Filtramos los mensajes eliminando los que pertenezcan a esa conversación
-        nueva_lista = [
-            m for m in mensajes
-            if sorted([m["remitente"], m["destinatario"]]) != list(key)
-        ]
-
-        # Sobrescribimos el archivo con la nueva lista de mensajes
-        with open(archivo, "w") as f:
-            json.dump(nueva_lista, f, indent=4)
+        # Borramos el índice de esa conversación
+        chat_privado.eliminar_conversacion(*key)
 
         messagebox.showinfo("Eliminado", "Conversación eliminada")
 
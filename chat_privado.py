@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from storage import Bitacora, Coleccion, bloquear_archivo, transaccion
+
+# -----------------------------------------------------------------------------
+# chat_privado.py – Mensajes directos entre usuarios
+# -----------------------------------------------------------------------------
+# Los mensajes se anexan a una bitácora (chat_privado/mensajes.log, un JSON por
+# línea) y cada conversación tiene su propio índice de offsets en
+# chat_privado/indices/<hash>.idx:
+#   - primera línea: JSON con los dos participantes (ordenados)
+#   - resto: un offset por línea, en orden de envío
+# Enviar un mensaje son dos escrituras al final de archivo (O(1)) y abrir una
+# conversación solo lee los mensajes de ese par de usuarios.
+# El antiguo mensajes_chat.json se importa la primera vez, en un directorio
+# aparte que se renombra a chat_privado/ al terminar: si la importación se
+# interrumpe no queda un historial a medias y se repite entera.
+#
+# Además se mantiene un resumen por usuario y contacto (colección
+# "conversaciones" de storage.py) con el último mensaje, su fecha y los no
+# leídos, para listar los chats activos sin leer ningún historial.
+# -----------------------------------------------------------------------------
+
+DIRECTORIO_CHAT = "chat_privado"
+DIRECTORIO_INDICES = os.path.join(DIRECTORIO_CHAT, "indices")
+ARCHIVO_JSON_ANTIGUO = "mensajes_chat.json"
+DIRECTORIO_IMPORTACION = DIRECTORIO_CHAT + ".importando"
+ARCHIVO_BLOQUEO_IMPORTACION = DIRECTORIO_CHAT + ".lock"
+
+_bitacora = Bitacora(os.path.join(DIRECTORIO_CHAT, "mensajes.log"))
+_resumen = None
+
+
+def participantes(usuario_a, usuario_b):
+    """Par de usuarios de una conversación, en orden canónico."""
+    return tuple(sorted([usuario_a, usuario_b]))
+
+
+def _ruta_indice(usuario_a, usuario_b):
+    clave = "\n".join(participantes(usuario_a, usuario_b))
+    nombre = hashlib.sha1(clave.encode("utf-8")).hexdigest()
+    return os.path.join(DIRECTORIO_INDICES, f"{nombre}.idx")
+
+
+def _preparar():
+    """Crea la estructura de archivos e importa mensajes_chat.json si hace falta."""
+    if _bitacora.existe():
+        return
+    _coleccion_resumen()
+    # Solo un proceso importa; los demás esperan el bloqueo y encuentran la bitácora hecha
+    with bloquear_archivo(ARCHIVO_BLOQUEO_IMPORTACION):
+        if _bitacora.existe():
+            return
+        mensajes = []
+        if os.path.exists(ARCHIVO_JSON_ANTIGUO):
+            with open(ARCHIVO_JSON_ANTIGUO, "r", encoding="utf-8") as f:
+                mensajes = json.load(f)
+        _importar(mensajes)
+
+
+def _importar(mensajes):
+    """
+    Escribe la bitácora y los índices de *mensajes* en DIRECTORIO_IMPORTACION
+    y lo renombra a DIRECTORIO_CHAT cuando todo está en disco.
+    """
+    # Restos de una importación interrumpida (sin bitácora, los índices no sirven)
+    for directorio in (DIRECTORIO_IMPORTACION, DIRECTORIO_CHAT):
+        if os.path.exists(directorio):
+            shutil.rmtree(directorio)
+    indices = os.path.join(DIRECTORIO_IMPORTACION, os.path.basename(DIRECTORIO_INDICES))
+    os.makedirs(indices)
+
+    offsets = {}  # participantes -> offsets de sus mensajes
+    with open(os.path.join(DIRECTORIO_IMPORTACION, os.path.basename(_bitacora.ruta)), "wb") as f:
+        for mensaje in mensajes:
+            par = participantes(mensaje["remitente"], mensaje["destinatario"])
+            offsets.setdefault(par, []).append(f.tell())
+            f.write((json.dumps(mensaje, ensure_ascii=False) + "\n").encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    for par, lista in offsets.items():
+        ruta = os.path.join(indices, os.path.basename(_ruta_indice(*par)))
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(json.dumps(par, ensure_ascii=False) + "\n")
+            f.writelines(f"{offset}\n" for offset in lista)
+            f.flush()
+            os.fsync(f.fileno())
+
+    # El resumen va antes del renombrado: si se repite la importación, reescribirlo no cambia nada
+    with transaccion():
+        for mensaje in mensajes:
+            _actualizar_resumen(mensaje, no_leido=False)
+    os.replace(DIRECTORIO_IMPORTACION, DIRECTORIO_CHAT)
+
+
+def _anexar(mensaje, no_leido=True):
+    """Escribe el mensaje en la bitácora y su offset en el índice de la conversación."""
+    ruta = _ruta_indice(mensaje["remitente"], mensaje["destinatario"])
+    # Bitácora e índice bajo el mismo bloqueo: los offsets quedan en orden entre procesos
+    with _bitacora.bloqueada():
+        offset = _bitacora.anexar(mensaje)
+        nuevo = not os.path.exists(ruta)
+        with open(ruta, "a", encoding="utf-8") as f:
+            if nuevo:
+                f.write(json.dumps(participantes(mensaje["remitente"], mensaje["destinatario"]), ensure_ascii=False) + "\n")
+            f.write(f"{offset}\n")
+    _actualizar_resumen(mensaje, no_leido)
+
+
+def _leer_indice(ruta):
+    """Devuelve (participantes, offsets) de un archivo de índice."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        cabecera = json.loads(f.readline())
+        offsets = [int(linea) for linea in f if linea.strip()]
+    return cabecera, offsets
+
+
+def enviar_mensaje(remitente, destinatario, contenido):
+    """Guarda un mensaje nuevo y lo devuelve."""
+    _preparar()
+    mensaje = {
+        "remitente": remitente,
+        "destinatario": destinatario,
+        "mensaje": contenido,
+        "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+    _anexar(mensaje)
+    return mensaje
+
+
+def cargar_conversacion(usuario_a, usuario_b):
+    """Mensajes entre dos usuarios, en orden de envío."""
+    _preparar()
+    ruta = _ruta_indice(usuario_a, usuario_b)
+    if not os.path.exists(ruta):
+        return []
+    _, offsets = _leer_indice(ruta)
+    return _bitacora.leer(offsets)
+
+
+def conversaciones(usuario):
+    """
+    Resumen de las conversaciones de *usuario*, de la más reciente a la más antigua.
+
+    Cada elemento es un diccionario con "usuario" (el otro participante),
+    "mensaje", "fecha" y "no_leidos".
+    """
+    _preparar()
+    resumen = _coleccion_resumen().todos(grupo=usuario)
+    resumen.sort(key=lambda r: r["fecha"], reverse=True)
+    return resumen
+
+
+def marcar_leida(usuario, otro):
+    """Pone a cero los no leídos de *usuario* en su conversación con *otro*."""
+    # Sobre la entrada actual, para no pisar el último mensaje si llega otro a la vez
+    def leida(entrada):
+        if not entrada["no_leidos"]:
+            return "leida"
+        entrada["no_leidos"] = 0
+
+    _coleccion_resumen().modificar(_clave_resumen(usuario, otro), leida)
+
+
+def eliminar_conversacion(usuario_a, usuario_b):
+    """Olvida la conversación entre dos usuarios."""
+    _preparar()
+    ruta = _ruta_indice(usuario_a, usuario_b)
+    # Con el bloqueo de la bitácora, como _anexar(): no se borra un índice a medio escribir
+    with _bitacora.bloqueada():
+        if os.path.exists(ruta):
+            os.remove(ruta)
+    coleccion = _coleccion_resumen()
+    coleccion.eliminar(_clave_resumen(usuario_a, usuario_b))
+    coleccion.eliminar(_clave_resumen(usuario_b, usuario_a))
+
+# -----------------------------------------------------------------------------
+# Resumen de conversaciones
+# -----------------------------------------------------------------------------
+
+def _clave_resumen(usuario, otro):
+    return json.dumps([usuario, otro], ensure_ascii=False)
+
+
+def _coleccion_resumen():
+    """Colección del resumen (grupo = usuario). Se reconstruye si es nueva."""
+    global _resumen
+    if _resumen is None:
+        _resumen = Coleccion("conversaciones")
+        if _resumen.recien_creada:
+            _reconstruir_resumen(_resumen)
+    return _resumen
+
+
+def _actualizar_resumen(mensaje, no_leido):
+    """Actualiza la entrada del remitente y la del destinatario (O(1))."""
+    coleccion = _coleccion_resumen()
+    remitente, destinatario = mensaje["remitente"], mensaje["destinatario"]
+    with transaccion():
+        for usuario, otro in ((remitente, destinatario), (destinatario, remitente)):
+            clave = _clave_resumen(usuario, otro)
+            entrada = coleccion.obtener(clave) or {"usuario": otro, "no_leidos": 0}
+            entrada["mensaje"] = mensaje["mensaje"]
+            entrada["fecha"] = mensaje["fecha"]
+            if no_leido and usuario == destinatario and usuario != remitente:
+                entrada["no_leidos"] += 1
+            coleccion.guardar(clave, entrada, grupo=usuario)
+            if usuario == otro:
+                break  # Mensaje a uno mismo: una sola entrada
+
+
+def _reconstruir_resumen(coleccion):
+    """Genera el resumen a partir de los índices ya existentes (sin no leídos)."""
+    if not os.path.isdir(DIRECTORIO_INDICES):
+        return
+    with transaccion():
+        for nombre in os.listdir(DIRECTORIO_INDICES):
+            cabecera, offsets = _leer_indice(os.path.join(DIRECTORIO_INDICES, nombre))
+            if not offsets:
+                continue
+            ultimo = _bitacora.leer(offsets[-1:])[0]
+            for usuario, otro in (cabecera, cabecera[::-1]):
+                entrada = {"usuario": otro, "mensaje": ultimo["mensaje"], "fecha": ultimo["fecha"], "no_leidos": 0}
+                coleccion.guardar(_clave_resumen(usuario, otro), entrada, grupo=usuario)
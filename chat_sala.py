@@ -0,0 +1,181 @@
+import datetime
+import json
+import os
+from storage import Bitacora
+
+# -----------------------------------------------------------------------------
+# chat_sala.py – Mensajes del chat de cada sala y aviso de mensajes nuevos
+# -----------------------------------------------------------------------------
+# Cada sala tiene su bitácora de solo anexar (chat_salas/sala_<id>.log, un JSON
+# por línea), lo que permite:
+#   - abrir el chat leyendo solo los últimos MENSAJES_POR_PAGINA mensajes;
+#   - pedir páginas anteriores a partir del offset del primer mensaje mostrado;
+#   - leer solo los bytes añadidos después del último offset conocido.
+# El antiguo chat_sala_<id>.json se importa la primera vez.
+#
+# Cada mensaje lleva un número de secuencia ("seq") creciente dentro de su sala.
+# Las ventanas de chat se suscriben con SuscripcionChat y reciben solo los
+# mensajes con seq mayor al último que ya muestran:
+#   - los mensajes enviados desde este proceso se entregan al instante;
+#   - los escritos por otros clientes se detectan comparando el tamaño del
+#     archivo cada INTERVALO_VIGILANCIA_MS. Mientras no crece, no se lee nada.
+# -----------------------------------------------------------------------------
+
+DIRECTORIO_CHATS = "chat_salas"
+MENSAJES_POR_PAGINA = 50
+INTERVALO_VIGILANCIA_MS = 50
+
+# sala_id -> lista de suscripciones activas en este proceso
+_suscripciones = {}
+
+
+def ruta_chat(sala_id):
+    return os.path.join(DIRECTORIO_CHATS, f"sala_{sala_id}.log")
+
+
+def _ahora():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _bitacora(sala_id):
+    """
+    Bitácora del chat de la sala.
+
+    Si no existe, importa chat_sala_<id>.json o la crea con un mensaje de
+    bienvenida del sistema.
+    """
+    bitacora = Bitacora(ruta_chat(sala_id))
+    if bitacora.existe() and bitacora.tamano():
+        return bitacora
+
+    os.makedirs(DIRECTORIO_CHATS, exist_ok=True)
+    with bitacora.bloqueada():
+        if bitacora.tamano():
+            return bitacora  # Otro proceso la creó mientras esperábamos el bloqueo
+        archivo_antiguo = f"chat_sala_{sala_id}.json"
+        if os.path.exists(archivo_antiguo):
+            with open(archivo_antiguo, "r", encoding="utf-8") as f:
+                mensajes = json.load(f)
+        else:
+            mensajes = [{"usuario": "Sistema", "contenido": "¡Bienvenido al chat de sala!", "timestamp": _ahora()}]
+        for i, mensaje in enumerate(mensajes, start=1):
+            mensaje.setdefault("seq", i)
+            bitacora.anexar(mensaje)
+    return bitacora
+
+
+def cargar_ultimos(sala_id, cantidad=MENSAJES_POR_PAGINA):
+    """
+    Últimos mensajes de la sala.
+
+    Returns:
+        tuple: (mensajes, offset del primero, offset del final del archivo)
+    """
+    bitacora = _bitacora(sala_id)
+    fin = bitacora.tamano()
+    mensajes, inicio = bitacora.leer_anteriores(fin, cantidad)
+    return mensajes, inicio, fin
+
+
+def cargar_anteriores(sala_id, offset, cantidad=MENSAJES_POR_PAGINA):
+    """
+    Página de mensajes anteriores a *offset*.
+
+    Returns:
+        tuple: (mensajes, offset del primero)
+    """
+    return _bitacora(sala_id).leer_anteriores(offset, cantidad)
+
+
+def leer_nuevos(sala_id, offset):
+    """
+    Mensajes escritos después de *offset*.
+
+    Returns:
+        tuple: (mensajes, nuevo offset)
+    """
+    return _bitacora(sala_id).leer_desde(offset)
+
+
+def _ultimo_seq(bitacora):
+    """seq del último mensaje legible; las líneas cortadas por una caída se saltan."""
+    offset = bitacora.tamano()
+    while offset > 0:
+        mensajes, offset = bitacora.leer_anteriores(offset, 1)
+        if mensajes:
+            return mensajes[-1]["seq"]
+    return 0
+
+
+def enviar_mensaje(sala_id, usuario, contenido):
+    """Guarda un mensaje nuevo, avisa a las ventanas suscritas y lo devuelve."""
+    bitacora = _bitacora(sala_id)
+    # Con el bloqueo, otro proceso no puede anexar entre leer el último seq y usar el siguiente
+    with bitacora.bloqueada():
+        mensaje = {
+            "seq": _ultimo_seq(bitacora) + 1,
+            "usuario": usuario,
+            "contenido": contenido,
+            "timestamp": _ahora()
+        }
+        bitacora.anexar(mensaje)
+
+    for suscripcion in list(_suscripciones.get(sala_id, [])):
+        suscripcion.recibir([mensaje])
+    return mensaje
+
+
+class SuscripcionChat:
+    """
+    Entrega a *callback* los mensajes nuevos de una sala mientras *widget* exista.
+
+    Args:
+        widget (tk.Misc): Ventana dueña de la suscripción (se usa su after()).
+        sala_id (int): Sala a vigilar.
+        ultimo_seq (int): Último número de secuencia ya mostrado.
+        offset (int): Offset hasta el que ya se leyó la bitácora.
+        callback (callable): Recibe la lista de mensajes nuevos.
+    """
+
+    def __init__(self, widget, sala_id, ultimo_seq, offset, callback):
+        self.widget = widget
+        self.sala_id = sala_id
+        self.ultimo_seq = ultimo_seq
+        self.offset = offset
+        self.callback = callback
+        self.tarea = None
+
+        _suscripciones.setdefault(sala_id, []).append(self)
+        self._programar()
+
+    def recibir(self, mensajes):
+        """Filtra los mensajes ya vistos y entrega el resto."""
+        nuevos = [m for m in mensajes if m["seq"] > self.ultimo_seq]
+        if nuevos:
+            self.ultimo_seq = nuevos[-1]["seq"]
+            self.callback(nuevos)
+
+    def _programar(self):
+        self.tarea = self.widget.after(INTERVALO_VIGILANCIA_MS, self._vigilar)
+
+    def _vigilar(self):
+        try:
+            tamano = os.path.getsize(ruta_chat(self.sala_id))
+        except FileNotFoundError:
+            tamano = self.offset
+        if tamano > self.offset:
+            mensajes, self.offset = leer_nuevos(self.sala_id, self.offset)
+            self.recibir(mensajes)
+        self._programar()
+
+    def cancelar(self):
+        """Deja de vigilar la sala."""
+        if self.tarea is not None:
+            try:
+                self.widget.after_cancel(self.tarea)
+            except Exception:
+                pass  # La ventana ya no existe
+            self.tarea = None
+        suscripciones = _suscripciones.get(self.sala_id, [])
+        if self in suscripciones:
+            suscripciones.remove(self)
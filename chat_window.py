@@ -1,13 +1,11 @@
 # Importamos las bibliotecas necesarias
 import tkinter as tk
-import json
-import os
-from datetime import datetime
+import chat_privado
 
 class ChatWindow:
     """
     Clase que representa una ventana de chat entre dos usuarios.
-    Permite enviar y visualizar mensajes almacenados en un archivo JSON.
+    Permite enviar y visualizar mensajes almacenados con chat_privado.
     """
 
     def __init__(self, usuario_actual, otro_usuario, mensaje_inicial=None):
@@ -21,12 +19,6 @@ class ChatWindow:
         """
         self.usuario_actual = usuario_actual
         self.otro_usuario = otro_usuario
-        self.archivo = "mensajes_chat.json"
-
-        # Si el archivo de mensajes no existe, lo creamos vacío
-        if not os.path.exists(self.archivo):
-            with open(self.archivo, "w") as f:
-                json.dump([], f)
 
         # Creamos la interfaz de la ventana de chat
         self.root = tk.Toplevel()
@@ -54,55 +46,49 @@ class ChatWindow:
 
     def guardar_mensaje(self, contenido):
         """
-        Guarda un nuevo mensaje en el archivo JSON.
+        Guarda un nuevo mensaje al final de la bitácora de mensajes.
 
         Parámetro:
         - contenido: texto del mensaje que se desea guardar.
-        """
-        with open(self.archivo, "r") as f:
-            mensajes = json.load(f)
 
-        mensajes.append({
-            "remitente": self.usuario_actual,
-            "destinatario": self.otro_usuario,
-            "mensaje": contenido,
-            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
-
-        with open(self.archivo, "w") as f:
-            json.dump(mensajes, f, indent=4)
+        Retorna el mensaje guardado.
+        """
+        return chat_privado.enviar_mensaje(self.usuario_actual, self.otro_usuario, contenido)
 
     def mostrar_conversacion(self):
         """
         Muestra todos los mensajes entre el usuario actual y el otro usuario.
         """
-        with open(self.archivo, "r") as f:
-            mensajes = json.load(f)
-
-        # Filtramos solo los mensajes entre estos dos usuarios
-        conversacion = [
-            m for m in mensajes if
-            (m["remitente"] == self.usuario_actual and m["destinatario"] == self.otro_usuario) or
-            (m["remitente"] == self.otro_usuario and m["destinatario"] == self.usuario_actual)
-        ]
+        # Solo se leen los mensajes de esta conversación
+        conversacion = chat_privado.cargar_conversacion(self.usuario_actual, self.otro_usuario)
+        chat_privado.marcar_leida(self.usuario_actual, self.otro_usuario)
 
         # Mostramos los mensajes en la caja de texto
         self.chat_box.config(state="normal")
         self.chat_box.delete(1.0, tk.END)
         for m in conversacion:
-            self.chat_box.insert(
-                tk.END,
-                f"{m['remitente']} ({m['fecha']}):\n{m['mensaje']}\n\n"
-            )
+            self.insertar_mensaje(m)
         self.chat_box.config(state="disabled")
         self.chat_box.see(tk.END)  # Hace scroll al final
 
+    def insertar_mensaje(self, m):
+        """
+        Añade un mensaje al final de la caja de texto (debe estar en estado "normal").
+        """
+        self.chat_box.insert(
+            tk.END,
+            f"{m['remitente']} ({m['fecha']}):\n{m['mensaje']}\n\n"
+        )
+
     def enviar_mensaje(self):
         """
-        Obtiene el mensaje del Entry, lo guarda y actualiza la conversación.
+        Obtiene el mensaje del Entry, lo guarda y lo añade a la conversación.
         """
         texto = self.entry_msg.get().strip()
         if texto:
-            self.guardar_mensaje(texto)
+            mensaje = self.guardar_mensaje(texto)
             self.entry_msg.delete(0, tk.END)
-            self.mostrar_conversacion()
\ No newline at end of file
+            self.chat_box.config(state="normal")
+            self.insertar_mensaje(mensaje)
+            self.chat_box.config(state="disabled")
+            self.chat_box.see(tk.END)
\ No newline at end of file
@@ -1,16 +1,16 @@
 import tkinter as tk
 from tkinter import messagebox
-import json
-import os
 from chat_window import ChatWindow  # Para abrir chats
+from user_manager import coleccion_usuarios
+from emparejamiento import indice_aficiones, juegos_de
+from recomendaciones import recomendador, reconstruir_en_segundo_plano
+from lista_virtual import ListaVirtual
 
 JUEGOS_DISPONIBLES = [
     "Valorant", "League of Legends", "Fortnite", "Apex Legends",
     "Minecraft", "Counter Strike 2", "Rocket League", "Overwatch 2"
 ]
 
-RUTA_USUARIOS = "usuarios.json"
-
 def abrir_conexion_gamer(master, usuario_actual):
     ventana = master
     ventana.title("Conexión Gamer")
@@ -20,17 +20,15 @@ def abrir_conexion_gamer(master, usuario_actual):
     tk.Label(ventana, text="Selecciona hasta 5 juegos favoritos para encontrar otros usuarios con gustos similares. "
                             "También puedes escribir un juego manualmente.", wraplength=550).pack(pady=5)
 
+    coleccion = coleccion_usuarios()
+    indice = indice_aficiones()
+    recomendaciones = recomendador()
     juegos_favoritos = []
     juegos_personalizados = []
-    if os.path.exists(RUTA_USUARIOS):
-        try:
-            with open(RUTA_USUARIOS, "r") as f:
-                usuarios = json.load(f)
-                if usuario_actual in usuarios:
-                    juegos_favoritos = usuarios[usuario_actual].get("juegos_favoritos", [])
-                    juegos_personalizados = usuarios[usuario_actual].get("juegos_personalizados", [])
-        except json.JSONDecodeError:
-            pass
+    datos_usuario = coleccion.obtener(usuario_actual)
+    if datos_usuario is not None:
+        juegos_favoritos = datos_usuario.get("juegos_favoritos", [])
+        juegos_personalizados = datos_usuario.get("juegos_personalizados", [])
 
     frame_juegos = tk.Frame(ventana)
     frame_juegos.pack(pady=10)
@@ -58,17 +56,6 @@ def abrir_conexion_gamer(master, usuario_actual):
     frame_resultados.pack(pady=10)
 
     def confirmar_preferencias():
-        if not os.path.exists(RUTA_USUARIOS):
-            messagebox.showerror("Error", "No se encontró usuarios.json")
-            return
-
-        try:
-            with open(RUTA_USUARIOS, "r") as f:
-                usuarios = json.load(f)
-        except json.JSONDecodeError:
-            messagebox.showerror("Error", "Error al leer usuarios.json")
-            return
-
         seleccionados = [j for j, var in variables if var.get()]
         juego_extra = entry_juego_extra.get().strip().title()
 
@@ -81,55 +68,62 @@ def abrir_conexion_gamer(master, usuario_actual):
             messagebox.showwarning("Límite excedido", "Solo puedes elegir hasta 5 juegos en total.")
             return
 
-        # Guardar en JSON separado
-        if usuario_actual in usuarios:
-            usuarios[usuario_actual]["juegos_favoritos"] = seleccionados
-            usuarios[usuario_actual]["juegos_personalizados"] = [juego_extra] if juego_extra else []
-        else:
+        # Guardar solo el registro del usuario actual
+        datos = coleccion.obtener(usuario_actual)
+        if datos is None:
             messagebox.showerror("Error", "Usuario no encontrado en la base de datos.")
             return
-
-        with open(RUTA_USUARIOS, "w") as f:
-            json.dump(usuarios, f, indent=4)
+        datos["juegos_favoritos"] = seleccionados
+        datos["juegos_personalizados"] = [juego_extra] if juego_extra else []
+        indice.actualizar(usuario_actual, datos)
 
         messagebox.showinfo("Guardado", "Preferencias guardadas correctamente ✅")
 
     def buscar_coincidencias():
-        if not os.path.exists(RUTA_USUARIOS):
-            messagebox.showerror("Error", "No se encontró usuarios.json")
-            return
+        datos = coleccion.obtener(usuario_actual)
 
-        with open(RUTA_USUARIOS, "r") as f:
-            usuarios = json.load(f)
-
-        if usuario_actual not in usuarios:
+        if datos is None:
             messagebox.showwarning("Sin preferencias", "Primero debes confirmar tus preferencias.")
             return
 
-        mis_juegos = usuarios[usuario_actual].get("juegos_favoritos", []) + usuarios[usuario_actual].get("juegos_personalizados", [])
+        mis_juegos = juegos_de(datos)
         if not mis_juegos:
             messagebox.showwarning("Sin preferencias", "Primero debes confirmar tus preferencias.")
             return
 
         nonlocal frame_resultados
         frame_resultados.destroy()
-        mostrar_resultados(usuarios, usuario_actual, mis_juegos)
+        mostrar_resultados(usuario_actual, mis_juegos)
+        # La tabla se pone al día después de mostrar lo que ya estaba calculado
+        ventana.after_idle(lambda: sincronizar_recomendaciones(mis_juegos))
+
+    def sincronizar_recomendaciones(mis_juegos):
+        if not recomendaciones.tiene_instantanea():
+            # La primera vez se recalcula toda la tabla: en otro proceso, para no congelar la ventana
+            esperar_reconstruccion(reconstruir_en_segundo_plano(), mis_juegos)
+            return
+        if usuario_actual in recomendaciones.sincronizar() and frame_resultados.winfo_exists():
+            frame_resultados.destroy()
+            mostrar_resultados(usuario_actual, mis_juegos)
 
-    def eliminar_preferencias():
-        if not os.path.exists(RUTA_USUARIOS):
-            messagebox.showerror("Error", "No se encontró usuarios.json")
+    def esperar_reconstruccion(proceso, mis_juegos):
+        if not ventana.winfo_exists():
             return
+        if proceso.poll() is None:
+            ventana.after(500, esperar_reconstruccion, proceso, mis_juegos)
+        elif recomendaciones.tiene_instantanea():
+            # Ya solo queda aplicar lo que cambió mientras se calculaba
+            sincronizar_recomendaciones(mis_juegos)
 
-        with open(RUTA_USUARIOS, "r") as f:
-            usuarios = json.load(f)
+    def eliminar_preferencias():
+        datos = coleccion.obtener(usuario_actual)
 
-        if usuario_actual in usuarios and ("juegos_favoritos" in usuarios[usuario_actual] or "juegos_personalizados" in usuarios[usuario_actual]):
+        if datos is not None and ("juegos_favoritos" in datos or "juegos_personalizados" in datos):
             confirmar = messagebox.askyesno("Confirmar eliminación", "¿Seguro quieres eliminar tus preferencias de juegos?")
             if confirmar:
-                usuarios[usuario_actual].pop("juegos_favoritos", None)
-                usuarios[usuario_actual].pop("juegos_personalizados", None)
-                with open(RUTA_USUARIOS, "w") as f:
-                    json.dump(usuarios, f, indent=4)
+                datos.pop("juegos_favoritos", None)
+                datos.pop("juegos_personalizados", None)
+                indice.actualizar(usuario_actual, datos)
                 messagebox.showinfo("Eliminado", "Tus preferencias fueron eliminadas ✅")
 
                 # Limpiar UI
@@ -140,34 +134,61 @@ def abrir_conexion_gamer(master, usuario_actual):
         else:
             messagebox.showinfo("Sin preferencias", "No hay preferencias que eliminar.")
 
-    def mostrar_resultados(usuarios, usuario_actual, mis_juegos):
+    def crear_fila_resultado(padre):
+        fila = tk.Frame(padre)
+        fila.texto = tk.Label(fila, anchor="w")
+        fila.texto.pack(side="left", fill="x", expand=True)
+        fila.boton = tk.Button(fila, text="Chatear")
+        fila.boton.pack(side="right")
+        return fila
+
+    def llenar_fila_resultado(fila, resultado):
+        usuario, afinidad, juegos = resultado
+        if juegos:
+            texto = f"{usuario} - {len(juegos)} en común: {', '.join(juegos)} (afinidad {afinidad:.2f})"
+        else:
+            texto = f"{usuario} - mismas salas o eventos (afinidad {afinidad:.2f})"
+        fila.texto.config(text=texto)
+        fila.boton.config(command=lambda: ChatWindow(usuario_actual, usuario))
+
+    def mostrar_resultados(usuario_actual, mis_juegos):
         nonlocal frame_resultados
         frame_resultados = tk.Frame(ventana)
-        frame_resultados.pack(pady=10)
-
-        coincidencias = []
-        for usuario, data in usuarios.items():
-            if usuario == usuario_actual or "juegos_favoritos" not in data:
-                continue
-            juegos_otros = data.get("juegos_favoritos", []) + data.get("juegos_personalizados", [])
-            en_comun = set(mis_juegos) & set(juegos_otros)
-            if en_comun:
-                coincidencias.append((usuario, len(en_comun), list(en_comun)))
-
-        if not coincidencias:
-            tk.Label(frame_resultados, text="No se encontraron coincidencias 🥲").pack()
+        frame_resultados.pack(pady=10, fill="both", expand=True)
+
+        titulo = tk.Label(frame_resultados, font=("Arial", 12, "bold"))
+        titulo.pack(pady=5)
+        boton_todas = tk.Button(frame_resultados, text="Ver todas las coincidencias")
+        # Solo se crean widgets para las filas visibles, por muchos resultados que haya
+        lista = ListaVirtual(frame_resultados, crear_fila_resultado, llenar_fila_resultado,
+                             texto_vacio="No se encontraron coincidencias 🥲")
+
+        def ver_todas():
+            # Búsqueda directa por juegos: las páginas se ordenan a medida que se piden
+            resultados = indice.buscar(usuario_actual, mis_juegos)
+            titulo.config(text=f"Usuarios con juegos en común ({resultados.total}):")
+            boton_todas.pack_forget()
+            lista.mostrar(resultados.total, resultados.pagina)
+
+        fila = recomendaciones.fila(usuario_actual)
+        if fila is None:
+            # Aún no hay fila precalculada
+            lista.pack(fill="both", expand=True, padx=10)
+            ver_todas()
             return
 
-        coincidencias.sort(key=lambda x: x[1], reverse=True)
-
-        tk.Label(frame_resultados, text="Usuarios con juegos en común:", font=("Arial", 12, "bold")).pack(pady=5)
-
-        for usuario, cantidad, juegos in coincidencias:
-            texto = f"{usuario} - {cantidad} en común: {', '.join(juegos)}"
-            frame = tk.Frame(frame_resultados)
-            frame.pack(fill="x", padx=10, pady=2)
-            tk.Label(frame, text=texto).pack(side="left")
-            tk.Button(frame, text="Chatear", command=lambda u=usuario: ChatWindow(usuario_actual, u)).pack(side="right")
+        recomendados = []
+        for usuario, afinidad in fila:
+            datos_otro = coleccion.obtener(usuario)
+            if datos_otro is not None:
+                suyos = juegos_de(datos_otro)
+                recomendados.append((usuario, afinidad, [j for j in mis_juegos if j in suyos]))
+
+        titulo.config(text="Jugadores recomendados:")
+        boton_todas.config(command=ver_todas)
+        boton_todas.pack(pady=(0, 5))
+        lista.pack(fill="both", expand=True, padx=10)
+        lista.mostrar(len(recomendados), lambda inicio, cantidad: recomendados[inicio:inicio + cantidad])
 
     frame_botones = tk.Frame(ventana)
     frame_botones.pack(pady=10)
@@ -0,0 +1,355 @@
+import heapq
+import importlib.util
+import math
+from collections import Counter
+
+from storage import siguiente_valor, transaccion, valor_secuencia
+from user_manager import coleccion_usuarios
+
+# NumPy y SciPy tardan en importarse: solo se cargan al construir la matriz
+_HAY_NUMPY = all(importlib.util.find_spec(modulo) is not None for modulo in ("numpy", "scipy"))
+np = None
+sparse = None
+
+
+def _cargar_numpy():
+    global np, sparse
+    if np is None:
+        import numpy
+        import scipy.sparse
+        np, sparse = numpy, scipy.sparse
+
+# -----------------------------------------------------------------------------
+# emparejamiento.py – Búsqueda de jugadores con juegos en común
+# -----------------------------------------------------------------------------
+# "Buscar coincidencias" recorría todos los usuarios e intersecaba sus juegos
+# con los del usuario actual. IndiceAficiones mantiene en memoria el índice
+# invertido juego -> usuarios que lo tienen entre sus preferencias, así que
+# una búsqueda solo cuenta coincidencias de los candidatos que comparten al
+# menos un juego y se queda con los K mejores con un heap, sin ordenar todo.
+#
+# Los candidatos se ordenan por una similitud (ver SIMILITUDES):
+#   - "comun":   número de juegos en común;
+#   - "jaccard": juegos en común / juegos distintos entre los dos;
+#   - "tfidf":   coseno entre los vectores de juegos pesados por IDF, de modo
+#                que compartir un juego poco común cuenta más que compartir
+#                uno que tiene medio servidor.
+# Los juegos personalizados cuentan igual que los de la lista.
+#
+# Con muchos usuarios (UMBRAL_MATRIZ) y NumPy/SciPy instalados, la similitud
+# se calcula para todos a la vez con una matriz dispersa usuarios x juegos:
+# una multiplicación matriz-vector y np.partition para el top K. Sin NumPy
+# se usa el recorrido por candidatos en Python puro, con el mismo resultado.
+# buscar() devuelve los resultados por páginas y solo ordena lo que se pide,
+# para poder mostrarlos en una lista virtual sin materializarlos todos.
+#
+# El índice se construye a partir de la caché compartida de usuarios y se
+# actualiza usuario a usuario al guardar o borrar preferencias (actualizar).
+# Los usuarios cambiados desde que se construyó la matriz se puntúan aparte
+# en Python hasta que son demasiados y la matriz se reconstruye. Si la
+# colección cambia por otra vía (registro, perfil u otro proceso) todo se
+# vuelve a construir en la siguiente búsqueda.
+# -----------------------------------------------------------------------------
+
+MAX_COINCIDENCIAS = 50
+SIMILITUDES = ("comun", "jaccard", "tfidf")
+SIMILITUD_PREDETERMINADA = "tfidf"
+
+# Usuarios a partir de los cuales se usa la matriz dispersa (si hay NumPy)
+UMBRAL_MATRIZ = 50_000
+# Usuarios modificados que se toleran antes de reconstruir la matriz
+MAX_CAMBIOS_MATRIZ = 1_000
+
+# Contador que solo avanza cuando cambian los juegos de algún usuario (ver
+# version_juegos): cambiar la contraseña o el email no lo toca
+CONTADOR_JUEGOS = "juegos_usuarios"
+
+
+def juegos_de(datos):
+    """Juegos favoritos y personalizados de un usuario, sin repetir, en orden."""
+    juegos = datos.get("juegos_favoritos", []) + datos.get("juegos_personalizados", [])
+    return list(dict.fromkeys(juegos))
+
+
+def version_juegos():
+    """
+    Versión de los juegos de los usuarios.
+
+    A diferencia de la versión de la colección, solo cambia al guardar o
+    borrar preferencias y al renombrar o eliminar un usuario que las tenía.
+    """
+    return valor_secuencia(CONTADOR_JUEGOS)
+
+
+def marcar_juegos_cambiados():
+    """Avanza version_juegos(); se llama después de cambiar los juegos de un usuario."""
+    siguiente_valor(CONTADOR_JUEGOS)
+
+
+class IndiceAficiones:
+    """
+    Índice invertido juego -> usuarios sobre la colección de usuarios.
+
+    Solo se indexan los usuarios que confirmaron preferencias (tienen la
+    clave "juegos_favoritos"), igual que la búsqueda original.
+    """
+
+    def __init__(self, coleccion):
+        self.coleccion = coleccion
+        self.por_juego = {}
+        self.juegos_por_usuario = {}
+        self.version = None
+        self._olvidar_matriz()
+
+    def _vigente(self):
+        if self.version != self.coleccion.version_vigente():
+            self._construir()
+
+    def _construir(self):
+        self.por_juego = {}
+        self.juegos_por_usuario = {}
+        for usuario, datos in self.coleccion.items():
+            self._indexar(usuario, datos)
+        self._olvidar_matriz()
+        self.version = self.coleccion.version
+
+    def _indexar(self, usuario, datos):
+        if "juegos_favoritos" not in datos:
+            return
+        juegos = juegos_de(datos)
+        self.juegos_por_usuario[usuario] = juegos
+        for juego in juegos:
+            self.por_juego.setdefault(juego, set()).add(usuario)
+
+    def _desindexar(self, usuario):
+        for juego in self.juegos_por_usuario.pop(usuario, []):
+            usuarios = self.por_juego.get(juego)
+            if usuarios is None:
+                continue
+            usuarios.discard(usuario)
+            if not usuarios:
+                del self.por_juego[juego]
+
+    def actualizar(self, usuario, datos):
+        """Guarda las preferencias de *usuario* y reindexa solo ese usuario."""
+        self._vigente()
+        anteriores = self.juegos_por_usuario.get(usuario)
+        nuevos = juegos_de(datos) if "juegos_favoritos" in datos else None
+        with transaccion():
+            if not self.coleccion.actualizar(usuario, datos):
+                return False
+            if nuevos != anteriores:
+                marcar_juegos_cambiados()
+        self._desindexar(usuario)
+        self._indexar(usuario, datos)
+        if self._matriz is not None:
+            self._cambiados.add(usuario)
+        self.version = self.coleccion.version
+        return True
+
+    # ------------------------------------------------------------------
+    # Similitud
+    # ------------------------------------------------------------------
+    def _idf(self, juego):
+        """IDF suavizado: log((1 + usuarios) / (1 + usuarios con el juego)) + 1."""
+        total = len(self.juegos_por_usuario)
+        return math.log((1 + total) / (1 + len(self.por_juego.get(juego, ())))) + 1
+
+    def _norma(self, juegos):
+        return math.sqrt(sum(self._idf(juego) ** 2 for juego in juegos))
+
+    def _puntuacion(self, similitud, otro, comunes, juegos, pesos, norma):
+        """Similitud entre *juegos* (con pesos IDF² y norma ya calculados) y *otro*."""
+        if similitud == "comun":
+            return comunes
+        suyos = self.juegos_por_usuario[otro]
+        if similitud == "jaccard":
+            return comunes / (len(juegos) + len(suyos) - comunes)
+        peso_comun = sum(pesos[juego] for juego in juegos if otro in self.por_juego.get(juego, ()))
+        return peso_comun / (norma * self._norma(suyos))
+
+    def buscar(self, usuario, juegos, similitud=SIMILITUD_PREDETERMINADA):
+        """
+        Puntúa a los usuarios parecidos a quien tiene *juegos*.
+
+        Args:
+            usuario (str): Usuario que busca (se excluye del resultado).
+            juegos (list): Sus juegos favoritos y personalizados.
+            similitud (str): Una de SIMILITUDES.
+
+        Returns:
+            ResultadosBusqueda: Resultados que se ordenan a medida que se piden páginas.
+        """
+        if similitud not in SIMILITUDES:
+            raise ValueError(f"Similitud desconocida: {similitud}")
+        self._vigente()
+        juegos = list(dict.fromkeys(juegos))
+        pesos = {juego: self._idf(juego) ** 2 for juego in juegos}
+        norma = math.sqrt(sum(pesos.values()))
+
+        if _HAY_NUMPY and len(self.juegos_por_usuario) >= UMBRAL_MATRIZ:
+            total, candidatos = self._puntuar_matriz(similitud, usuario, juegos, pesos, norma)
+        else:
+            puntuados = self._puntuar_candidatos(similitud, usuario, juegos, pesos, norma)
+            total, candidatos = len(puntuados), lambda cantidad: puntuados
+        return ResultadosBusqueda(self, juegos, total, candidatos)
+
+    def coincidencias(self, usuario, juegos, cantidad=MAX_COINCIDENCIAS, similitud=SIMILITUD_PREDETERMINADA):
+        """
+        Los *cantidad* usuarios más parecidos a quien tiene *juegos*.
+
+        Returns:
+            list: Tuplas (usuario, puntuación, juegos en común), de mayor a
+            menor puntuación y por nombre en caso de empate.
+        """
+        return self.buscar(usuario, juegos, similitud).pagina(0, cantidad)
+
+    def _puntuar_candidatos(self, similitud, usuario, juegos, pesos, norma):
+        """Puntúa en Python solo a los usuarios que comparten algún juego."""
+        cuentas = Counter()
+        for juego in juegos:
+            cuentas.update(self.por_juego.get(juego, ()))
+        cuentas.pop(usuario, None)
+        return [
+            (otro, self._puntuacion(similitud, otro, comunes, juegos, pesos, norma))
+            for otro, comunes in cuentas.items()
+        ]
+
+    # ------------------------------------------------------------------
+    # Matriz dispersa usuarios x juegos (NumPy/SciPy)
+    # ------------------------------------------------------------------
+    def _olvidar_matriz(self):
+        self._matriz = None
+        self._tamanos = None
+        self._orden_nombre = None
+        self._filas = []
+        self._fila_de = {}
+        self._columnas = {}
+        self._cambiados = set()
+
+    def _construir_matriz(self):
+        _cargar_numpy()
+        self._olvidar_matriz()
+        self._columnas = {juego: i for i, juego in enumerate(self.por_juego)}
+        self._filas = list(self.juegos_por_usuario)
+        self._fila_de = {usuario: i for i, usuario in enumerate(self._filas)}
+        inicios = [0]
+        columnas = []
+        for usuario in self._filas:
+            columnas.extend(self._columnas[juego] for juego in self.juegos_por_usuario[usuario])
+            inicios.append(len(columnas))
+        self._matriz = sparse.csr_matrix(
+            (np.ones(len(columnas)), np.array(columnas, dtype=np.int32), np.array(inicios, dtype=np.int64)),
+            shape=(len(self._filas), len(self._columnas)),
+        )
+        self._tamanos = np.diff(self._matriz.indptr).astype(np.float64)
+        self._orden_nombre = np.empty(len(self._filas), dtype=np.int64)
+        self._orden_nombre[sorted(range(len(self._filas)), key=self._filas.__getitem__)] = np.arange(len(self._filas))
+
+    def _puntuar_matriz(self, similitud, usuario, juegos, pesos, norma):
+        """
+        Puntúa a todos los usuarios a la vez.
+
+        Returns:
+            tuple: (número de usuarios con puntuación, función que dada una
+            cantidad K devuelve una lista de (usuario, puntuación) que
+            contiene a los K mejores).
+        """
+        if self._matriz is None or len(self._cambiados) > MAX_CAMBIOS_MATRIZ:
+            self._construir_matriz()
+        matriz = self._matriz
+        # Si la matriz se reconstruye mientras se piden páginas, se siguen usando estas
+        nombres, orden_nombre = self._filas, self._orden_nombre
+
+        consulta = np.zeros(matriz.shape[1])
+        for juego in juegos:
+            if juego in self._columnas:
+                consulta[self._columnas[juego]] = 1.0
+
+        comunes = matriz @ consulta
+        if similitud == "comun":
+            puntuaciones = comunes
+        elif similitud == "jaccard":
+            puntuaciones = np.divide(comunes, self._tamanos + len(juegos) - comunes,
+                                     out=np.zeros_like(comunes), where=comunes > 0)
+        else:
+            pesos_columnas = np.array([self._idf(juego) ** 2 for juego in self._columnas])
+            normas = np.sqrt(matriz @ pesos_columnas) * norma
+            puntuaciones = np.divide(matriz @ (consulta * pesos_columnas), normas,
+                                     out=np.zeros_like(comunes), where=comunes > 0)
+
+        # Las filas de los usuarios cambiados están desfasadas: se puntúan aparte
+        excluidas = [self._fila_de[otro] for otro in self._cambiados | {usuario} if otro in self._fila_de]
+        puntuaciones[excluidas] = 0
+        positivas = np.flatnonzero(puntuaciones > 0)
+
+        conjunto = set(juegos)
+        aparte = []
+        for otro in self._cambiados - {usuario}:
+            comunes_otro = len(conjunto.intersection(self.juegos_por_usuario.get(otro, ())))
+            if comunes_otro:
+                aparte.append((otro, self._puntuacion(similitud, otro, comunes_otro, juegos, pesos, norma)))
+
+        def candidatos(cantidad):
+            filas = positivas
+            if len(filas) > cantidad:
+                # Entre los que empatan con el K-ésimo se quedan los primeros por nombre
+                corte = np.partition(puntuaciones[filas], -cantidad)[-cantidad]
+                filas = filas[puntuaciones[filas] >= corte - 1e-9]
+                if len(filas) > cantidad:
+                    orden = np.lexsort((orden_nombre[filas], -np.round(puntuaciones[filas], 9)))
+                    filas = filas[orden[:cantidad]]
+            return [
+                (nombres[fila], int(p) if similitud == "comun" else p)
+                for fila, p in zip(filas.tolist(), puntuaciones[filas].tolist())
+            ] + aparte
+
+        return len(positivas) + len(aparte), candidatos
+
+
+class ResultadosBusqueda:
+    """
+    Resultado de IndiceAficiones.buscar(), ordenado bajo demanda.
+
+    Solo se ordena el prefijo que se ha pedido (duplicándolo cuando hace
+    falta más), así que mostrar la primera página de una búsqueda con cientos
+    de miles de candidatos no ordena todos.
+
+    Atributos:
+        total (int): Número de usuarios con alguna coincidencia.
+    """
+
+    def __init__(self, indice, juegos, total, candidatos):
+        self.indice = indice
+        self.juegos = juegos
+        self.total = total
+        self._candidatos = candidatos
+        self._ordenados = []
+
+    def pagina(self, inicio, cantidad):
+        """
+        Resultados de las posiciones [inicio, inicio + cantidad).
+
+        Returns:
+            list: Tuplas (usuario, puntuación, juegos en común).
+        """
+        necesarios = min(inicio + cantidad, self.total)
+        if necesarios > len(self._ordenados):
+            tope = min(self.total, max(necesarios, 2 * len(self._ordenados)))
+            # Redondeo para que los empates no dependan del orden de las sumas en coma flotante
+            self._ordenados = heapq.nsmallest(tope, self._candidatos(tope),
+                                              key=lambda par: (-round(par[1], 9), par[0]))
+        por_juego = self.indice.por_juego
+        return [
+            (otro, puntuacion, [juego for juego in self.juegos if otro in por_juego.get(juego, ())])
+            for otro, puntuacion in self._ordenados[inicio:inicio + cantidad]
+        ]
+
+_indice = None
+
+def indice_aficiones():
+    """Índice de aficiones compartido por todas las ventanas del proceso."""
+    global _indice
+    if _indice is None:
+        _indice = IndiceAficiones(coleccion_usuarios())
+    return _indice
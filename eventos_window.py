@@ -1,9 +1,8 @@
 # eventos_window.py
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
 import datetime
+from storage import Coleccion
 
 class EventosWindow:
     def __init__(self, master, usuario,is_admin):
@@ -18,16 +17,22 @@ class EventosWindow:
         self.crear_widgets()
 
     def cargar_eventos(self):
-        if os.path.exists(self.archivo):
-            with open(self.archivo, "r", encoding="utf-8") as f:
-                self.eventos = json.load(f)
+        self.coleccion = Coleccion("eventos", self.archivo)
+        self.eventos = self.coleccion.todos()
+
+    def guardar_evento(self, evento):
+        self.coleccion.guardar(evento["id"], evento)
+
+    def modificar_evento(self, evento, cambio):
+        # El cambio se aplica a la versión guardada más reciente, por si otro
+        # usuario modificó el evento (p. ej. se inscribió) después de cargarlo
+        actual, motivo = self.coleccion.modificar(evento["id"], cambio)
+        if actual is None:
+            self.eventos = [e for e in self.eventos if e["id"] != evento["id"]]
         else:
-            self.eventos = []
-            self.guardar_eventos()
-
-    def guardar_eventos(self):
-        with open(self.archivo, "w", encoding="utf-8") as f:
-            json.dump(self.eventos, f, indent=4, ensure_ascii=False)
+            evento.clear()
+            evento.update(actual)
+        return actual, motivo
 
     def crear_widgets(self):
         frame_superior = tk.Frame(self.master)
@@ -90,7 +95,7 @@ class EventosWindow:
                 messagebox.showerror("Error", "Fecha u hora inválida.")
                 return
 
-            nuevo_id = max((e["id"] for e in self.eventos), default=0) + 1
+            nuevo_id = self.coleccion.nuevo_id()
             nuevo_evento = {
                 "id": nuevo_id,
                 "titulo": titulo,
@@ -102,7 +107,7 @@ class EventosWindow:
             }
 
             self.eventos.append(nuevo_evento)
-            self.guardar_eventos()
+            self.guardar_evento(nuevo_evento)
             self.actualizar_lista()
             ventana_nuevo.destroy()
             messagebox.showinfo("Éxito", "Evento creado correctamente.")
@@ -141,21 +146,35 @@ class EventosWindow:
 
         # Inscripción
         if self.usuario not in inscritos:
+            def inscribir(actual):
+                if self.usuario in actual.setdefault("inscritos", []):
+                    return "inscrito"
+                actual["inscritos"].append(self.usuario)
+
             def inscribirse():
-                evento["inscritos"].append(self.usuario)
-                self.guardar_eventos()
+                actual, _ = self.modificar_evento(evento, inscribir)
                 ventana_detalle.destroy()
-                messagebox.showinfo("Éxito", "Te has inscrito al evento.")
+                if actual is None:
+                    messagebox.showerror("Error", "El evento ya no existe.")
+                else:
+                    messagebox.showinfo("Éxito", "Te has inscrito al evento.")
                 self.actualizar_lista()
 
             tk.Button(ventana_detalle, text="Inscribirme", command=inscribirse).pack(pady=10)
         else:
+            def desinscribir(actual):
+                if self.usuario not in actual.get("inscritos", []):
+                    return "no_inscrito"
+                actual["inscritos"].remove(self.usuario)
+
             def desinscribirse():
                 if messagebox.askyesno("Confirmar", "¿Quieres desinscribirte del evento?"):
-                    evento["inscritos"].remove(self.usuario)
-                    self.guardar_eventos()
+                    actual, _ = self.modificar_evento(evento, desinscribir)
                     ventana_detalle.destroy()
-                    messagebox.showinfo("Listo", "Te desinscribiste del evento.")
+                    if actual is None:
+                        messagebox.showerror("Error", "El evento ya no existe.")
+                    else:
+                        messagebox.showinfo("Listo", "Te desinscribiste del evento.")
                     self.actualizar_lista()
 
             tk.Label(ventana_detalle, text="Ya estás inscrito en este evento.").pack(pady=5)
@@ -170,7 +189,7 @@ class EventosWindow:
             def eliminar_evento():
                 if messagebox.askyesno("Confirmar", "¿Estás seguro de eliminar este evento?"):
                     self.eventos = [e for e in self.eventos if e["id"] != evento["id"]]
-                    self.guardar_eventos()
+                    self.coleccion.eliminar(evento["id"])
                     ventana_detalle.destroy()
                     self.actualizar_lista()
                     messagebox.showinfo("Éxito", "Evento eliminado correctamente.")
@@ -217,14 +236,19 @@ class EventosWindow:
                 messagebox.showerror("Error", "Fecha u hora inválida.")
                 return
 
-            evento["titulo"] = titulo
-            evento["descripcion"] = descripcion
-            evento["fecha"] = fecha
-            evento["hora"] = hora
+            # Solo se cambian los campos editados: se conservan los inscritos actuales
+            def editar(actual):
+                actual["titulo"] = titulo
+                actual["descripcion"] = descripcion
+                actual["fecha"] = fecha
+                actual["hora"] = hora
 
-            self.guardar_eventos()
+            actual, _ = self.modificar_evento(evento, editar)
             self.actualizar_lista()
             ventana_editar.destroy()
-            messagebox.showinfo("Éxito", "Evento actualizado correctamente.")
+            if actual is None:
+                messagebox.showerror("Error", "El evento ya no existe.")
+            else:
+                messagebox.showinfo("Éxito", "Evento actualizado correctamente.")
 
         tk.Button(ventana_editar, text="Guardar cambios", command=guardar_cambios).pack(pady=10)
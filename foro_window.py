@@ -3,6 +3,11 @@ from tkinter import ttk, scrolledtext, messagebox
 import datetime
 import json
 import os
+from storage import Coleccion, eliminar_secuencia, escribir_json, siguiente_valor, transaccion
+from treeview_virtual import TreeviewVirtual
+from indices import IndiceJuegos
+from repositorio import repositorio
+from lista_virtual import ListaVirtual
 from chat_crud import abrir_crud_chats
 from chat_window import ChatWindow
 class ForoWindow:
@@ -10,14 +15,17 @@ class ForoWindow:
     ForoWindow: Interfaz gráfica para un foro de discusión utilizando Tkinter.
     
     Esta clase implementa una ventana de foro que permite a los usuarios crear, visualizar,
-    editar y eliminar temas y respuestas. Los datos del foro se almacenan en un archivo JSON.
+    editar y eliminar temas y respuestas. Los temas se guardan uno a uno en la colección
+    "foro" de storage.py (importada del antiguo foro_data.json) y las respuestas en la
+    colección "respuestas" con clave "<id tema>:<id respuesta>", agrupadas por tema.
     
     Atributos:
         master (tk.Tk): La ventana principal de Tkinter.
         usuario (str): Nombre del usuario que ha iniciado sesión.
-        data_file (str): Ruta del archivo JSON para almacenar los mensajes.
-        botones_respuestas (list): Almacena referencias a los botones de las respuestas.
-        mensajes (list): Lista de diccionarios que contienen los mensajes del foro.
+        data_file (str): Ruta del archivo JSON antiguo de mensajes (se importa a storage).
+        respuestas (Coleccion): Respuestas de todos los temas (grupo = ID del tema).
+        repositorio (Repositorio): Temas en memoria por ID y por juego, compartidos
+            con las demás ventanas del foro.
         is_admin (bool): Indica si el usuario actual tiene privilegios de administrador.
         juegos (list): Lista de juegos disponibles como temas.
         juego_actual (str): Juego seleccionado para filtrar.
@@ -41,9 +49,6 @@ class ForoWindow:
         self.data_file = "foro_data.json"
         self.juegos_file = "juegos_data.json"
         
-        # Para mantener referencia a los botones de las respuestas
-        self.botones_respuestas = []
-        
         # Juego seleccionado actualmente para filtrar (None = mostrar todos)
         self.juego_actual = None
         
@@ -84,34 +89,28 @@ class ForoWindow:
     
     def guardar_juegos(self):
         """
-        Guarda la lista de juegos en el archivo JSON.
+        Guarda la lista de juegos en el archivo JSON (sin dejarlo a medias si algo falla).
         """
         try:
-            with open(self.juegos_file, 'w', encoding='utf-8') as f:
-                json.dump(self.juegos, f, ensure_ascii=False, indent=4)
+            escribir_json(self.juegos_file, self.juegos, ensure_ascii=False, indent=4)
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar los juegos: {str(e)}")
         
     def cargar_mensajes(self):
         """
-        Carga los mensajes desde el archivo JSON.
+        Carga los temas en el repositorio compartido del foro.
         
-        Si el archivo no existe, crea mensajes de prueba predeterminados.
-        En caso de error, inicializa mensajes como una lista vacía.
+        Si la colección no existía, crea mensajes de prueba predeterminados.
+        En caso de error, deja un índice vacío y las acciones que escriben
+        quedan desactivadas.
         """
-        # Intentar cargar mensajes desde el archivo, o crear mensajes de prueba si no existe
+        self.carga_fallida = False
+        # Intentar cargar mensajes, o crear mensajes de prueba si la colección es nueva
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    self.mensajes = json.load(f)
-                    
-                    # Asegurar compatibilidad con datos antiguos
-                    for mensaje in self.mensajes:
-                        if "juego" not in mensaje:
-                            mensaje["juego"] = "General"
-            else:
+            self.coleccion = Coleccion("foro", self.data_file)
+            if self.coleccion.recien_creada:
                 # Mensajes de prueba para mostrar en el foro
-                self.mensajes = [
+                for mensaje in [
                     {"id": 1, "usuario": "Admin", "fecha": "2025-04-10", "titulo": "Bienvenida", 
                      "contenido": "¡Bienvenidos al foro de Tkinder!", "respuestas": [], "juego": "General"},
                     {"id": 2, "usuario": "JugadorPro", "fecha": "2025-04-10", "titulo": "Busco equipo", 
@@ -120,24 +119,58 @@ class ForoWindow:
                          {"id": 1, "usuario": "GameMaster", "fecha": "2025-04-10", "contenido": "Yo tengo un grupo, contáctame"},
                          {"id": 2, "usuario": "Novatillo", "fecha": "2025-04-11", "contenido": "¿De qué nivel es el torneo?"}
                      ]},
-                ]
-                self.guardar_mensajes()
+                ]:
+                    self.coleccion.guardar(mensaje["id"], mensaje)
+            self.respuestas = Coleccion("respuestas")
+            # Los temas se leen de la base solo la primera vez (o al pulsar "Actualizar")
+            self.repositorio = repositorio(self.coleccion, self.completar_tema)
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar los mensajes: {str(e)}")
-            self.mensajes = []
+            self.repositorio = IndiceJuegos()  # Sin guardar/recargar: ver crear_widgets()
+            self.carga_fallida = True
+    
+    def completar_tema(self, mensaje):
+        """
+        Asegura la compatibilidad de un tema leído de la base con datos antiguos.
+        
+        Args:
+            mensaje (dict): Tema recién leído.
+        """
+        if "juego" not in mensaje:
+            mensaje["juego"] = "General"
+        if "respuestas" in mensaje:
+            # Las respuestas guardadas dentro del tema pasan a su propia colección. Con
+            # guardar() (no insertar()) dos clientes pueden migrar el mismo tema a la vez
+            with transaccion():
+                for respuesta in mensaje.pop("respuestas"):
+                    self.respuestas.guardar(self.clave_respuesta(mensaje["id"], respuesta["id"]), respuesta, 
+                                            grupo=mensaje["id"])
+                self.coleccion.guardar(mensaje["id"], mensaje)
+    
+    def valores_tema(self, tema_id):
+        """Valores de la fila de un tema en la lista de temas."""
+        mensaje = self.repositorio.obtener(tema_id)
+        if mensaje is None:
+            return ("", "", "", "")  # Eliminado desde otra ventana
+        return (mensaje.get("titulo", "Sin título"), 
+                mensaje["usuario"], 
+                mensaje["fecha"],
+                mensaje.get("juego", "General"))
             
-    def guardar_mensajes(self):
+    def guardar_mensaje(self, mensaje):
         """
-        Guarda los mensajes en el archivo JSON.
+        Guarda un único tema (con sus respuestas) en el almacenamiento.
+        
+        Muestra un mensaje de error si ocurre algún problema.
         
-        Utiliza encoding utf-8 para preservar caracteres especiales y
-        muestra un mensaje de error si ocurre algún problema.
+        Args:
+            mensaje (dict): Tema nuevo o modificado.
         """
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.mensajes, f, ensure_ascii=False, indent=4)
+            self.repositorio.guardar(mensaje)
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar los mensajes: {str(e)}")
+            
     def abrir_chats_activos(self):
         abrir_crud_chats(self.master, self.usuario)    
     def crear_widgets(self):
@@ -169,9 +202,13 @@ class ForoWindow:
         self.combo_juegos.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         self.combo_juegos.bind("<<ComboboxSelected>>", self.filtrar_por_juego)
         
+        # Si no se pudieron cargar los temas no hay almacenamiento donde escribir
+        estado_botones = tk.DISABLED if self.carga_fallida else tk.NORMAL
+        
         # Botón para administrar juegos (solo para admins)
         if self.is_admin:
-            btn_admin_juegos = ttk.Button(frame_filtros, text="Administrar Juegos", command=self.administrar_juegos)
+            btn_admin_juegos = ttk.Button(frame_filtros, text="Administrar Juegos", command=self.administrar_juegos,
+                                          state=estado_botones)
             btn_admin_juegos.pack(side=tk.LEFT, padx=5)
         
         # Frame para botones de temas
@@ -179,11 +216,13 @@ class ForoWindow:
         frame_botones.pack(pady=5, padx=10, fill=tk.X)
         
         # Botón para crear nuevo tema
-        btn_nuevo_tema = ttk.Button(frame_botones, text="Nuevo tema", command=self.crear_nuevo_tema)
+        btn_nuevo_tema = ttk.Button(frame_botones, text="Nuevo tema", command=self.crear_nuevo_tema,
+                                    state=estado_botones)
         btn_nuevo_tema.pack(side=tk.LEFT, padx=5)
         
         # Botón para actualizar la lista
-        btn_actualizar = ttk.Button(frame_botones, text="Actualizar", command=self.actualizar_lista)
+        btn_actualizar = ttk.Button(frame_botones, text="Actualizar", command=self.actualizar_lista,
+                                    state=estado_botones)
         btn_actualizar.pack(side=tk.LEFT, padx=5)
 
         btn_mensaje_privado = ttk.Button(frame_botones, text="Crear mensaje privado", command=self.crear_mensaje_privado)
@@ -191,8 +230,9 @@ class ForoWindow:
         # Botón para ver chats activos
         btn_chats = ttk.Button(frame_botones, text="Chats activos", command=self.abrir_chats_activos)
         btn_chats.pack(side=tk.LEFT, padx=5)
-        # Lista de temas
-        self.lista_temas = ttk.Treeview(frame_temas, columns=("titulo", "autor", "fecha", "juego"), show="headings")
+        # Lista de temas (solo se crean las filas visibles)
+        self.lista_temas = TreeviewVirtual(frame_temas, self.valores_tema, 
+                                           columns=("titulo", "autor", "fecha", "juego"), show="headings")
         self.lista_temas.heading("titulo", text="Título")
         self.lista_temas.heading("autor", text="Autor")
         self.lista_temas.heading("fecha", text="Fecha")
@@ -204,7 +244,7 @@ class ForoWindow:
         self.lista_temas.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
         
         # Cargar temas en la lista
-        self.actualizar_lista()
+        self.filtrar_por_juego()
         
         self.lista_temas.bind("<<TreeviewSelect>>", self.mostrar_tema)
         
@@ -237,21 +277,11 @@ class ForoWindow:
         self.frame_respuestas = ttk.LabelFrame(self.frame_contenido_tema, text="Respuestas")
         self.frame_respuestas.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        # Canvas y scrollbar para las respuestas
-        self.canvas_respuestas = tk.Canvas(self.frame_respuestas)
-        scrollbar = ttk.Scrollbar(self.frame_respuestas, orient="vertical", command=self.canvas_respuestas.yview)
-        self.scrollable_frame = ttk.Frame(self.canvas_respuestas)
-        
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas_respuestas.configure(scrollregion=self.canvas_respuestas.bbox("all"))
-        )
-        
-        self.canvas_respuestas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas_respuestas.configure(yscrollcommand=scrollbar.set)
-        
-        self.canvas_respuestas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Lista de respuestas: solo se crean widgets para las visibles y se reutilizan
+        self.lista_respuestas = ListaVirtual(self.frame_respuestas, self.crear_fila_respuesta, 
+                                             self.llenar_fila_respuesta, 
+                                             texto_vacio="No hay respuestas todavía.")
+        self.lista_respuestas.pack(fill=tk.BOTH, expand=True)
         
         # Área para escribir respuesta
         frame_nueva_respuesta = ttk.LabelFrame(frame_contenido, text="Tu respuesta")
@@ -408,22 +438,24 @@ class ForoWindow:
                     messagebox.showwarning("Error", f"Ya existe un juego llamado '{nuevo_nombre}'")
                     return
                 
+                # Actualizar referencias en los temas de ese juego (según el índice), en un
+                # solo commit: si falla no se renombra ninguno y la lista de juegos no cambia
+                try:
+                    self.repositorio.renombrar_juego(juego, nuevo_nombre)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error al guardar los mensajes: {str(e)}")
+                    return
+                
                 # Actualizar en la lista
                 indice_real = self.juegos.index(juego)
                 self.juegos[indice_real] = nuevo_nombre
                 self.juegos.sort()
                 self.guardar_juegos()
                 
-                # Actualizar referencias en mensajes existentes
-                for mensaje in self.mensajes:
-                    if mensaje.get("juego") == juego:
-                        mensaje["juego"] = nuevo_nombre
-                
-                self.guardar_mensajes()
-                
                 # Actualizar interfaz
                 actualizar_listbox()
                 self.combo_juegos["values"] = ["Todos"] + sorted(self.juegos)
+                self.filtrar_por_juego()
                 
                 ventana_editar.destroy()
                 messagebox.showinfo("Operación exitosa", f"Juego actualizado: '{juego}' → '{nuevo_nombre}'")
@@ -444,7 +476,7 @@ class ForoWindow:
             juego, indice = resultado
             
             # Contar cuántos temas usan este juego
-            temas_con_juego = sum(1 for mensaje in self.mensajes if mensaje.get("juego") == juego)
+            temas_con_juego = self.repositorio.cantidad(juego)
             
             mensaje = f"¿Estás seguro de eliminar el juego '{juego}'?"
             if temas_con_juego > 0:
@@ -503,27 +535,17 @@ class ForoWindow:
         """
         seleccion = self.combo_juegos.get()
         
-        # Limpiar lista actual
-        for item in self.lista_temas.get_children():
-            self.lista_temas.delete(item)
-            
-        # Filtrar mensajes por juego seleccionado
-        for mensaje in self.mensajes:
-            if seleccion == "Todos" or mensaje.get("juego") == seleccion:
-                self.lista_temas.insert("", tk.END, iid=str(mensaje["id"]), 
-                                       values=(mensaje.get("titulo", "Sin título"), 
-                                              mensaje["usuario"], 
-                                              mensaje["fecha"],
-                                              mensaje.get("juego", "General")))
+        # Tomar la lista ya ordenada del juego; solo se dibujan las filas visibles
+        self.lista_temas.mostrar(self.repositorio.ids(None if seleccion == "Todos" else seleccion))
     
     def actualizar_lista(self):
         """
         Actualiza la lista de temas en la interfaz.
         
-        Recarga los mensajes desde el archivo y los muestra en el Treeview.
+        Recarga los mensajes desde el almacenamiento y los muestra en el Treeview.
         """
-        # Cargar mensajes desde el archivo
-        self.cargar_mensajes()
+        # Volver a leer los temas (pueden haber cambiado desde otro cliente)
+        self.repositorio.recargar()
         
         # Actualizar la lista según el filtro actual
         self.filtrar_por_juego()
@@ -545,12 +567,7 @@ class ForoWindow:
         tema_id = int(seleccion[0])
         
         # Buscar el mensaje seleccionado
-        mensaje = None
-        for m in self.mensajes:
-            if m["id"] == tema_id:
-                mensaje = m
-                break
-                
+        mensaje = self.repositorio.obtener(tema_id)
         if not mensaje:
             return
             
@@ -580,47 +597,96 @@ class ForoWindow:
         self.texto_tema.tag_configure("juego", font=("Arial", 10, "italic"))
         self.texto_tema.config(state=tk.DISABLED)
         
-        # Limpiar respuestas anteriores
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        # Mostrar las respuestas (se leen por páginas al desplazarse)
+        self.lista_respuestas.mostrar(
+            self.respuestas.contar(grupo=tema_id),
+            lambda inicio, cantidad: self.respuestas.pagina(inicio, cantidad, grupo=tema_id))
+    
+    def crear_fila_respuesta(self, padre):
+        """
+        Crea los widgets de una fila de respuesta (se reutilizan para distintas respuestas).
         
-        # Limpiar referencias a botones previos
-        self.botones_respuestas = []
+        Args:
+            padre (tk.Misc): Widget donde se crea la fila.
         
-        # Mostrar las respuestas
-        if mensaje['respuestas']:
-            for respuesta in mensaje['respuestas']:
-                # Crear un frame para cada respuesta
-                frame_respuesta = ttk.Frame(self.scrollable_frame, relief=tk.GROOVE, borderwidth=1)
-                frame_respuesta.pack(fill=tk.X, expand=True, padx=5, pady=5)
-                
-                # Información y contenido de la respuesta
-                ttk.Label(frame_respuesta, 
-                         text=f"De: {respuesta['usuario']} - {respuesta['fecha']}", 
-                         font=("Arial", 9, "bold")).pack(anchor=tk.W, padx=5, pady=2)
-                
-                texto_respuesta = scrolledtext.ScrolledText(frame_respuesta, wrap=tk.WORD, height=4)
-                texto_respuesta.pack(fill=tk.X, padx=5, pady=2)
-                texto_respuesta.insert(tk.END, respuesta['contenido'])
-                texto_respuesta.config(state=tk.DISABLED)
-                
-                # Botones de editar/eliminar para respuestas del usuario actual o para admin
-                if respuesta['usuario'] == self.usuario or self.is_admin:
-                    frame_botones = ttk.Frame(frame_respuesta)
-                    frame_botones.pack(fill=tk.X, padx=5, pady=2, anchor=tk.E)
-                    
-                    btn_editar = ttk.Button(frame_botones, text="Editar", 
-                                           command=lambda id=respuesta['id']: self.editar_respuesta(id))
-                    btn_editar.pack(side=tk.LEFT, padx=2)
-                    
-                    btn_eliminar = ttk.Button(frame_botones, text="Eliminar", 
-                                             command=lambda id=respuesta['id']: self.eliminar_respuesta(id))
-                    btn_eliminar.pack(side=tk.LEFT, padx=2)
-                    
-                    # Guardar referencia a los botones
-                    self.botones_respuestas.append((btn_editar, btn_eliminar))
+        Returns:
+            ttk.Frame: Frame de la fila, con referencias a sus widgets.
+        """
+        frame_respuesta = ttk.Frame(padre, relief=tk.GROOVE, borderwidth=1)
+        
+        # Información y contenido de la respuesta
+        frame_respuesta.info = ttk.Label(frame_respuesta, font=("Arial", 9, "bold"))
+        frame_respuesta.info.pack(anchor=tk.W, padx=5, pady=2)
+        
+        frame_respuesta.texto = scrolledtext.ScrolledText(frame_respuesta, wrap=tk.WORD, height=4)
+        frame_respuesta.texto.pack(fill=tk.X, padx=5, pady=2)
+        
+        # Botones de editar/eliminar (se ocultan si la respuesta no es del usuario)
+        frame_respuesta.botones = ttk.Frame(frame_respuesta)
+        frame_respuesta.botones.pack(fill=tk.X, padx=5, pady=2, anchor=tk.E)
+        frame_respuesta.btn_editar = ttk.Button(frame_respuesta.botones, text="Editar")
+        frame_respuesta.btn_editar.pack(side=tk.LEFT, padx=2)
+        frame_respuesta.btn_eliminar = ttk.Button(frame_respuesta.botones, text="Eliminar")
+        frame_respuesta.btn_eliminar.pack(side=tk.LEFT, padx=2)
+        return frame_respuesta
+    
+    def llenar_fila_respuesta(self, frame_respuesta, respuesta):
+        """
+        Muestra una respuesta en una fila creada con crear_fila_respuesta.
+        
+        Args:
+            frame_respuesta (ttk.Frame): Fila a rellenar.
+            respuesta (dict): Respuesta a mostrar.
+        """
+        frame_respuesta.info.config(text=f"De: {respuesta['usuario']} - {respuesta['fecha']}")
+        
+        frame_respuesta.texto.config(state=tk.NORMAL)
+        frame_respuesta.texto.delete(1.0, tk.END)
+        frame_respuesta.texto.insert(tk.END, respuesta['contenido'])
+        frame_respuesta.texto.config(state=tk.DISABLED)
+        
+        # Botones de editar/eliminar para respuestas del usuario actual o para admin
+        if respuesta['usuario'] == self.usuario or self.is_admin:
+            frame_respuesta.btn_editar.config(command=lambda id=respuesta['id']: self.editar_respuesta(id))
+            frame_respuesta.btn_eliminar.config(command=lambda id=respuesta['id']: self.eliminar_respuesta(id))
+            frame_respuesta.botones.pack(fill=tk.X, padx=5, pady=2, anchor=tk.E)
         else:
-            ttk.Label(self.scrollable_frame, text="No hay respuestas todavía.").pack(pady=10)
+            frame_respuesta.botones.pack_forget()
+    
+    def clave_respuesta(self, tema_id, id_respuesta):
+        """Clave de una respuesta en la colección de respuestas."""
+        return f"{tema_id}:{id_respuesta}"
+    
+    def buscar_respuesta(self, tema_id, id_respuesta):
+        """
+        Busca una respuesta de un tema por su clave (sin recorrer el hilo).
+        
+        Returns:
+            tuple: (clave, respuesta) o (None, None) si no existe.
+        """
+        clave = self.clave_respuesta(tema_id, id_respuesta)
+        respuesta = self.respuestas.obtener(clave)
+        return (clave, respuesta) if respuesta is not None else (None, None)
+    
+    def nuevo_id_respuesta(self, tema_id):
+        """
+        Reserva el siguiente ID de respuesta del tema.
+        
+        Usa una secuencia persistente por tema; la primera vez parte del mayor
+        ID existente en el hilo. Los IDs no se reutilizan aunque se borren respuestas.
+        """
+        def mayor_existente():
+            return max((r["id"] for r in self.respuestas.todos(grupo=tema_id)), default=0)
+        
+        return siguiente_valor(self.secuencia_respuestas(tema_id), mayor_existente)
+    
+    def secuencia_respuestas(self, tema_id):
+        """Nombre de la secuencia de IDs de respuesta del tema."""
+        return f"respuestas:{tema_id}"
+    
+    def refrescar_respuestas(self, tema_id):
+        """Vuelve a leer las respuestas del tema mostrado sin mover la vista."""
+        self.lista_respuestas.recargar(self.respuestas.contar(grupo=tema_id))
     
     def editar_respuesta(self, id_respuesta):
         """
@@ -637,44 +703,43 @@ class ForoWindow:
             
         tema_id = int(seleccion[0])
         
-        # Buscar el mensaje y la respuesta
-        for mensaje in self.mensajes:
-            if mensaje["id"] == tema_id:
-                for respuesta in mensaje["respuestas"]:
-                    if respuesta["id"] == id_respuesta and (respuesta["usuario"] == self.usuario or self.is_admin):
-                        # Abrir ventana de edición
-                        ventana_editar = tk.Toplevel(self.master)
-                        ventana_editar.title("Editar respuesta")
-                        ventana_editar.geometry("500x300")
-                        
-                        ttk.Label(ventana_editar, text="Contenido:").pack(anchor=tk.W, padx=10, pady=5)
-                        texto_editar = scrolledtext.ScrolledText(ventana_editar, wrap=tk.WORD, height=10)
-                        texto_editar.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-                        texto_editar.insert(tk.END, respuesta["contenido"])
-                        
-                        def guardar_cambios():
-                            nuevo_contenido = texto_editar.get(1.0, tk.END).strip()
-                            if not nuevo_contenido:
-                                messagebox.showwarning("Aviso", "El contenido no puede estar vacío")
-                                return
-                                
-                            respuesta["contenido"] = nuevo_contenido
-                            
-                            # Agregar nota si un administrador ha editado el mensaje
-                            if self.is_admin and respuesta["usuario"] != self.usuario:
-                                respuesta["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado por admin)"
-                            else:
-                                respuesta["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado)"
-                            
-                            self.guardar_mensajes()
-                            self.mostrar_tema(None)
-                            
-                            ventana_editar.destroy()
-                            messagebox.showinfo("Éxito", "Respuesta actualizada correctamente")
-                            
-                        ttk.Button(ventana_editar, text="Guardar cambios", 
-                                   command=guardar_cambios).pack(pady=10)
-                        return
+        # Buscar la respuesta entre las del tema
+        clave, respuesta = self.buscar_respuesta(tema_id, id_respuesta)
+        if respuesta is None or not (respuesta["usuario"] == self.usuario or self.is_admin):
+            return
+        
+        # Abrir ventana de edición
+        ventana_editar = tk.Toplevel(self.master)
+        ventana_editar.title("Editar respuesta")
+        ventana_editar.geometry("500x300")
+        
+        ttk.Label(ventana_editar, text="Contenido:").pack(anchor=tk.W, padx=10, pady=5)
+        texto_editar = scrolledtext.ScrolledText(ventana_editar, wrap=tk.WORD, height=10)
+        texto_editar.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        texto_editar.insert(tk.END, respuesta["contenido"])
+        
+        def guardar_cambios():
+            nuevo_contenido = texto_editar.get(1.0, tk.END).strip()
+            if not nuevo_contenido:
+                messagebox.showwarning("Aviso", "El contenido no puede estar vacío")
+                return
+                
+            respuesta["contenido"] = nuevo_contenido
+            
+            # Agregar nota si un administrador ha editado el mensaje
+            if self.is_admin and respuesta["usuario"] != self.usuario:
+                respuesta["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado por admin)"
+            else:
+                respuesta["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado)"
+            
+            self.respuestas.actualizar(clave, respuesta)
+            self.refrescar_respuestas(tema_id)
+            
+            ventana_editar.destroy()
+            messagebox.showinfo("Éxito", "Respuesta actualizada correctamente")
+            
+        ttk.Button(ventana_editar, text="Guardar cambios", 
+                   command=guardar_cambios).pack(pady=10)
     
     def eliminar_respuesta(self, id_respuesta):
         """
@@ -695,25 +760,21 @@ class ForoWindow:
         if not messagebox.askyesno("Confirmar", "¿Estás seguro de eliminar esta respuesta?"):
             return
             
-        # Buscar el mensaje y eliminar la respuesta
-        for mensaje in self.mensajes:
-            if mensaje["id"] == tema_id:
-                # Si es admin, puede eliminar cualquier respuesta
-                if self.is_admin:
-                    mensaje["respuestas"] = [r for r in mensaje["respuestas"] if r["id"] != id_respuesta]
-                    self.guardar_mensajes()
-                    self.mostrar_tema(None)
-                    messagebox.showinfo("Éxito", "Respuesta eliminada correctamente (acción de administrador)")
-                    return
-                else:
-                    # Si no es admin, solo puede eliminar sus propias respuestas
-                    mensaje["respuestas"] = [r for r in mensaje["respuestas"] 
-                                           if not (r["id"] == id_respuesta and r["usuario"] == self.usuario)]
-                    
-                    self.guardar_mensajes()
-                    self.mostrar_tema(None)
-                    messagebox.showinfo("Éxito", "Respuesta eliminada correctamente")
-                    return
+        # Buscar la respuesta y eliminarla
+        clave, respuesta = self.buscar_respuesta(tema_id, id_respuesta)
+        if respuesta is None:
+            return
+        
+        # Si es admin, puede eliminar cualquier respuesta
+        if self.is_admin:
+            self.respuestas.eliminar(clave)
+            self.refrescar_respuestas(tema_id)
+            messagebox.showinfo("Éxito", "Respuesta eliminada correctamente (acción de administrador)")
+        # Si no es admin, solo puede eliminar sus propias respuestas
+        elif respuesta["usuario"] == self.usuario:
+            self.respuestas.eliminar(clave)
+            self.refrescar_respuestas(tema_id)
+            messagebox.showinfo("Éxito", "Respuesta eliminada correctamente")
     
     def enviar_respuesta(self):
         """
@@ -738,34 +799,30 @@ class ForoWindow:
         
         tema_id = int(seleccion[0])
         
-        # Buscar el mensaje
-        for i, mensaje in enumerate(self.mensajes):
-            if mensaje["id"] == tema_id:
-                # Generar ID para la respuesta
-                nuevo_id = 1
-                if mensaje["respuestas"]:
-                    nuevo_id = max([r["id"] for r in mensaje["respuestas"]]) + 1
-                
-                # Agregar la respuesta al tema seleccionado
-                nueva_respuesta = {
-                    "id": nuevo_id,
-                    "usuario": self.usuario,
-                    "fecha": datetime.datetime.now().strftime("%Y-%m-%d"),
-                    "contenido": respuesta
-                }
-                
-                mensaje["respuestas"].append(nueva_respuesta)
-                
-                # Guardar cambios
-                self.guardar_mensajes()
-                
-                # Limpiar el área de respuesta
-                self.texto_respuesta.delete(1.0, tk.END)
-                
-                # Actualizar la visualización del tema
-                self.mostrar_tema(None)
-                messagebox.showinfo("Éxito", "Tu respuesta ha sido publicada")
-                return
+        if self.repositorio.obtener(tema_id) is None:
+            return
+        
+        # Generar ID para la respuesta
+        nuevo_id = self.nuevo_id_respuesta(tema_id)
+        
+        # Agregar la respuesta al tema seleccionado
+        nueva_respuesta = {
+            "id": nuevo_id,
+            "usuario": self.usuario,
+            "fecha": datetime.datetime.now().strftime("%Y-%m-%d"),
+            "contenido": respuesta
+        }
+        
+        # Guardar la respuesta
+        self.respuestas.insertar(nueva_respuesta, clave=self.clave_respuesta(tema_id, nuevo_id), grupo=tema_id)
+        
+        # Limpiar el área de respuesta
+        self.texto_respuesta.delete(1.0, tk.END)
+        
+        # Actualizar la visualización del tema y mostrar la respuesta nueva
+        self.refrescar_respuestas(tema_id)
+        self.lista_respuestas.ver_ultimo()
+        messagebox.showinfo("Éxito", "Tu respuesta ha sido publicada")
     
     def crear_nuevo_tema(self):
         """
@@ -847,10 +904,8 @@ class ForoWindow:
                 messagebox.showwarning("Aviso", "Completa el título y el contenido")
                 return
             
-            # Generar ID único para el tema
-            nuevo_id = 1
-            if self.mensajes:
-                nuevo_id = max([m["id"] for m in self.mensajes]) + 1
+            # Generar ID único para el tema (secuencia de la colección)
+            nuevo_id = self.coleccion.nuevo_id()
             
             nuevo_tema = {
                 "id": nuevo_id,
@@ -858,17 +913,14 @@ class ForoWindow:
                 "fecha": datetime.datetime.now().strftime("%Y-%m-%d"),
                 "titulo": titulo,
                 "contenido": contenido,
-                "juego": juego,
-                "respuestas": []
+                "juego": juego
             }
             
-            self.mensajes.append(nuevo_tema)
-            
-            # Guardar en archivo
-            self.guardar_mensajes()
+            # Guardar el tema nuevo
+            self.guardar_mensaje(nuevo_tema)
             
             # Actualizar la lista según filtro actual
-            self.actualizar_lista()
+            self.filtrar_por_juego()
             
             # Si estamos filtrando por un juego específico y creamos un tema de otro juego, cambiar al filtro "Todos"
             filtro_actual = self.combo_juegos.get()
@@ -895,76 +947,75 @@ class ForoWindow:
         tema_id = int(seleccion[0])
         
         # Buscar el mensaje
-        for mensaje in self.mensajes:
-            if mensaje["id"] == tema_id and (mensaje["usuario"] == self.usuario or self.is_admin):
-                # Abrir ventana de edición
-                ventana_editar = tk.Toplevel(self.master)
-                ventana_editar.title("Editar tema")
-                ventana_editar.geometry("700x500")
-                
-                ttk.Label(ventana_editar, text="Título:").pack(anchor=tk.W, padx=10, pady=5)
-                titulo_entry = ttk.Entry(ventana_editar, width=50)
-                titulo_entry.pack(fill=tk.X, padx=10, pady=5)
-                titulo_entry.insert(0, mensaje.get("titulo", ""))
-                
-                # Selector de juego
-                frame_juego = ttk.Frame(ventana_editar)
-                frame_juego.pack(fill=tk.X, padx=10, pady=5)
-                
-                ttk.Label(frame_juego, text="Juego:").pack(side=tk.LEFT)
-                
-                combo_juego = ttk.Combobox(frame_juego, state="readonly", width=30)
-                combo_juego["values"] = ["General"] + sorted(self.juegos)
-                
-                # Seleccionar el juego actual del tema
-                juego_actual = mensaje.get("juego", "General")
-                try:
-                    combo_juego.set(juego_actual)
-                except:
-                    combo_juego.current(0)  # Si el juego ya no existe, seleccionar "General"
-                
-                combo_juego.pack(side=tk.LEFT, padx=5)
-                
-                ttk.Label(ventana_editar, text="Contenido:").pack(anchor=tk.W, padx=10, pady=5)
-                contenido_text = scrolledtext.ScrolledText(ventana_editar, wrap=tk.WORD, height=10)
-                contenido_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-                contenido_text.insert(tk.END, mensaje["contenido"])
-                
-                def guardar_cambios():
-                    titulo = titulo_entry.get().strip()
-                    juego = combo_juego.get()
-                    contenido = contenido_text.get(1.0, tk.END).strip()
-                    
-                    if not titulo or not contenido:
-                        messagebox.showwarning("Aviso", "Completa todos los campos")
-                        return
-                        
-                    mensaje["titulo"] = titulo
-                    mensaje["contenido"] = contenido
-                    mensaje["juego"] = juego
-                    
-                    # Agregar nota si un administrador ha editado el mensaje
-                    if self.is_admin and mensaje["usuario"] != self.usuario:
-                        mensaje["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado por admin)"
-                    else:
-                        mensaje["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado)"
-                    
-                    self.guardar_mensajes()
-                    
-                    # Actualizar la lista y la vista
-                    self.actualizar_lista()
-                    self.lista_temas.selection_set(str(tema_id))
-                    self.mostrar_tema(None)
-                    
-                    ventana_editar.destroy()
-                    messagebox.showinfo("Éxito", "Tema actualizado correctamente")
-                    
-                ttk.Button(ventana_editar, text="Guardar cambios", 
-                           command=guardar_cambios).pack(pady=10)
+        mensaje = self.repositorio.obtener(tema_id)
+        if mensaje is None or not (mensaje["usuario"] == self.usuario or self.is_admin):
+            messagebox.showerror("Error", "No tienes permiso para editar este tema")
+            return
+        
+        # Abrir ventana de edición
+        ventana_editar = tk.Toplevel(self.master)
+        ventana_editar.title("Editar tema")
+        ventana_editar.geometry("700x500")
+        
+        ttk.Label(ventana_editar, text="Título:").pack(anchor=tk.W, padx=10, pady=5)
+        titulo_entry = ttk.Entry(ventana_editar, width=50)
+        titulo_entry.pack(fill=tk.X, padx=10, pady=5)
+        titulo_entry.insert(0, mensaje.get("titulo", ""))
+        
+        # Selector de juego
+        frame_juego = ttk.Frame(ventana_editar)
+        frame_juego.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(frame_juego, text="Juego:").pack(side=tk.LEFT)
+        
+        combo_juego = ttk.Combobox(frame_juego, state="readonly", width=30)
+        combo_juego["values"] = ["General"] + sorted(self.juegos)
+        
+        # Seleccionar el juego actual del tema
+        juego_actual = mensaje.get("juego", "General")
+        try:
+            combo_juego.set(juego_actual)
+        except:
+            combo_juego.current(0)  # Si el juego ya no existe, seleccionar "General"
+        
+        combo_juego.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(ventana_editar, text="Contenido:").pack(anchor=tk.W, padx=10, pady=5)
+        contenido_text = scrolledtext.ScrolledText(ventana_editar, wrap=tk.WORD, height=10)
+        contenido_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        contenido_text.insert(tk.END, mensaje["contenido"])
+        
+        def guardar_cambios():
+            titulo = titulo_entry.get().strip()
+            juego = combo_juego.get()
+            contenido = contenido_text.get(1.0, tk.END).strip()
+            
+            if not titulo or not contenido:
+                messagebox.showwarning("Aviso", "Completa todos los campos")
                 return
-                
-        # Si llegamos aquí, no se encontró el tema o el usuario no es el autor ni administrador
-        messagebox.showerror("Error", "No tienes permiso para editar este tema")
+            
+            mensaje["titulo"] = titulo
+            mensaje["contenido"] = contenido
+            mensaje["juego"] = juego
+            
+            # Agregar nota si un administrador ha editado el mensaje
+            if self.is_admin and mensaje["usuario"] != self.usuario:
+                mensaje["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado por admin)"
+            else:
+                mensaje["fecha"] = datetime.datetime.now().strftime("%Y-%m-%d") + " (editado)"
+            
+            self.guardar_mensaje(mensaje)
+            
+            # Actualizar la lista y la vista
+            self.filtrar_por_juego()
+            self.lista_temas.selection_set(str(tema_id))
+            self.mostrar_tema(None)
+            
+            ventana_editar.destroy()
+            messagebox.showinfo("Éxito", "Tema actualizado correctamente")
+        
+        ttk.Button(ventana_editar, text="Guardar cambios", 
+                   command=guardar_cambios).pack(pady=10)
     def crear_mensaje_privado(self):
         ventana_chat = tk.Toplevel(self.master)
         ventana_chat.title("Nuevo mensaje privado")
@@ -1002,21 +1053,15 @@ class ForoWindow:
         tema_id = int(seleccion[0])
         
         # Verificar que el usuario sea el autor o administrador
-        tema_encontrado = False
-        es_autor = False
-        
-        for mensaje in self.mensajes:
-            if mensaje["id"] == tema_id:
-                tema_encontrado = True
-                if mensaje["usuario"] == self.usuario:
-                    es_autor = True
-                elif not self.is_admin:
-                    messagebox.showerror("Error", "No tienes permiso para eliminar este tema")
-                    return
-        
-        if not tema_encontrado:
+        mensaje = self.repositorio.obtener(tema_id)
+        if mensaje is None:
             messagebox.showerror("Error", "Tema no encontrado")
             return
+        
+        es_autor = mensaje["usuario"] == self.usuario
+        if not es_autor and not self.is_admin:
+            messagebox.showerror("Error", "No tienes permiso para eliminar este tema")
+            return
             
         # Pedir confirmación
         if self.is_admin and not es_autor:
@@ -1026,14 +1071,20 @@ class ForoWindow:
             if not messagebox.askyesno("Confirmar", "¿Estás seguro de eliminar este tema y todas sus respuestas?"):
                 return
             
-        # Eliminar el tema
-        self.mensajes = [m for m in self.mensajes if m["id"] != tema_id]
-        
-        # Guardar cambios
-        self.guardar_mensajes()
+        # Eliminar el tema, sus respuestas y su secuencia de IDs (juntos: no queda nada
+        # huérfano). Los errores no se capturan dentro para que la transacción se deshaga entera
+        try:
+            with transaccion():
+                self.respuestas.eliminar_grupo(tema_id)
+                eliminar_secuencia(self.secuencia_respuestas(tema_id))
+                self.repositorio.eliminar(tema_id)
+        except Exception as e:
+            self.repositorio.recargar()
+            messagebox.showerror("Error", f"Error al eliminar el tema: {str(e)}")
+            return
         
         # Actualizar la lista
-        self.actualizar_lista()
+        self.filtrar_por_juego()
         
         # Limpiar el área de tema
         self.texto_tema.config(state=tk.NORMAL)
@@ -1041,8 +1092,7 @@ class ForoWindow:
         self.texto_tema.config(state=tk.DISABLED)
         
         # Limpiar respuestas
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        self.lista_respuestas.limpiar()
         
         # Desactivar botones
         self.btn_editar.config(state=tk.DISABLED)
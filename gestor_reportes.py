@@ -1,41 +1,34 @@
-import json
-import os
+from storage import Coleccion
 
 ARCHIVO_REPORTES = "reportes.json"
 
+def _coleccion():
+    return Coleccion("reportes", ARCHIVO_REPORTES)
+
 def cargar_reportes():
-    if not os.path.exists(ARCHIVO_REPORTES):
-        return []
-    with open(ARCHIVO_REPORTES, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _coleccion().todos()
+
+def cargar_reportes_con_clave():
+    """Lista de (clave, reporte); la clave identifica el reporte aunque la lista cambie."""
+    return _coleccion().items()
 
-def guardar_reportes(reportes):
-    with open(ARCHIVO_REPORTES, "w", encoding="utf-8") as f:
-        json.dump(reportes, f, indent=4)
+def insertar_reporte(reporte):
+    _coleccion().insertar(reporte)
 
 def agregar_reporte(usuario, titulo, descripcion):
-    reportes = cargar_reportes()
     nuevo_reporte = {
         "usuario": usuario,
         "titulo": titulo,
         "descripcion": descripcion,
         "estado": "Pendiente"
     }
-    reportes.append(nuevo_reporte)
-    guardar_reportes(reportes)
-
-def actualizar_estado(indice, nuevo_estado):
-    reportes = cargar_reportes()
-    if 0 <= indice < len(reportes):
-        reportes[indice]["estado"] = nuevo_estado
-        guardar_reportes(reportes)
-        return True
-    return False
-
-def eliminar_reporte(indice):
-    reportes = cargar_reportes()
-    if 0 <= indice < len(reportes):
-        reportes.pop(indice)
-        guardar_reportes(reportes)
-        return True
-    return False
+    insertar_reporte(nuevo_reporte)
+
+def actualizar_estado(clave, nuevo_estado):
+    def cambiar(reporte):
+        reporte["estado"] = nuevo_estado
+    reporte, _ = _coleccion().modificar(clave, cambiar)
+    return reporte is not None
+
+def eliminar_reporte(clave):
+    return _coleccion().eliminar(clave)
@@ -0,0 +1,120 @@
+import bisect
+
+# -----------------------------------------------------------------------------
+# indices.py – Índices en memoria sobre registros con "id" y "juego"
+# -----------------------------------------------------------------------------
+# Los temas del foro y las salas se filtran por juego. En lugar de recorrer
+# todos los registros en cada filtro, IndiceJuegos mantiene:
+#   - por_id:    id -> registro
+#   - todos:     ids de todos los registros, ordenados
+#   - por_juego: juego -> ids de sus registros, ordenados
+# Los ids crecen con cada alta, así que el orden por id es el orden de creación.
+# El índice recuerda en qué juego está cada id, así que basta avisarle de que
+# un registro cambió (mover) para reubicarlo. Se actualiza al crear, editar,
+# eliminar o renombrar un juego, y filtrar o contar por juego cuesta
+# O(tamaño del resultado).
+# -----------------------------------------------------------------------------
+
+JUEGO_PREDETERMINADO = "General"
+
+
+def juego_de(registro):
+    return registro.get("juego", JUEGO_PREDETERMINADO)
+
+
+def _insertar_ordenado(lista, valor):
+    if not lista or lista[-1] < valor:
+        lista.append(valor)  # Caso habitual: id nuevo, mayor que todos
+    else:
+        bisect.insort(lista, valor)
+
+
+def _quitar_ordenado(lista, valor):
+    i = bisect.bisect_left(lista, valor)
+    if i < len(lista) and lista[i] == valor:
+        del lista[i]
+
+
+class IndiceJuegos:
+    """
+    Índice invertido juego -> ids para una lista de registros.
+
+    Las listas devueltas por ids() son las internas del índice: no deben
+    modificarse y cambian cuando cambia el índice.
+    """
+
+    def __init__(self, registros=()):
+        self.por_id = {}
+        self.todos = []
+        self.por_juego = {}
+        self.juego_por_id = {}
+        for registro in registros:
+            self.agregar(registro)
+
+    def obtener(self, registro_id):
+        """Registro con ese id o None."""
+        return self.por_id.get(registro_id)
+
+    def ids(self, juego=None):
+        """Ids ordenados de los registros de *juego* (o de todos si es None)."""
+        if juego is None:
+            return self.todos
+        return self.por_juego.get(juego, [])
+
+    def cantidad(self, juego):
+        """Número de registros asociados a *juego*."""
+        return len(self.por_juego.get(juego, []))
+
+    def agregar(self, registro):
+        """Añade un registro nuevo al índice."""
+        registro_id = registro["id"]
+        juego = juego_de(registro)
+        self.por_id[registro_id] = registro
+        self.juego_por_id[registro_id] = juego
+        _insertar_ordenado(self.todos, registro_id)
+        _insertar_ordenado(self.por_juego.setdefault(juego, []), registro_id)
+
+    def quitar(self, registro_id):
+        """Quita un registro del índice. Devuelve el registro o None."""
+        registro = self.por_id.pop(registro_id, None)
+        if registro is None:
+            return None
+        _quitar_ordenado(self.todos, registro_id)
+        self._quitar_de_juego(self.juego_por_id.pop(registro_id), registro_id)
+        return registro
+
+    def mover(self, registro_id):
+        """Reubica un registro si su campo "juego" cambió."""
+        juego_anterior = self.juego_por_id[registro_id]
+        juego_nuevo = juego_de(self.por_id[registro_id])
+        if juego_nuevo == juego_anterior:
+            return
+        self._quitar_de_juego(juego_anterior, registro_id)
+        self.juego_por_id[registro_id] = juego_nuevo
+        _insertar_ordenado(self.por_juego.setdefault(juego_nuevo, []), registro_id)
+
+    def renombrar(self, juego, nuevo_nombre):
+        """
+        Cambia el nombre de un juego en el índice y en sus registros.
+
+        Returns:
+            list: Registros modificados (para guardarlos).
+        """
+        ids = self.por_juego.pop(juego, [])
+        if not ids:
+            return []
+        registros = [self.por_id[registro_id] for registro_id in ids]
+        for registro in registros:
+            registro["juego"] = nuevo_nombre
+            self.juego_por_id[registro["id"]] = nuevo_nombre
+        existentes = self.por_juego.get(nuevo_nombre)
+        self.por_juego[nuevo_nombre] = sorted(existentes + ids) if existentes else ids
+        return registros
+
+    def _quitar_de_juego(self, juego, registro_id):
+        ids = self.por_juego.get(juego)
+        if ids is None:
+            return
+        _quitar_ordenado(ids, registro_id)
+        if not ids:
+            del self.por_juego[juego]
@@ -0,0 +1,158 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+
+# -----------------------------------------------------------------------------
+# lista_virtual.py – Lista desplazable que solo crea widgets para lo visible
+# -----------------------------------------------------------------------------
+# Pensada para hilos largos del foro: en lugar de un Frame con widgets por cada
+# respuesta, ListaVirtual dibuja en un Canvas unas pocas "filas" de altura fija
+# y las reutiliza al desplazarse, rellenándolas con el elemento que toca.
+# Los elementos se piden por páginas a una función (normalmente una consulta a
+# storage.py) y solo se guardan en memoria las últimas PAGINAS_EN_CACHE.
+#
+# Quien la usa aporta:
+#   - crear_fila(padre): construye los widgets de una fila y la devuelve
+#   - llenar_fila(fila, elemento): muestra un elemento en una fila existente
+#   - obtener_pagina(inicio, cantidad): devuelve una lista de elementos
+# -----------------------------------------------------------------------------
+
+TAMANO_PAGINA = 20
+PAGINAS_EN_CACHE = 8
+
+
+class ListaVirtual(ttk.Frame):
+    """
+    Lista vertical virtualizada con filas de altura fija.
+
+    Args:
+        master (tk.Misc): Widget contenedor.
+        crear_fila (callable): Crea los widgets de una fila dentro del padre dado.
+        llenar_fila (callable): Muestra un elemento en una fila.
+        texto_vacio (str): Texto a mostrar cuando no hay elementos.
+    """
+
+    def __init__(self, master, crear_fila, llenar_fila, texto_vacio=""):
+        super().__init__(master)
+        self.crear_fila = crear_fila
+        self.llenar_fila = llenar_fila
+        self.texto_vacio = texto_vacio
+
+        self.total = 0
+        self.obtener_pagina = None
+        self.paginas = {}
+        self.alto_fila = None
+        # Filas reutilizables: [widget, id de la ventana en el canvas, índice mostrado]
+        self.filas = []
+
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._al_desplazar)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.barra.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.id_vacio = self.canvas.create_text(10, 10, anchor="nw", text="", state="hidden")
+        self.canvas.bind("<Configure>", self._al_redimensionar)
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+    # ------------------------------------------------------------------
+    # Contenido
+    # ------------------------------------------------------------------
+    def mostrar(self, total, obtener_pagina):
+        """Muestra *total* elementos obtenidos con *obtener_pagina*, desde el principio."""
+        self.obtener_pagina = obtener_pagina
+        self.recargar(total)
+        self.canvas.yview_moveto(0)
+
+    def recargar(self, total):
+        """Vuelve a pedir los elementos (p. ej. tras editar uno) sin mover la vista."""
+        self.total = total
+        self.paginas = {}
+        for fila in self.filas:
+            fila[2] = None
+        self._actualizar_region()
+        self._dibujar()
+
+    def limpiar(self):
+        """Deja la lista vacía."""
+        self.obtener_pagina = None
+        self.recargar(0)
+
+    def ver_ultimo(self):
+        """Desplaza la vista hasta el último elemento."""
+        self.canvas.yview_moveto(1)
+
+    def _elemento(self, indice):
+        numero = indice // TAMANO_PAGINA
+        pagina = self.paginas.pop(numero, None)
+        if pagina is None:
+            pagina = self.obtener_pagina(numero * TAMANO_PAGINA, TAMANO_PAGINA)
+            if len(self.paginas) >= PAGINAS_EN_CACHE:
+                del self.paginas[next(iter(self.paginas))]  # La menos usada
+        self.paginas[numero] = pagina
+        posicion = indice - numero * TAMANO_PAGINA
+        return pagina[posicion] if posicion < len(pagina) else None
+
+    # ------------------------------------------------------------------
+    # Dibujo
+    # ------------------------------------------------------------------
+    def _medir_alto_fila(self):
+        """Crea la primera fila y toma su altura como la de todas."""
+        widget = self.crear_fila(self.canvas)
+        widget.update_idletasks()
+        self.alto_fila = max(1, widget.winfo_reqheight())
+        ventana = self.canvas.create_window(0, 0, window=widget, anchor="nw",
+                                            height=self.alto_fila, state="hidden")
+        self.filas.append([widget, ventana, None])
+
+    def _actualizar_region(self):
+        if self.alto_fila is None:
+            self._medir_alto_fila()
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self.total * self.alto_fila))
+        if self.total == 0 and self.texto_vacio:
+            self.canvas.itemconfigure(self.id_vacio, text=self.texto_vacio, state="normal")
+        else:
+            self.canvas.itemconfigure(self.id_vacio, state="hidden")
+
+    def _dibujar(self):
+        """Coloca las filas reutilizables sobre los elementos visibles."""
+        if self.alto_fila is None:
+            return
+        alto_visible = max(self.canvas.winfo_height(), self.alto_fila)
+        primero = int(self.canvas.canvasy(0) // self.alto_fila)
+        necesarias = math.ceil(alto_visible / self.alto_fila) + 1
+
+        while len(self.filas) < necesarias:
+            widget = self.crear_fila(self.canvas)
+            ventana = self.canvas.create_window(0, 0, window=widget, anchor="nw", height=self.alto_fila,
+                                                width=self.canvas.winfo_width(), state="hidden")
+            self.filas.append([widget, ventana, None])
+
+        for k, fila in enumerate(self.filas):
+            indice = primero + k
+            elemento = self._elemento(indice) if k < necesarias and indice < self.total else None
+            if elemento is None:
+                self.canvas.itemconfigure(fila[1], state="hidden")
+                fila[2] = None
+                continue
+            if fila[2] != indice:
+                self.llenar_fila(fila[0], elemento)
+                fila[2] = indice
+            self.canvas.coords(fila[1], 0, indice * self.alto_fila)
+            self.canvas.itemconfigure(fila[1], state="normal")
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+    def _al_desplazar(self, primero, ultimo):
+        self.barra.set(primero, ultimo)
+        self._dibujar()
+
+    def _al_redimensionar(self, event):
+        for _, ventana, _ in self.filas:
+            self.canvas.itemconfigure(ventana, width=event.width)
+        if self.alto_fila is not None:
+            self._actualizar_region()
+        self._dibujar()
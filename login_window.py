@@ -1,8 +1,8 @@
 import tkinter as tk 
 from tkinter import messagebox  # Mostrar ventanas emergentes
 from user_manager import UserManager  # Manejador de usuarios (verificación, tipo, etc.)
-from main_window import MainWindow  # Ventana principal del usuario estándar
 from register_window import RegisterWindow
+from storage import sincronizar_periodicamente
 
 class LoginWindow:
     def __init__(self, master):
@@ -53,6 +53,8 @@ class LoginWindow:
         else:
             from main_window import MainWindow  # Para usuarios estándar
             MainWindow(ventana_principal, usuario)  # Abre la ventana principal
+        # El temporizador de la raíz del login murió con ella: se programa en esta
+        sincronizar_periodicamente(ventana_principal)
         ventana_principal.mainloop()  # Mantiene la ventana abierta
 
     def abrir_ventana_registro(self):
@@ -1,9 +1,13 @@
 from login_window import LoginWindow
+from storage import cerrar, sincronizar_periodicamente
 import tkinter as tk
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = LoginWindow(root)
+    # Un solo fsync para todo lo guardado en el intervalo (ver storage.py)
+    sincronizar_periodicamente(root)
     root.mainloop()
+    cerrar()
     
     
\ No newline at end of file
@@ -1,16 +1,8 @@
 import tkinter as tk
 from tkinter import ttk
 
-# Importación de las ventanas de cada funcionalidad
-from profile_window import ProfileWindow
-from foro_window import ForoWindow
-from salas_window import SalasWindow
-from eventos_window import EventosWindow
-from reportes_window import ReportesWindow
-from mis_reportes_window import MisReportesWindow
-from calendario_window import CalendarioWindow
-from conexion_gamer_window import abrir_conexion_gamer
-from team_crud import abrir_crud_equipos
+# Las ventanas de cada funcionalidad se importan al abrirlas (como en admin_window),
+# así que ni el login ni esta ventana esperan a cargar PIL, NumPy, etc.
 
 class MainWindow:
     def __init__(self, master, usuario):
@@ -64,24 +56,28 @@ class MainWindow:
 
     # Funciones para abrir cada ventana
     def abrir_perfil(self):
+        from profile_window import ProfileWindow
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
         ProfileWindow(top, self.usuario)
 
     def abrir_foro(self):
+        from foro_window import ForoWindow
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
         ForoWindow(top, self.usuario)
 
     def abrir_salas(self):
+        from salas_window import SalasWindow
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
         SalasWindow(top, self.usuario)
 
     def abrir_eventos(self):
+        from eventos_window import EventosWindow
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
@@ -90,30 +86,35 @@ class MainWindow:
         EventosWindow(top, self.usuario, is_admin)
 
     def abrir_reportes(self):
+        from reportes_window import ReportesWindow
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
         ReportesWindow(top, self.usuario)
 
     def abrir_mis_reportes(self):
+        from mis_reportes_window import MisReportesWindow
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
         MisReportesWindow(top, self.usuario)
 
     def abrir_calendario(self):
+        from calendario_window import CalendarioWindow
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
         CalendarioWindow(top, self.usuario)
 
     def abrir_conexion_gamer(self):
+        from conexion_gamer_window import abrir_conexion_gamer
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
         abrir_conexion_gamer(top, self.usuario)
 
     def abrir_equipos(self):
+        from team_crud import abrir_crud_equipos
         top = tk.Toplevel(self.master)
         top.geometry("600x400")
         top.resizable(False, False)  # Deshabilitar redimensionamiento
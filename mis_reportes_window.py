@@ -1,6 +1,5 @@
 import tkinter as tk
-import json
-import os
+import gestor_reportes
 
 class MisReportesWindow:
     """
@@ -37,17 +36,10 @@ class MisReportesWindow:
 
     def cargar_reportes(self):
         """
-        Carga los reportes del archivo JSON para el usuario actual.
+        Carga los reportes del almacenamiento para el usuario actual.
 
         Returns:
             list: Lista de reportes del usuario.
         """
-        if not os.path.exists("reportes.json"):
-            return []  # Si no existe, retorna lista vacía
-
-        with open("reportes.json", "r") as f:
-            try:
-                todos = json.load(f)
-                return [r for r in todos if r["usuario"] == self.usuario]  # Filtra por usuario
-            except json.JSONDecodeError:
-                return []  # Si error de lectura, retorna lista vacía
+        todos = gestor_reportes.cargar_reportes()
+        return [r for r in todos if r["usuario"] == self.usuario]  # Filtra por usuario
@@ -1,9 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox
-import json
 from tkinter import filedialog
-from PIL import Image, ImageTk
-import os
+from avatares import ruta_avatar, imagen_avatar, guardar_avatar, liberar_avatar
+from user_manager import coleccion_usuarios, hashear_clave, verificar_clave
+from emparejamiento import marcar_juegos_cambiados
 class ProfileWindow:
     def __init__(self, master, usuario):
         self.master = master
@@ -11,6 +11,7 @@ class ProfileWindow:
         self.master.geometry("400x300")
 
         self.usuario = usuario
+        self.usuarios = coleccion_usuarios()
 
         tk.Button(self.master, text="Ver y Editar Datos de Usuario / Eliminar Cuenta", command=self.ver_datos).pack(pady=10)
         tk.Button(self.master, text="Cerrar Sesion").pack(pady=10)
@@ -28,10 +29,8 @@ class ProfileWindow:
         tk.Button(self.info_profile_window, text="Cambiar Avatar", command=self.cambiar_avatar).pack(pady=5)
         tk.Button(self.info_profile_window, text="Eliminar Avatar", command=self.eliminar_avatar).pack(pady=5)
 
-        # cargar datos del usuario desde el JSON
-        with open("usuarios.json", "r") as archivo:
-            datos = json.load(archivo)
-        info_usuario = datos.get(self.usuario, {})
+        # cargar datos del usuario desde el almacenamiento
+        info_usuario = self.usuarios.obtener(self.usuario) or {}
         email_actual = info_usuario.get("email", "No registrado")
 
         # Mostrando los datos de la cuenta
@@ -66,10 +65,7 @@ class ProfileWindow:
     def verify_email(self):
             email_ingresado = self.entry_email_verify.get()
 
-            with open("usuarios.json", "r") as archivo:
-                datos = json.load(archivo)
-
-            email_correcto = datos[self.usuario]["email"]
+            email_correcto = self.usuarios.obtener(self.usuario)["email"]
 
             if email_ingresado == email_correcto:
                 messagebox.showinfo("Exito", "Email verificado correctamente.")
@@ -113,17 +109,13 @@ class ProfileWindow:
              messagebox.showerror("Error", "El nombre de usuario no puede estar vacío.")
              return
         
-        with open("usuarios.json", "r") as archivo:
-            datos = json.load(archivo)
-
-        if nuevo_usuario in datos:
+        # guardar el usuario con el nuevo nombre (falla si ya existe)
+        datos = self.usuarios.obtener(self.usuario)
+        if not self.usuarios.renombrar(self.usuario, nuevo_usuario):
              messagebox.showerror("Error", "El nombre de usuario ya existe.")
              return
-        
-        # guardar el usuario con el nuevo nombre
-        datos[nuevo_usuario] = datos.pop(self.usuario)
-        with open("usuarios.json", "w") as archivo:
-             json.dump(datos, archivo, indent=4)
+        if datos is not None and "juegos_favoritos" in datos:
+             marcar_juegos_cambiados()
 
         messagebox.showinfo("Éxito", "Nombre de usuario cambiado correctamente. Vuelve a abrir la aplicación para iniciar sesión con el nuevo nombre.")
         self.cambiar_usuario_window.destroy()
@@ -153,17 +145,14 @@ class ProfileWindow:
              messagebox.showerror("Error", "El email no es válido.")
              return
         
-        with open("usuarios.json", "r") as archivo:
-             datos = json.load(archivo)
-
-        if nuevo_email in [datos[usuario]["email"] for usuario in datos]:
+        if nuevo_email in [datos["email"] for datos in self.usuarios.todos()]:
                 messagebox.showerror("Error", "El email ya existe.")
                 return
         
 
-        datos[self.usuario]["email"] = nuevo_email
-        with open("usuarios.json", "w") as archivo:
-             json.dump(datos, archivo, indent=4)
+        datos = self.usuarios.obtener(self.usuario)
+        datos["email"] = nuevo_email
+        self.usuarios.actualizar(self.usuario, datos)
         
         messagebox.showinfo("Éxito", "Tu email ha sido actualizado correctamente.(El programa se cerrará para que no tengas problemas!)")
         self.cambiar_email_window.destroy()
@@ -190,12 +179,9 @@ class ProfileWindow:
              messagebox.showerror("Error", "La contraseña no puede estar vacía.")
              return
         
-        with open("usuarios.json", "r") as archivo:
-            datos = json.load(archivo)
-
-        datos[self.usuario]["clave"] = nueva_contraseña
-        with open("usuarios.json", "w") as archivo:
-            json.dump(datos, archivo, indent=4)
+        datos = self.usuarios.obtener(self.usuario)
+        datos["clave"] = hashear_clave(nueva_contraseña)
+        self.usuarios.actualizar(self.usuario, datos)
 
         messagebox.showinfo("Éxito", "Tu contraseña ha sido actualizada correctamente. Vuelve a abrir la aplicación para iniciar sesión con la nueva contraseña.")
         self.cambiar_contraseña_window.destroy()
@@ -221,39 +207,31 @@ class ProfileWindow:
     def confirmar_eliminar(self):
         clave_ingresada = self.entry_confirmar_clave.get()
 
-        with open("usuarios.json", "r") as archivo:
-            datos = json.load(archivo)
+        datos = self.usuarios.obtener(self.usuario)
 
-        if self.usuario not in datos:
+        if datos is None:
             messagebox.showerror("Error", "Usuario no encontrado.")
             return
 
-        clave_real = datos[self.usuario]["clave"]
-
-        if clave_ingresada != clave_real:
+        if not verificar_clave(clave_ingresada, datos["clave"]):
             messagebox.showerror("Error", "Contraseña incorrecta. No se pudo eliminar la cuenta.")
             return
 
         # Si la contraseña coincide, eliminamos la cuenta
-        del datos[self.usuario]
-
-        with open("usuarios.json", "w") as archivo:
-            json.dump(datos, archivo, indent=4)
+        self.usuarios.eliminar(self.usuario)
+        liberar_avatar(datos.get("avatar"))
+        if "juegos_favoritos" in datos:
+            marcar_juegos_cambiados()
 
         messagebox.showinfo("Cuenta eliminada", "Tu cuenta ha sido eliminada correctamente.")
         self.eliminar_cuenta_window.destroy()
         self.master.destroy()
     def mostrar_avatar(self, frame):
-        with open("usuarios.json", "r") as archivo:
-            datos = json.load(archivo)
-        avatar_path = datos.get(self.usuario, {}).get("avatar", "avatars/default_avatar.png")
-        # Si no hay avatar o el archivo no existe, usar el avatar por defecto
-        if not avatar_path or not os.path.exists(avatar_path):
-            avatar_path = "avatars/default_avatar.png"
-        if os.path.exists(avatar_path):
-            img = Image.open(avatar_path)
-            img = img.resize((100, 100))
-            self.avatar_img = ImageTk.PhotoImage(img)
+        # Si no hay avatar o el archivo no existe, se usa el avatar por defecto
+        avatar_path = ruta_avatar(self.usuarios.obtener(self.usuario))
+        # Miniatura ya redimensionada y cacheada (no se decodifica la imagen original)
+        self.avatar_img = imagen_avatar(avatar_path, 100, frame)
+        if self.avatar_img is not None:
             tk.Label(frame, image=self.avatar_img).pack(pady=5)
         else:
             tk.Label(frame, text="Sin avatar").pack(pady=5)
@@ -265,29 +243,27 @@ class ProfileWindow:
         )
         if not file_path:
             return
-        # Carpeta para avatares
-        if not os.path.exists("avatars"):
-            os.makedirs("avatars")
-        ext = os.path.splitext(file_path)[1]
-        new_path = f"avatars/{self.usuario}{ext}"
-        # Copiar imagen seleccionada
-        with open(file_path, "rb") as src, open(new_path, "wb") as dst:
-            dst.write(src.read())
-        # Guardar ruta en JSON
-        with open("usuarios.json", "r") as archivo:
-            datos = json.load(archivo)
-        datos[self.usuario]["avatar"] = new_path
-        with open("usuarios.json", "w") as archivo:
-            json.dump(datos, archivo, indent=4)
+        # Guardar la imagen (una sola vez aunque otros usuarios la hayan subido) y sus miniaturas
+        try:
+            new_path = guardar_avatar(file_path)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        except OSError:
+            messagebox.showerror("Error", "No se pudo leer la imagen seleccionada.")
+            return
+        # Guardar ruta en el perfil del usuario y soltar el avatar anterior
+        datos = self.usuarios.obtener(self.usuario)
+        avatar_anterior = datos.get("avatar")
+        datos["avatar"] = new_path
+        self.usuarios.actualizar(self.usuario, datos)
+        liberar_avatar(avatar_anterior)
         messagebox.showinfo("Éxito", "Avatar actualizado correctamente.")
 
     def eliminar_avatar(self):
-        with open("usuarios.json", "r") as archivo:
-            datos = json.load(archivo)
-        avatar_path = datos.get(self.usuario, {}).get("avatar")
-        if avatar_path and os.path.exists(avatar_path):
-            os.remove(avatar_path)
-        datos[self.usuario]["avatar"] = ""
-        with open("usuarios.json", "w") as archivo:
-            json.dump(datos, archivo, indent=4)
+        datos = self.usuarios.obtener(self.usuario)
+        avatar_anterior = datos.get("avatar")
+        datos["avatar"] = ""
+        self.usuarios.actualizar(self.usuario, datos)
+        liberar_avatar(avatar_anterior)
         messagebox.showinfo("Éxito", "Avatar eliminado correctamente.")       
\ No newline at end of file
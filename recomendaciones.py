@@ -0,0 +1,332 @@
+import argparse
+import heapq
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from storage import Coleccion, sincronizar_disco, transaccion
+from user_manager import coleccion_usuarios
+from emparejamiento import juegos_de, version_juegos
+
+# -----------------------------------------------------------------------------
+# recomendaciones.py – Tabla precalculada de compañeros recomendados
+# -----------------------------------------------------------------------------
+# Conexión Gamer muestra a cada usuario sus MAX_RECOMENDADOS jugadores más
+# afines leyendo un único registro de la colección "recomendaciones", en lugar
+# de recalcular las coincidencias en cada clic. La afinidad entre dos usuarios
+# combina:
+#   - la similitud de Jaccard de sus juegos favoritos y personalizados;
+#   - las salas que comparten (campo "miembros" de la colección salas);
+#   - los eventos en los que ambos están inscritos (colección eventos).
+# Es simétrica y solo depende de los dos usuarios, así que se puede mantener
+# de forma incremental (una similitud TF-IDF dependería de la popularidad de
+# cada juego y cualquier cambio alteraría todas las filas).
+#
+# Recomendador.sincronizar() compara la versión de las tres fuentes con la
+# última procesada. Para los juegos no se usa la versión de la colección de
+# usuarios, que cambia con cualquier escritura (un login que rehashea la
+# contraseña, un cambio de email), sino emparejamiento.version_juegos(), que
+# solo avanza cuando cambian los juegos de alguien. Si alguna cambió, la
+# vuelve a leer, detecta qué usuarios
+# tienen otros juegos, salas o eventos y recalcula solo sus filas. Después
+# fusiona la nueva puntuación en las filas de sus vecinos, que solo se
+# recalculan enteras si su puntuación con un usuario cambiado bajó.
+#
+# Las versiones procesadas se guardan en "recomendaciones_fuentes" junto con
+# una instantánea de las fuentes (los juegos, salas y eventos de cada usuario
+# tal como se usaron para calcular la tabla). Así un proceso nuevo compara esa
+# instantánea con las colecciones actuales y propaga solo las diferencias: la
+# tabla se recalcula entera una única vez, cuando aún no hay instantánea. Al
+# abrir la ventana se muestra la tabla tal cual y la sincronización se hace
+# después; si hace falta ese cálculo completo, la ventana lo lanza en otro
+# proceso (reconstruir_en_segundo_plano) para no congelarse mientras dura.
+# También se puede mantener al día en segundo plano con:
+#     python recomendaciones.py --intervalo 5
+# -----------------------------------------------------------------------------
+
+MAX_RECOMENDADOS = 20
+
+PESO_JUEGOS = 1.0   # Jaccard de los juegos, entre 0 y 1
+PESO_SALA = 0.5     # Por cada sala compartida
+PESO_EVENTO = 0.25  # Por cada evento compartido
+
+ARCHIVO_SALAS = "salas_data.json"
+ARCHIVO_EVENTOS = "eventos.json"
+
+FUENTES = ("juegos", "salas", "eventos")
+
+
+def _clave_orden(par):
+    return (-par[1], par[0])
+
+
+class Recomendador:
+    """
+    Mantiene la colección "recomendaciones": usuario -> {"usuarios": [[otro, puntos], ...]}.
+
+    Las filas están ordenadas de mayor a menor puntuación (y por nombre en
+    caso de empate) y tienen como mucho MAX_RECOMENDADOS entradas.
+    """
+
+    def __init__(self):
+        self.usuarios = coleccion_usuarios()
+        self.salas = Coleccion("salas", ARCHIVO_SALAS)
+        self.eventos = Coleccion("eventos", ARCHIVO_EVENTOS)
+        self.tabla = Coleccion("recomendaciones")
+        self.fuentes = Coleccion("recomendaciones_fuentes")
+        # Se cargan en la primera sincronización
+        self.versiones = None
+        self.grupos_de = {}   # fuente -> usuario -> juegos / ids de sala / ids de evento
+        self.miembros = {}    # fuente -> juego o id -> usuarios
+        self.filas = {}       # usuario -> [[otro, puntos], ...]
+        self.aparece_en = {}  # usuario -> usuarios en cuya fila aparece
+
+    def fila(self, usuario):
+        """Recomendaciones guardadas para *usuario* (lista de [otro, puntos]) o None."""
+        registro = self.tabla.obtener(usuario)
+        return registro["usuarios"] if registro else None
+
+    # ------------------------------------------------------------------
+    # Fuentes
+    # ------------------------------------------------------------------
+    def _versiones_actuales(self):
+        return {
+            "juegos": version_juegos(),
+            "salas": self.salas.version(),
+            "eventos": self.eventos.version(),
+        }
+
+    def _leer(self, fuente):
+        """Diccionario usuario -> conjunto de juegos, salas o eventos."""
+        grupos_de = {}
+        if fuente == "juegos":
+            for usuario, datos in self.usuarios.items():
+                juegos = juegos_de(datos) if "juegos_favoritos" in datos else []
+                if juegos:
+                    grupos_de[usuario] = set(juegos)
+            return grupos_de
+
+        coleccion, campo = (self.salas, "miembros") if fuente == "salas" else (self.eventos, "inscritos")
+        for registro in coleccion.todos():
+            for usuario in registro.get(campo, []):
+                grupos_de.setdefault(usuario, set()).add(registro["id"])
+        return grupos_de
+
+    def _instantanea(self, fuente):
+        """Diccionario usuario -> conjunto guardado en la última sincronización."""
+        return {
+            registro["usuario"]: set(registro["grupos"])
+            for registro in self.fuentes.todos(fuente)
+        }
+
+    def _establecer(self, fuente, grupos_de):
+        miembros = {}
+        for usuario, grupos in grupos_de.items():
+            for grupo in grupos:
+                miembros.setdefault(grupo, set()).add(usuario)
+        self.grupos_de[fuente] = grupos_de
+        self.miembros[fuente] = miembros
+
+    # ------------------------------------------------------------------
+    # Puntuación
+    # ------------------------------------------------------------------
+    def _puntos(self, usuario):
+        """Afinidad de *usuario* con cada otro usuario que comparte algo con él."""
+        puntos = Counter()
+        juegos = self.grupos_de["juegos"].get(usuario, ())
+        if juegos:
+            comunes = Counter()
+            for juego in juegos:
+                comunes.update(self.miembros["juegos"][juego])
+            for otro, cantidad in comunes.items():
+                union = len(juegos) + len(self.grupos_de["juegos"][otro]) - cantidad
+                puntos[otro] += PESO_JUEGOS * cantidad / union
+        for fuente, peso in (("salas", PESO_SALA), ("eventos", PESO_EVENTO)):
+            for grupo in self.grupos_de[fuente].get(usuario, ()):
+                for otro in self.miembros[fuente][grupo]:
+                    puntos[otro] += peso
+        puntos.pop(usuario, None)
+        # Redondeo para comparar puntuaciones sin ruido de coma flotante
+        return {otro: round(valor, 6) for otro, valor in puntos.items()}
+
+    def _mejores(self, puntos):
+        return [list(par) for par in heapq.nsmallest(MAX_RECOMENDADOS, puntos.items(), key=_clave_orden)]
+
+    def _poner_fila(self, usuario, fila):
+        for otro, _ in self.filas.get(usuario, []):
+            self.aparece_en.get(otro, set()).discard(usuario)
+        for otro, _ in fila:
+            self.aparece_en.setdefault(otro, set()).add(usuario)
+        self.filas[usuario] = fila
+
+    # ------------------------------------------------------------------
+    # Sincronización
+    # ------------------------------------------------------------------
+    def tiene_instantanea(self):
+        """True si sincronizar() puede aplicar solo las diferencias, sin recalcularlo todo."""
+        if self.versiones is not None:
+            return True
+        return bool((self.fuentes.obtener("versiones") or {}).get("instantanea"))
+
+    def sincronizar(self, reconstruir=True):
+        """
+        Pone la tabla al día con las colecciones de usuarios, salas y eventos.
+
+        Args:
+            reconstruir (bool): Si es False y aún no hay instantánea, no se
+                recalcula toda la tabla y no se hace nada.
+
+        Returns:
+            set: Usuarios cuya fila de recomendaciones cambió.
+        """
+        versiones = self._versiones_actuales()
+        if self.versiones is None:
+            guardadas = self.fuentes.obtener("versiones") or {}
+            if not guardadas.pop("instantanea", False):
+                if not reconstruir:
+                    return set()
+                # Aún no hay instantánea de las fuentes: se calcula todo una vez
+                for fuente in FUENTES:
+                    self._establecer(fuente, self._leer(fuente))
+                self.versiones = versiones
+                return self._reconstruir()
+            # Partir de la tabla y la instantánea guardadas y aplicar solo lo que cambió
+            for usuario, registro in self.tabla.items():
+                self._poner_fila(usuario, registro["usuarios"])
+            for fuente in FUENTES:
+                self._establecer(fuente, self._instantanea(fuente))
+            self.versiones = guardadas
+
+        cambiados = {}  # fuente -> usuarios con otros juegos, salas o eventos
+        for fuente in FUENTES:
+            if versiones[fuente] == self.versiones.get(fuente):
+                continue
+            anteriores = self.grupos_de[fuente]
+            nuevos = self._leer(fuente)
+            cambiados[fuente] = {
+                usuario for usuario in anteriores.keys() | nuevos.keys()
+                if anteriores.get(usuario) != nuevos.get(usuario)
+            }
+            self._establecer(fuente, nuevos)
+        self.versiones = versiones
+        usuarios = set().union(*cambiados.values())
+        if not usuarios:
+            return set()
+        return self._propagar(usuarios, cambiados)
+
+    def _reconstruir(self):
+        """Recalcula todas las filas (primera vez o tabla desfasada)."""
+        usuarios = set()
+        for fuente in FUENTES:
+            usuarios.update(self.grupos_de[fuente])
+        for usuario in usuarios:
+            self._poner_fila(usuario, self._mejores(self._puntos(usuario)))
+
+        with transaccion():
+            for usuario, _ in self.tabla.items():
+                if usuario not in usuarios:
+                    self.tabla.eliminar(usuario)
+            for fuente in FUENTES:
+                self.fuentes.eliminar_grupo(fuente)
+            return self._guardar(usuarios, {fuente: self.grupos_de[fuente].keys() for fuente in FUENTES})
+
+    def _propagar(self, cambiados, fuentes_cambiadas):
+        """
+        Recalcula las filas de *cambiados* y ajusta las de sus vecinos.
+
+        *fuentes_cambiadas* (fuente -> usuarios) indica qué parte de la
+        instantánea hay que guardar de nuevo.
+        """
+        completos = set(cambiados)
+        fusiones = {}
+        for usuario in cambiados:
+            puntos = self._puntos(usuario)
+            vecinos = (puntos.keys() | self.aparece_en.get(usuario, set())) - cambiados
+            for otro in vecinos:
+                anterior = dict(self.filas.get(otro, [])).get(usuario, 0)
+                nuevo = puntos.get(otro, 0)
+                if nuevo < anterior:
+                    # Puede haber candidatos fuera de la fila que ahora le superen
+                    completos.add(otro)
+                elif nuevo > anterior:
+                    fusiones.setdefault(otro, {})[usuario] = nuevo
+
+        for otro, nuevos in fusiones.items():
+            if otro in completos:
+                continue
+            fila = {vecino: valor for vecino, valor in self.filas.get(otro, [])}
+            fila.update(nuevos)
+            self._poner_fila(otro, self._mejores(fila))
+        for usuario in completos:
+            self._poner_fila(usuario, self._mejores(self._puntos(usuario)))
+        return self._guardar(completos | fusiones.keys(), fuentes_cambiadas)
+
+    def _guardar(self, usuarios, fuentes_cambiadas):
+        """
+        Guarda en un solo commit las filas de *usuarios*, la instantánea de
+        los usuarios de *fuentes_cambiadas* y las versiones procesadas.
+        """
+        with transaccion():
+            for usuario in usuarios:
+                self.tabla.guardar(usuario, {"usuarios": self.filas.get(usuario, [])})
+            for fuente, cambiados in fuentes_cambiadas.items():
+                for usuario in cambiados:
+                    clave = f"{fuente}:{usuario}"
+                    grupos = self.grupos_de[fuente].get(usuario)
+                    if grupos:
+                        registro = {"usuario": usuario, "grupos": sorted(grupos)}
+                        self.fuentes.guardar(clave, registro, grupo=fuente)
+                    else:
+                        self.fuentes.eliminar(clave)
+            self.fuentes.guardar("versiones", {**self.versiones, "instantanea": True})
+        return set(usuarios)
+
+
+_recomendador = None
+_proceso = None
+
+def recomendador():
+    """Recomendador compartido por las ventanas del proceso."""
+    global _recomendador
+    if _recomendador is None:
+        _recomendador = Recomendador()
+    return _recomendador
+
+
+def reconstruir_en_segundo_plano():
+    """
+    Lanza "recomendaciones.py --una-vez" en otro proceso y devuelve el Popen.
+
+    Si ya hay uno en marcha se devuelve ese. La conexión SQLite no se puede
+    usar desde otro hilo, por eso el cálculo completo va en otro proceso.
+    """
+    global _proceso
+    if _proceso is None or _proceso.poll() is not None:
+        _proceso = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--una-vez"],
+            stdout=subprocess.DEVNULL
+        )
+    return _proceso
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantiene al día la tabla de compañeros recomendados.")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="segundos entre comprobaciones")
+    parser.add_argument("--una-vez", action="store_true", help="sincronizar una vez y salir")
+    args = parser.parse_args()
+
+    rec = Recomendador()
+    while True:
+        cambiadas = rec.sincronizar()
+        sincronizar_disco()
+        if cambiadas:
+            print(f"{time.strftime('%H:%M:%S')} {len(cambiadas)} filas actualizadas")
+        if args.una_vez:
+            break
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-import json
-import os
+import gestor_reportes
 
 class ReportesAdminWindow:
     def __init__(self, master):
@@ -24,16 +23,11 @@ class ReportesAdminWindow:
 
     def cargar_reportes(self):
         self.lista.delete(0, tk.END)
-        if not os.path.exists("reportes.json"):
-            return
-
-        with open("reportes.json", "r") as f:
-            try:
-                self.reportes = json.load(f)
-            except json.JSONDecodeError:
-                self.reportes = []
+        # Clave de cada reporte mostrado, en el mismo orden que la lista
+        self.claves = []
 
-        for idx, reporte in enumerate(self.reportes):
+        for clave, reporte in gestor_reportes.cargar_reportes_con_clave():
+            self.claves.append(clave)
             usuario = reporte.get("usuario", "desconocido")
             categoria = reporte.get("categoria", "No especificada")
             contenido = reporte.get("contenido", "")
@@ -43,10 +37,6 @@ class ReportesAdminWindow:
             self.lista.insert(tk.END, texto)
             self.lista.insert(tk.END, "—" * 100)  # Separador visual
 
-    def guardar_reportes(self):
-        with open("reportes.json", "w") as f:
-            json.dump(self.reportes, f, indent=4)
-
     def marcar_resuelto(self):
         seleccion = self.lista.curselection()
         if not seleccion:
@@ -55,9 +45,9 @@ class ReportesAdminWindow:
 
         # Cada reporte ocupa 2 líneas: el contenido y el separador
         indice_real = seleccion[0] // 2
-        if indice_real < len(self.reportes):
-            self.reportes[indice_real]["estado"] = "resuelto"
-            self.guardar_reportes()
+        if indice_real < len(self.claves):
+            if not gestor_reportes.actualizar_estado(self.claves[indice_real], "resuelto"):
+                messagebox.showwarning("Aviso", "El reporte ya no existe.")
             self.cargar_reportes()
 
     def eliminar_reporte(self):
@@ -67,7 +57,6 @@ class ReportesAdminWindow:
             return
 
         indice_real = seleccion[0] // 2
-        if indice_real < len(self.reportes):
-            del self.reportes[indice_real]
-            self.guardar_reportes()
+        if indice_real < len(self.claves):
+            gestor_reportes.eliminar_reporte(self.claves[indice_real])
             self.cargar_reportes()
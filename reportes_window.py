@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-import json
-import os
+import gestor_reportes
 
 class ReportesWindow:
     def __init__(self, master, usuario):
@@ -37,22 +36,7 @@ class ReportesWindow:
             "estado": "pendiente"
         }
 
-        if not os.path.exists("reportes.json"):
-            with open("reportes.json", "w") as f:
-                json.dump([], f)
-
-        with open("reportes.json", "r") as f:
-            try:
-                reportes = json.load(f)
-                if not isinstance(reportes, list):
-                    reportes = []
-            except json.JSONDecodeError:
-                reportes = []
-
-        reportes.append(reporte)
-
-        with open("reportes.json", "w") as f:
-            json.dump(reportes, f, indent=4)
+        gestor_reportes.insertar_reporte(reporte)
 
         messagebox.showinfo("Enviado", "Reporte enviado correctamente.")
         self.master.destroy()
@@ -66,8 +50,7 @@ class ReportesWindow:
         tk.Label(estado_window, text=f"Reportes de {self.usuario}", font=("Arial", 12, "bold")).pack(pady=10)
 
         try:
-            with open("reportes.json", "r") as f:
-                reportes = json.load(f)
+            reportes = gestor_reportes.cargar_reportes()
         except:
             reportes = []
 
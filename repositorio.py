@@ -0,0 +1,121 @@
+from indices import IndiceJuegos
+from storage import transaccion
+
+# -----------------------------------------------------------------------------
+# repositorio.py – Registros de una colección en memoria, compartidos
+# -----------------------------------------------------------------------------
+# Las ventanas de salas y del foro buscaban el registro seleccionado
+# recorriendo su lista completa. Un Repositorio carga una vez la colección de
+# storage.py y la mantiene en memoria indexada por id (dict) y por juego, con
+# los ids en orden de creación como vista ordenada. Cada colección tiene un
+# único Repositorio por proceso (ver repositorio()), así que todas las ventanas
+# que la usan ven los mismos datos y las acciones sobre la selección son O(1).
+#
+# Las escrituras pasan por el repositorio: guardan el registro en storage.py y
+# actualizan los índices en memoria. recargar() vuelve a leer la colección
+# (botón "Actualizar") para ver cambios hechos por otros procesos. modificar()
+# aplica un cambio sobre la versión más reciente de la base, de modo que no
+# pisa lo que otro proceso haya guardado en el mismo registro.
+# -----------------------------------------------------------------------------
+
+# nombre de la colección -> Repositorio
+_repositorios = {}
+
+
+def repositorio(coleccion, al_cargar=None):
+    """
+    Devuelve el Repositorio compartido de *coleccion*, creándolo la primera vez.
+
+    Args:
+        coleccion (Coleccion): Colección de storage.py cuyos registros tienen "id".
+        al_cargar (callable): Opcional. Se llama con cada registro leído de la
+            base (para completar o migrar datos antiguos).
+    """
+    if coleccion.nombre not in _repositorios:
+        _repositorios[coleccion.nombre] = Repositorio(coleccion, al_cargar)
+    return _repositorios[coleccion.nombre]
+
+
+class Repositorio(IndiceJuegos):
+    """
+    Colección en memoria: dict por id, ids en orden de creación e índice por juego.
+
+    Args:
+        coleccion (Coleccion): Colección de storage.py que respalda los datos.
+        al_cargar (callable): Opcional. Se llama con cada registro leído.
+    """
+
+    def __init__(self, coleccion, al_cargar=None):
+        self.coleccion = coleccion
+        self.al_cargar = al_cargar
+        super().__init__()
+        self.recargar()
+
+    def recargar(self):
+        """Vuelve a leer todos los registros de la base."""
+        registros = self.coleccion.todos()
+        if self.al_cargar:
+            for registro in registros:
+                self.al_cargar(registro)
+        IndiceJuegos.__init__(self, registros)
+
+    def registros(self):
+        """Registros en orden de creación."""
+        return [self.por_id[registro_id] for registro_id in self.todos]
+
+    def guardar(self, registro):
+        """Guarda un registro nuevo o modificado y actualiza los índices."""
+        self.coleccion.guardar(registro["id"], registro)
+        if registro["id"] in self.por_id:
+            self.por_id[registro["id"]] = registro
+            self.mover(registro["id"])
+        else:
+            self.agregar(registro)
+
+    def modificar(self, registro_id, cambio):
+        """
+        Aplica *cambio* a la versión más reciente de un registro y lo guarda.
+
+        Ver Coleccion.modificar(). Devuelve (registro, motivo); el registro en
+        memoria se sustituye por el leído de la base, y se quita si otro
+        proceso lo había eliminado.
+        """
+        def cambio_completo(registro):
+            if self.al_cargar:
+                self.al_cargar(registro)
+            return cambio(registro)
+
+        registro, motivo = self.coleccion.modificar(registro_id, cambio_completo)
+        if registro is None:
+            self.quitar(registro_id)
+        elif registro_id in self.por_id:
+            self.por_id[registro_id] = registro
+            self.mover(registro_id)
+        else:
+            self.agregar(registro)
+        return registro, motivo
+
+    def eliminar(self, registro_id):
+        """Elimina un registro. Devuelve el registro eliminado o None."""
+        self.coleccion.eliminar(registro_id)
+        return self.quitar(registro_id)
+
+    def renombrar_juego(self, juego, nuevo_nombre):
+        """
+        Cambia el juego de todos sus registros y los guarda en un solo commit.
+
+        Si falla alguna escritura no se guarda ninguna, el índice en memoria
+        se vuelve a leer de la base y la excepción se propaga.
+
+        Returns:
+            int: Número de registros que cambiaron.
+        """
+        registros = self.renombrar(juego, nuevo_nombre)
+        try:
+            with transaccion():
+                for registro in registros:
+                    self.coleccion.guardar(registro["id"], registro)
+        except Exception:
+            self.recargar()
+            raise
+        return len(registros)
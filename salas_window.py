@@ -3,6 +3,10 @@ from tkinter import ttk, scrolledtext, messagebox
 import json
 import datetime
 import os
+from storage import Coleccion
+from indices import IndiceJuegos
+from repositorio import repositorio
+import chat_sala
 
 class SalasWindow:
     """
@@ -14,8 +18,10 @@ class SalasWindow:
     Atributos:
         master (tk.Tk): La ventana principal de Tkinter.
         usuario (str): Nombre del usuario que ha iniciado sesión.
-        data_file (str): Ruta del archivo JSON para almacenar las salas.
+        data_file (str): Ruta del archivo JSON antiguo de salas (se importa a storage).
         is_admin (bool): Indica si el usuario tiene privilegios de administrador.
+        repositorio (Repositorio): Salas en memoria por ID y por juego, compartidas
+            con las demás ventanas de salas.
     """
     def __init__(self, master, usuario, is_admin=False):
         self.master = master
@@ -55,17 +61,17 @@ class SalasWindow:
     
     def cargar_salas(self):
         """
-        Carga las salas desde el archivo JSON.
+        Carga las salas desde el almacenamiento.
         
-        Si el archivo no existe, crea salas de ejemplo.
+        Si la colección no existía, crea salas de ejemplo. En caso de error,
+        deja un índice vacío y las acciones que escriben quedan desactivadas.
         """
+        self.carga_fallida = False
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    self.salas = json.load(f)
-            else:
+            self.coleccion = Coleccion("salas", self.data_file)
+            if self.coleccion.recien_creada:
                 # Crear algunas salas de ejemplo
-                self.salas = [
+                for sala in [
                     {
                         "id": 1,
                         "nombre": "Equipo Rankeds",
@@ -90,22 +96,55 @@ class SalasWindow:
                         "estado": "abierta",
                         "requisitos": "Cualquier nivel"
                     }
-                ]
-                self.guardar_salas()
+                ]:
+                    self.coleccion.guardar(sala["id"], sala)
+            # Las salas se leen de la base solo la primera vez (o al pulsar "Actualizar")
+            self.repositorio = repositorio(self.coleccion)
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar las salas: {str(e)}")
-            self.salas = []
+            self.repositorio = IndiceJuegos()  # Sin guardar/recargar: ver crear_widgets()
+            self.carga_fallida = True
     
-    def guardar_salas(self):
+    def guardar_sala(self, sala):
         """
-        Guarda las salas en el archivo JSON.
+        Guarda una sala en el almacenamiento.
+        
+        Args:
+            sala (dict): Sala a guardar (nueva o modificada).
         """
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.salas, f, ensure_ascii=False, indent=4)
+            self.repositorio.guardar(sala)
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar las salas: {str(e)}")
     
+    def modificar_sala(self, sala_id, cambio):
+        """
+        Aplica un cambio a la versión más reciente de una sala y la guarda.
+        
+        Otro usuario puede haber modificado la sala desde que se mostró (p. ej.
+        ocupando la última plaza); *cambio* se aplica sobre los datos actuales
+        y hace sus comprobaciones ahí. Ver Coleccion.modificar().
+        
+        Args:
+            sala_id (int): ID de la sala.
+            cambio (callable): Recibe la sala y la modifica; devuelve un motivo
+                para no guardarla o None.
+            
+        Returns:
+            tuple: (sala o None, motivo). Si la sala ya no existe se avisa y se
+            devuelve (None, None); si falla el guardado, (None, "error").
+        """
+        try:
+            sala, motivo = self.repositorio.modificar(sala_id, cambio)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar las salas: {str(e)}")
+            return None, "error"
+        
+        if sala is None:
+            messagebox.showwarning("Sala no encontrada", "La sala ya no existe")
+            self.refrescar_lista()
+        return sala, motivo
+    
     def crear_widgets(self):
         """
         Configura la interfaz gráfica de la ventana de salas.
@@ -136,12 +175,17 @@ class SalasWindow:
         frame_botones = ttk.Frame(frame_salas)
         frame_botones.pack(pady=5, padx=10, fill=tk.X)
         
+        # Si no se pudieron cargar las salas no hay almacenamiento donde escribir
+        estado_botones = tk.DISABLED if self.carga_fallida else tk.NORMAL
+        
         # Botón para crear nueva sala
-        btn_nueva_sala = ttk.Button(frame_botones, text="Nueva sala", command=self.crear_nueva_sala)
+        btn_nueva_sala = ttk.Button(frame_botones, text="Nueva sala", command=self.crear_nueva_sala,
+                                    state=estado_botones)
         btn_nueva_sala.pack(side=tk.LEFT, padx=5)
         
         # Botón para actualizar la lista
-        btn_actualizar = ttk.Button(frame_botones, text="Actualizar", command=self.actualizar_lista)
+        btn_actualizar = ttk.Button(frame_botones, text="Actualizar", command=self.actualizar_lista,
+                                    state=estado_botones)
         btn_actualizar.pack(side=tk.LEFT, padx=5)
         
         # Lista de salas
@@ -185,7 +229,7 @@ class SalasWindow:
         self.crear_panel_detalles()
         
         # Cargar salas en la lista
-        self.actualizar_lista()
+        self.refrescar_lista()
     
     def crear_panel_detalles(self):
         """
@@ -276,25 +320,30 @@ class SalasWindow:
         for item in self.lista_salas.get_children():
             self.lista_salas.delete(item)
             
-        # Filtrar salas por juego seleccionado
-        for sala in self.salas:
-            if seleccion == "Todos" or sala.get("juego") == seleccion:
-                # Formato para mostrar cantidad de miembros: X/Y
-                miembros_str = f"{len(sala['miembros'])}/{sala['capacidad']}"
-                self.lista_salas.insert("", tk.END, iid=str(sala["id"]), 
-                                        values=(sala.get("nombre", "Sin nombre"), 
-                                               sala.get("juego", "General"),
-                                               sala["creador"],
-                                               miembros_str,
-                                               sala["estado"]))
+        # Recorrer solo las salas del juego seleccionado (según el índice)
+        for sala_id in self.repositorio.ids(None if seleccion == "Todos" else seleccion):
+            sala = self.repositorio.obtener(sala_id)
+            # Formato para mostrar cantidad de miembros: X/Y
+            miembros_str = f"{len(sala['miembros'])}/{sala['capacidad']}"
+            self.lista_salas.insert("", tk.END, iid=str(sala["id"]), 
+                                    values=(sala.get("nombre", "Sin nombre"), 
+                                           sala.get("juego", "General"),
+                                           sala["creador"],
+                                           miembros_str,
+                                           sala["estado"]))
     
     def actualizar_lista(self):
         """
         Actualiza la lista de salas.
         """
-        # Cargar salas desde el archivo
-        self.cargar_salas()
-        
+        # Volver a leer las salas (pueden haber cambiado desde otro cliente)
+        self.repositorio.recargar()
+        self.refrescar_lista()
+    
+    def refrescar_lista(self):
+        """
+        Vuelve a mostrar la lista de salas en memoria sin recargarlas.
+        """
         # Actualizar la lista según el filtro actual
         self.filtrar_por_juego()
         
@@ -318,12 +367,8 @@ class SalasWindow:
         self.sala_actual_id = sala_id
         
         # Buscar la sala seleccionada
-        sala = None
-        for s in self.salas:
-            if s["id"] == sala_id:
-                sala = s
-                break
-                
+        sala = self.repositorio.obtener(sala_id)
+        
         if not sala:
             return
             
@@ -488,10 +533,8 @@ class SalasWindow:
                                       "El nombre de la sala debe tener máximo 30 caracteres")
                 return
             
-            # Crear nueva sala
-            nuevo_id = 1
-            if self.salas:
-                nuevo_id = max(sala["id"] for sala in self.salas) + 1
+            # Crear nueva sala (ID reservado en la secuencia de la colección)
+            nuevo_id = self.coleccion.nuevo_id()
                 
             nueva_sala = {
                 "id": nuevo_id,
@@ -506,11 +549,10 @@ class SalasWindow:
                 "requisitos": requisitos if requisitos else "No especificados"
             }
             
-            self.salas.append(nueva_sala)
-            self.guardar_salas()
+            self.guardar_sala(nueva_sala)
             
             # Actualizar la vista
-            self.actualizar_lista()
+            self.refrescar_lista()
             self.lista_salas.selection_set(str(nuevo_id))
             self.mostrar_sala(None)
             
@@ -531,12 +573,8 @@ class SalasWindow:
         sala_id = int(seleccion[0])
         
         # Buscar la sala
-        sala = None
-        for s in self.salas:
-            if s["id"] == sala_id:
-                sala = s
-                break
-                
+        sala = self.repositorio.obtener(sala_id)
+        
         if not sala:
             return
             
@@ -631,6 +669,10 @@ class SalasWindow:
         ttk.Radiobutton(frame_estado, text="Cerrada", 
                        variable=estado_var, value="cerrada").pack(side=tk.LEFT, padx=5)
         
+        # Los expulsados se quitan al guardar, sobre la sala actual
+        miembros = list(sala["miembros"])
+        expulsados = []
+        
         # Gestión de miembros (solo para admin o creador)
         if sala["creador"] == self.usuario or self.is_admin:
             ttk.Label(frame_contenido, text="Gestionar miembros:", 
@@ -648,7 +690,7 @@ class SalasWindow:
             scrollbar_miembros.pack(side=tk.RIGHT, fill=tk.Y)
             
             # Añadir miembros a la lista
-            for miembro in sala["miembros"]:
+            for miembro in miembros:
                 prefijo = " (Creador)" if miembro == sala["creador"] else ""
                 lista_miembros.insert(tk.END, f"{miembro}{prefijo}")
             
@@ -660,7 +702,7 @@ class SalasWindow:
                     return
                     
                 indice = indices[0]
-                miembro = sala["miembros"][indice]
+                miembro = miembros[indice]
                 
                 # No se puede expulsar al creador
                 if miembro == sala["creador"]:
@@ -668,7 +710,8 @@ class SalasWindow:
                     return
                 
                 if messagebox.askyesno("Confirmar", f"¿Estás seguro de expulsar a '{miembro}' de la sala?"):
-                    sala["miembros"].remove(miembro)
+                    miembros.remove(miembro)
+                    expulsados.append(miembro)
                     lista_miembros.delete(indice)
                     messagebox.showinfo("Éxito", f"Usuario '{miembro}' expulsado de la sala")
             
@@ -697,25 +740,38 @@ class SalasWindow:
                                       "El nombre de la sala debe tener máximo 30 caracteres")
                 return
             
-            # Verificar que la capacidad no sea menor que el número actual de miembros
-            if capacidad < len(sala["miembros"]):
-                messagebox.showwarning("Error de capacidad", 
-                                     f"La capacidad no puede ser menor que el número actual de miembros ({len(sala['miembros'])})")
-                return
-            
-            # Actualizar datos de la sala
-            sala["nombre"] = nombre
-            sala["juego"] = juego
-            sala["capacidad"] = capacidad
-            sala["requisitos"] = requisitos if requisitos else "No especificados"
-            sala["descripcion"] = descripcion
-            sala["estado"] = estado
+            # Actualizar la sala actual, no la copia que se abrió: se conservan los
+            # miembros que se hayan unido mientras tanto
+            def editar(sala):
+                for miembro in expulsados:
+                    if miembro in sala["miembros"]:
+                        sala["miembros"].remove(miembro)
+                
+                # Verificar que la capacidad no sea menor que el número actual de miembros
+                if capacidad < len(sala["miembros"]):
+                    return len(sala["miembros"])
+                
+                sala["nombre"] = nombre
+                sala["juego"] = juego
+                sala["capacidad"] = capacidad
+                sala["requisitos"] = requisitos if requisitos else "No especificados"
+                sala["descripcion"] = descripcion
+                sala["estado"] = estado
             
             # Guardar cambios
-            self.guardar_salas()
+            actual, motivo = self.modificar_sala(sala_id, editar)
+            
+            if actual is None:
+                ventana_editar.destroy()
+                return
+            
+            if motivo is not None:
+                messagebox.showwarning("Error de capacidad", 
+                                     f"La capacidad no puede ser menor que el número actual de miembros ({motivo})")
+                return
             
             # Actualizar la vista
-            self.actualizar_lista()
+            self.refrescar_lista()
             
             ventana_editar.destroy()
             messagebox.showinfo("Éxito", "Sala actualizada correctamente")
@@ -733,34 +789,32 @@ class SalasWindow:
             
         sala_id = int(seleccion[0])
         
-        # Buscar la sala
-        sala = None
-        for s in self.salas:
-            if s["id"] == sala_id:
-                sala = s
-                break
-                
-        if not sala:
+        # Las comprobaciones se hacen sobre la sala actual: otro usuario puede
+        # haberse unido desde que se mostró
+        def unirse(sala):
+            if sala["estado"] == "cerrada":
+                return "cerrada"
+            if len(sala["miembros"]) >= sala["capacidad"]:
+                return "llena"
+            if self.usuario in sala["miembros"]:
+                return "miembro"
+            sala["miembros"].append(self.usuario)
+        
+        sala, motivo = self.modificar_sala(sala_id, unirse)
+        
+        if sala is None:
             return
-            
-        # Verificar estado de la sala
-        if sala["estado"] == "cerrada":
+        
+        if motivo == "cerrada":
             messagebox.showwarning("Sala cerrada", "Esta sala no acepta nuevos miembros actualmente")
-            return
-            
-        # Verificar si hay espacio
-        if len(sala["miembros"]) >= sala["capacidad"]:
+        elif motivo == "llena":
             messagebox.showwarning("Sala llena", "Esta sala ya está llena")
-            return
-            
-        # Verificar si ya es miembro
-        if self.usuario in sala["miembros"]:
+        elif motivo == "miembro":
             messagebox.showinfo("Ya eres miembro", "Ya formas parte de esta sala")
+        
+        if motivo is not None:
+            self.mostrar_sala(None)
             return
-            
-        # Unirse a la sala
-        sala["miembros"].append(self.usuario)
-        self.guardar_salas()
         
         # Actualizar vista
         self.mostrar_sala(None)
@@ -777,12 +831,8 @@ class SalasWindow:
         sala_id = int(seleccion[0])
         
         # Buscar la sala
-        sala = None
-        for s in self.salas:
-            if s["id"] == sala_id:
-                sala = s
-                break
-                
+        sala = self.repositorio.obtener(sala_id)
+        
         if not sala:
             return
             
@@ -801,9 +851,16 @@ class SalasWindow:
         if not messagebox.askyesno("Confirmar", f"¿Estás seguro de salir de la sala '{sala['nombre']}'?"):
             return
             
-        # Salir de la sala
-        sala["miembros"].remove(self.usuario)
-        self.guardar_salas()
+        # Salir de la sala (sobre la versión actual, sin perder cambios de otros)
+        def salir(sala):
+            if self.usuario not in sala["miembros"]:
+                return "no_miembro"
+            sala["miembros"].remove(self.usuario)
+        
+        sala, motivo = self.modificar_sala(sala_id, salir)
+        
+        if sala is None:
+            return
         
         # Actualizar vista
         self.mostrar_sala(None)
@@ -820,12 +877,8 @@ class SalasWindow:
         sala_id = int(seleccion[0])
         
         # Buscar la sala
-        sala = None
-        for s in self.salas:
-            if s["id"] == sala_id:
-                sala = s
-                break
-                
+        sala = self.repositorio.obtener(sala_id)
+        
         if not sala:
             return
             
@@ -846,11 +899,13 @@ class SalasWindow:
             return
             
         # Eliminar sala
-        self.salas = [s for s in self.salas if s["id"] != sala_id]
-        self.guardar_salas()
+        try:
+            self.repositorio.eliminar(sala_id)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar las salas: {str(e)}")
         
         # Actualizar interfaz
-        self.actualizar_lista()
+        self.refrescar_lista()
         
         # Limpiar panel de detalles
         self.label_nombre.config(text="Selecciona una sala")
@@ -882,7 +937,9 @@ class SalasWindow:
     def abrir_chat(self):
         """
         Abre una ventana de chat para la sala seleccionada si el usuario es miembro.
-        El chat persistirá entre sesiones usando un archivo JSON para almacenar los mensajes.
+        El chat persiste entre sesiones (ver chat_sala.py). Al abrir solo se leen
+        los últimos mensajes; los anteriores se cargan por páginas al llegar arriba
+        con el scroll y los nuevos se muestran en cuanto llegan.
         """
         seleccion = self.lista_salas.selection()
         if not seleccion:
@@ -891,12 +948,8 @@ class SalasWindow:
         sala_id = int(seleccion[0])
         
         # Buscar la sala
-        sala = None
-        for s in self.salas:
-            if s["id"] == sala_id:
-                sala = s
-                break
-                
+        sala = self.repositorio.obtener(sala_id)
+        
         if not sala:
             return
             
@@ -905,11 +958,8 @@ class SalasWindow:
             messagebox.showinfo("No eres miembro", "Solo los miembros pueden acceder al chat de la sala")
             return
         
-        # Archivo para guardar los mensajes del chat
-        chat_file = f"chat_sala_{sala_id}.json"
-        
-        # Cargar mensajes existentes o crear estructura inicial
-        mensajes = self.cargar_mensajes_chat(chat_file)
+        # Cargar solo la última página de mensajes
+        mensajes, offset_primero, offset_fin = chat_sala.cargar_ultimos(sala_id)
         
         # Crear ventana de chat
         ventana_chat = tk.Toplevel(self.master)
@@ -930,6 +980,34 @@ class SalasWindow:
         # Mostrar mensajes existentes
         self.mostrar_mensajes_chat(text_mensajes, mensajes)
         
+        # Cargar la página anterior cuando el scroll llega arriba
+        estado_historial = {"offset": offset_primero, "cargando": False}
+        
+        def cargar_pagina_anterior():
+            mensajes_previos, estado_historial["offset"] = chat_sala.cargar_anteriores(
+                sala_id, estado_historial["offset"])
+            if mensajes_previos:
+                # Marca en el mensaje que estaba arriba: con gravedad derecha el texto
+                # insertado en "1.0" queda delante y la marca sigue en ese mensaje,
+                # ocupe cada mensaje las líneas que ocupe
+                text_mensajes.mark_set("anterior", "1.0")
+                text_mensajes.mark_gravity("anterior", tk.RIGHT)
+                text_mensajes.config(state=tk.NORMAL)
+                text_mensajes.insert("1.0", "".join(
+                    f"[{msg['timestamp']}] {msg['usuario']}: {msg['contenido']}\n" for msg in mensajes_previos))
+                text_mensajes.config(state=tk.DISABLED)
+                # Mantener a la vista el mensaje que estaba arriba
+                text_mensajes.yview("anterior")
+            estado_historial["cargando"] = False
+        
+        def al_desplazar(primero, ultimo):
+            text_mensajes.vbar.set(primero, ultimo)
+            if float(primero) == 0.0 and estado_historial["offset"] > 0 and not estado_historial["cargando"]:
+                estado_historial["cargando"] = True
+                text_mensajes.after_idle(cargar_pagina_anterior)
+        
+        text_mensajes.config(yscrollcommand=al_desplazar)
+        
         # Entrada de nuevo mensaje
         frame_nuevo = ttk.Frame(ventana_chat)
         frame_nuevo.pack(fill=tk.X, padx=10, pady=5)
@@ -943,24 +1021,8 @@ class SalasWindow:
         def enviar_mensaje():
             mensaje = entry_mensaje.get().strip()
             if mensaje:
-                # Crear nuevo mensaje con timestamp
-                nuevo_mensaje = {
-                    "usuario": self.usuario,
-                    "contenido": mensaje,
-                    "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                # Añadir mensaje a la lista
-                mensajes.append(nuevo_mensaje)
-                
-                # Guardar mensajes en archivo
-                self.guardar_mensajes_chat(chat_file, mensajes)
-                
-                # Mostrar mensaje en la interfaz
-                text_mensajes.config(state=tk.NORMAL)
-                text_mensajes.insert(tk.END, f"[{nuevo_mensaje['timestamp']}] {self.usuario}: {mensaje}\n")
-                text_mensajes.see(tk.END)
-                text_mensajes.config(state=tk.DISABLED)
+                # Guardar el mensaje; la suscripción lo muestra en esta y otras ventanas
+                chat_sala.enviar_mensaje(sala_id, self.usuario, mensaje)
                 entry_mensaje.delete(0, tk.END)
         
         # Bind Enter key
@@ -968,33 +1030,23 @@ class SalasWindow:
         
         ttk.Button(frame_nuevo, text="Enviar", command=enviar_mensaje).pack(side=tk.LEFT, padx=5)
         
-        # Config para actualizar el chat automáticamente
-        def actualizar_chat():
-            # Cargar mensajes más recientes
-            mensajes_actuales = self.cargar_mensajes_chat(chat_file)
-            
-            # Verificar si hay nuevos mensajes comparando la longitud
-            if len(mensajes_actuales) > len(mensajes):
-                # Identificar solo los nuevos mensajes
-                nuevos_mensajes = mensajes_actuales[len(mensajes):]
-                
-                # Actualizar nuestra lista local de mensajes
-                mensajes.extend(nuevos_mensajes)
-                
-                # Mostrar solo los nuevos mensajes
-                text_mensajes.config(state=tk.NORMAL)
-                for msg in nuevos_mensajes:
-                    if msg["usuario"] != self.usuario:  # No mostrar nuestros propios mensajes (ya se muestran al enviarlos)
-                        text_mensajes.insert(tk.END, f"[{msg['timestamp']}] {msg['usuario']}: {msg['contenido']}\n")
-                text_mensajes.see(tk.END)
-                text_mensajes.config(state=tk.DISABLED)
-            
-            # Programar la siguiente actualización en 2 segundos
-            if ventana_chat.winfo_exists():  # Verificar que la ventana aún existe
-                ventana_chat.after(2000, actualizar_chat)
+        # Recibir solo los mensajes nuevos (por número de secuencia) en cuanto llegan
+        def mostrar_nuevos(nuevos_mensajes):
+            text_mensajes.config(state=tk.NORMAL)
+            for msg in nuevos_mensajes:
+                text_mensajes.insert(tk.END, f"[{msg['timestamp']}] {msg['usuario']}: {msg['contenido']}\n")
+            text_mensajes.see(tk.END)
+            text_mensajes.config(state=tk.DISABLED)
         
-        # Iniciar actualización automática
-        ventana_chat.after(2000, actualizar_chat)
+        ultimo_seq = mensajes[-1]["seq"] if mensajes else 0
+        suscripcion = chat_sala.SuscripcionChat(ventana_chat, sala_id, ultimo_seq, offset_fin, mostrar_nuevos)
+        
+        # Dejar de vigilar la sala al cerrar la ventana
+        def al_cerrar(event):
+            if event.widget is ventana_chat:
+                suscripcion.cancelar()
+        
+        ventana_chat.bind("<Destroy>", al_cerrar)
         
         # Lista de miembros en línea
         frame_online = ttk.LabelFrame(ventana_chat, text="Miembros en línea")
@@ -1016,51 +1068,6 @@ class SalasWindow:
         ttk.Button(ventana_chat, text="Cerrar chat", 
                   command=ventana_chat.destroy).pack(pady=10)
 
-    def cargar_mensajes_chat(self, archivo):
-        """
-        Carga los mensajes de chat desde un archivo JSON.
-        
-        Args:
-            archivo (str): Ruta del archivo JSON.
-            
-        Returns:
-            list: Lista de mensajes.
-        """
-        try:
-            if os.path.exists(archivo):
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                # Si no existe el archivo, crear estructura inicial con mensaje de sistema
-                mensajes_iniciales = [
-                    {
-                        "usuario": "Sistema",
-                        "contenido": "¡Bienvenido al chat de sala!",
-                        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                ]
-                # Guardar estructura inicial
-                with open(archivo, 'w', encoding='utf-8') as f:
-                    json.dump(mensajes_iniciales, f, ensure_ascii=False, indent=4)
-                return mensajes_iniciales
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar mensajes del chat: {str(e)}")
-            return []
-
-    def guardar_mensajes_chat(self, archivo, mensajes):
-        """
-        Guarda los mensajes de chat en un archivo JSON.
-        
-        Args:
-            archivo (str): Ruta del archivo JSON.
-            mensajes (list): Lista de mensajes a guardar.
-        """
-        try:
-            with open(archivo, 'w', encoding='utf-8') as f:
-                json.dump(mensajes, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar mensajes del chat: {str(e)}")
-
     def mostrar_mensajes_chat(self, text_widget, mensajes):
         """
         Muestra los mensajes de chat en el widget de texto.
@@ -0,0 +1,854 @@
+import contextlib
+import json
+import os
+import random
+import sqlite3
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: las bitácoras no se bloquean entre procesos
+    fcntl = None
+
+# -----------------------------------------------------------------------------
+# storage.py – Capa de almacenamiento compartida para Teamder
+# -----------------------------------------------------------------------------
+# Antes cada módulo recargaba y reescribía su archivo JSON completo en cada
+# cambio. Este módulo guarda todos los datos en una base SQLite (teamder.db)
+# con un registro por fila, de modo que insertar, actualizar o eliminar cuesta
+# O(registro modificado) y no O(tamaño del archivo).
+#
+# Cada "colección" (usuarios, salas, temas del foro, eventos, ...) vive en la
+# misma tabla, separada por nombre. Un registro tiene:
+#   - clave: identificador único dentro de la colección (id, nombre de usuario...)
+#   - grupo: opcional, para listar subconjuntos (p. ej. recordatorios de un usuario)
+#   - datos: el diccionario del registro serializado como JSON
+#
+# Los archivos JSON antiguos (usuarios.json, salas_data.json, ...) se importan
+# automáticamente la primera vez que se abre cada colección.
+#
+# Ningún guardado reescribe un archivo entero. La base usa el modo WAL de
+# SQLite: cada transacción se añade a un diario de escritura anticipada
+# (teamder.db-wal) y una caída a mitad de escritura solo pierde esa
+# transacción sin confirmar. Con synchronous=NORMAL confirmar no espera al
+# disco (no hay fsync por clic): sincronizar_disco() hace un único fsync para
+# todo lo confirmado desde la vez anterior y la aplicación la llama cada
+# INTERVALO_SINCRONIZACION_MS. Si el proceso muere no se pierde nada
+# confirmado; si se va la luz, como mucho los últimos segundos, y la base
+# sigue íntegra. transaccion() agrupa una ráfaga de escrituras en un commit.
+#
+# Varias instancias de la aplicación pueden usar la misma carpeta a la vez.
+# Cada registro lleva un número de revisión que sube con cada escritura:
+# Coleccion.modificar() lee el registro, aplica el cambio y solo lo guarda si
+# la revisión sigue siendo la leída (compare-and-swap); si otro proceso lo
+# cambió entretanto, vuelve a empezar sobre la versión nueva. Así dos
+# usuarios que se unen a la vez a la misma sala no se pisan, y nadie espera
+# por registros que no toca: SQLite solo serializa el commit, que es corto.
+# Las bitácoras se bloquean por archivo con fcntl.flock (Bitacora.bloqueada).
+# -----------------------------------------------------------------------------
+
+ARCHIVO_BD = "teamder.db"
+INTERVALO_SINCRONIZACION_MS = 2000
+
+# Cada entrada lleva el esquema de la versión i a la i+1 (PRAGMA user_version)
+_MIGRACIONES = [
+    """
+    CREATE TABLE colecciones (
+        nombre TEXT PRIMARY KEY
+    );
+    CREATE TABLE registros (
+        orden INTEGER PRIMARY KEY AUTOINCREMENT,
+        coleccion TEXT NOT NULL,
+        clave TEXT NOT NULL,
+        grupo TEXT,
+        datos TEXT NOT NULL,
+        UNIQUE (coleccion, clave)
+    );
+    CREATE INDEX idx_registros_grupo ON registros (coleccion, grupo, orden);
+    """,
+    """
+    CREATE TABLE secuencias (
+        nombre TEXT PRIMARY KEY,
+        valor INTEGER NOT NULL
+    );
+    """,
+    """
+    ALTER TABLE colecciones ADD COLUMN version INTEGER NOT NULL DEFAULT 0;
+    """,
+    """
+    ALTER TABLE registros ADD COLUMN revision INTEGER NOT NULL DEFAULT 0;
+    """,
+]
+
+# Veces que modificar() reintenta cuando otro proceso cambia el mismo registro
+MAX_INTENTOS = 20
+
+_conexion = None
+_profundidad = 0                  # Bloques transaccion() abiertos (anidados)
+_sin_sincronizar = False          # Hay commits que aún no pasaron por fsync
+_bitacoras_sin_sincronizar = set()  # Rutas de bitácoras con anexos sin fsync
+_archivos_bloqueados = {}         # Ruta -> [archivo con el flock, bloques anidados]
+
+
+class ConflictoConcurrencia(Exception):
+    """Otro proceso modificó el mismo registro en cada uno de los intentos."""
+
+# -----------------------------------------------------------------------------
+# Conexión y esquema
+# -----------------------------------------------------------------------------
+
+def conexion():
+    """Devuelve la conexión SQLite del proceso, creándola si hace falta."""
+    global _conexion
+    if _conexion is None:
+        # Sin transacciones implícitas: las abre transaccion()
+        _conexion = sqlite3.connect(ARCHIVO_BD, isolation_level=None)
+        _conexion.execute("PRAGMA journal_mode = WAL")
+        _conexion.execute("PRAGMA synchronous = NORMAL")
+        _migrar_esquema(_conexion)
+    return _conexion
+
+
+def _migrar_esquema(con):
+    """Aplica las migraciones pendientes según PRAGMA user_version."""
+    # La versión se lee ya con el bloqueo de escritura: si otro proceso migra a la vez, se espera
+    with transaccion():
+        version = con.execute("PRAGMA user_version").fetchone()[0]
+        for i, script in enumerate(_MIGRACIONES[version:], start=version):
+            # executescript() confirmaría la transacción: sentencia a sentencia
+            for sentencia in script.split(";"):
+                if sentencia.strip():
+                    con.execute(sentencia)
+            con.execute(f"PRAGMA user_version = {i + 1}")
+
+
+@contextlib.contextmanager
+def transaccion():
+    """
+    Ejecuta un bloque de escrituras como una sola transacción (commit de grupo).
+
+    Todas las escrituras de este módulo pasan por aquí. Los bloques se pueden
+    anidar: solo el más externo confirma, y un bloque interno que falla
+    deshace solo lo suyo (SAVEPOINT). Así una ráfaga de cambios cuesta un
+    único commit y se guarda entera o nada:
+
+        with transaccion():
+            for tema in temas:
+                coleccion.guardar(tema["id"], tema)
+    """
+    global _profundidad, _sin_sincronizar
+    con = conexion()
+    punto = f"t{_profundidad}"
+    # IMMEDIATE toma el bloqueo de escritura al empezar, no a mitad del bloque
+    con.execute("BEGIN IMMEDIATE" if _profundidad == 0 else f"SAVEPOINT {punto}")
+    _profundidad += 1
+    try:
+        yield con
+    except BaseException:
+        _profundidad -= 1
+        if _profundidad == 0:
+            con.execute("ROLLBACK")
+        else:
+            con.execute(f"ROLLBACK TO {punto}")
+            con.execute(f"RELEASE {punto}")
+        raise
+    _profundidad -= 1
+    if _profundidad:
+        con.execute(f"RELEASE {punto}")
+        return
+    try:
+        con.execute("COMMIT")
+    except sqlite3.Error:
+        con.execute("ROLLBACK")
+        raise
+    _sin_sincronizar = True
+
+
+def sincronizar_disco():
+    """
+    Lleva al disco (fsync) todo lo confirmado desde la llamada anterior.
+
+    Hace un solo checkpoint del WAL y un fsync por bitácora modificada, sin
+    importar cuántos cambios hubo. Devuelve True si había algo pendiente.
+    """
+    global _sin_sincronizar
+    pendiente = _sin_sincronizar or bool(_bitacoras_sin_sincronizar)
+    if _sin_sincronizar and _conexion is not None:
+        _conexion.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    _sin_sincronizar = False
+    while _bitacoras_sin_sincronizar:
+        ruta = _bitacoras_sin_sincronizar.pop()
+        if os.path.exists(ruta):
+            with open(ruta, "ab") as f:
+                os.fsync(f.fileno())
+    return pendiente
+
+
+def sincronizar_periodicamente(root):
+    """
+    Llama a sincronizar_disco() ahora y cada INTERVALO_SINCRONIZACION_MS en el bucle de *root*.
+
+    Hay que llamarla con cada ventana raíz que ejecute mainloop(): al
+    destruir una raíz (p. ej. la del login) se cancelan sus after().
+    """
+    sincronizar_disco()
+    root.after(INTERVALO_SINCRONIZACION_MS, sincronizar_periodicamente, root)
+
+
+def cerrar():
+    """Sincroniza y cierra la conexión del proceso (al salir)."""
+    global _conexion
+    sincronizar_disco()
+    if _conexion is not None:
+        _conexion.close()
+        _conexion = None
+
+
+def escribir_json(ruta, datos, **opciones):
+    """
+    Reemplaza un archivo JSON de forma atómica.
+
+    Escribe en un temporal del mismo directorio, lo sincroniza y lo renombra
+    sobre *ruta*: si el proceso muere a mitad, el archivo anterior sigue
+    intacto. *opciones* se pasan a json.dump().
+    """
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, **opciones)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+@contextlib.contextmanager
+def bloquear_archivo(ruta):
+    """
+    Bloqueo exclusivo de *ruta* frente a otros procesos (fcntl.flock).
+
+    Se puede anidar dentro del mismo proceso. Crea el archivo si no existe y
+    devuelve el archivo abierto en modo "a+b".
+    """
+    entrada = _archivos_bloqueados.get(ruta)
+    if entrada is None:
+        archivo = open(ruta, "a+b")
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        entrada = _archivos_bloqueados[ruta] = [archivo, 0]
+    entrada[1] += 1
+    try:
+        yield entrada[0]
+    finally:
+        entrada[1] -= 1
+        if entrada[1] == 0:
+            del _archivos_bloqueados[ruta]
+            entrada[0].close()  # Cerrar el archivo libera el flock
+
+# -----------------------------------------------------------------------------
+# Secuencias y contadores
+# -----------------------------------------------------------------------------
+
+def siguiente_valor(nombre, inicial=None):
+    """
+    Devuelve el siguiente valor de la secuencia *nombre* (1, 2, 3...).
+
+    El contador se guarda en la base, así que nunca se repite un valor aunque
+    se borren registros o haya varios procesos creando a la vez (el incremento
+    y la lectura van en la misma transacción).
+
+    Args:
+        nombre (str): Nombre de la secuencia.
+        inicial (callable): Opcional. Si la secuencia aún no existe, se llama
+            para obtener el último valor ya usado (p. ej. el mayor id existente).
+    """
+    con = conexion()
+    existe = con.execute("SELECT 1 FROM secuencias WHERE nombre = ?", (nombre,)).fetchone()
+    valor_inicial = 0 if existe or inicial is None else inicial()
+    with transaccion():
+        con.execute("INSERT OR IGNORE INTO secuencias (nombre, valor) VALUES (?, ?)", (nombre, valor_inicial))
+        con.execute("UPDATE secuencias SET valor = valor + 1 WHERE nombre = ?", (nombre,))
+        return con.execute("SELECT valor FROM secuencias WHERE nombre = ?", (nombre,)).fetchone()[0]
+
+
+def ajustar_contador(nombre, incremento):
+    """
+    Suma *incremento* (puede ser negativo) al contador *nombre* y devuelve el resultado.
+
+    Usa la misma tabla que las secuencias. Un contador inexistente vale 0 y,
+    si vuelve a 0 o menos, se borra. La suma y la lectura van en la misma
+    transacción, así que varios procesos pueden ajustarlo a la vez.
+    """
+    with transaccion() as con:
+        con.execute("INSERT OR IGNORE INTO secuencias (nombre, valor) VALUES (?, 0)", (nombre,))
+        con.execute("UPDATE secuencias SET valor = valor + ? WHERE nombre = ?", (incremento, nombre))
+        valor = con.execute("SELECT valor FROM secuencias WHERE nombre = ?", (nombre,)).fetchone()[0]
+        if valor <= 0:
+            con.execute("DELETE FROM secuencias WHERE nombre = ?", (nombre,))
+        return valor
+
+
+def valor_secuencia(nombre):
+    """Valor actual de la secuencia o contador *nombre* (0 si no existe), sin modificarlo."""
+    fila = conexion().execute("SELECT valor FROM secuencias WHERE nombre = ?", (nombre,)).fetchone()
+    return fila[0] if fila else 0
+
+
+def eliminar_secuencia(nombre):
+    """Borra la secuencia o contador *nombre* (cuando se elimina lo que numeraba)."""
+    with transaccion() as con:
+        con.execute("DELETE FROM secuencias WHERE nombre = ?", (nombre,))
+
+# -----------------------------------------------------------------------------
+# Importadores de los JSON antiguos
+# -----------------------------------------------------------------------------
+# Reciben el contenido del archivo y devuelven tuplas (clave, registro, grupo).
+# Si la clave es None se genera una automáticamente.
+
+def importar_lista(datos):
+    """Lista de diccionarios con campo "id" (salas, temas, eventos, equipos...)."""
+    for registro in datos:
+        yield registro.get("id"), registro, None
+
+
+def importar_diccionario(datos):
+    """Diccionario {clave: registro} (usuarios.json)."""
+    for clave, registro in datos.items():
+        yield clave, registro, None
+
+
+def importar_agrupado(datos):
+    """Diccionario {grupo: [registros]} (calendario.json)."""
+    for grupo, registros in datos.items():
+        for registro in registros:
+            yield None, registro, grupo
+
+# -----------------------------------------------------------------------------
+# Colección
+# -----------------------------------------------------------------------------
+
+class Coleccion:
+    """
+    Acceso por registro a una colección guardada en teamder.db.
+
+    Cada escritura que cambia algún registro incrementa la versión de la
+    colección (tabla colecciones) en la misma transacción, para que las cachés
+    sepan si deben volver a leerla. Cada registro tiene además su propia
+    revisión, que usan obtener_con_revision(), reemplazar_si() y modificar()
+    para no perder cambios hechos a la vez desde otro proceso.
+
+    Atributos:
+        nombre (str): Nombre de la colección dentro de la base.
+        recien_creada (bool): True si la colección no existía y no había un
+            JSON antiguo que importar (útil para crear datos de ejemplo).
+    """
+
+    def __init__(self, nombre, archivo_json=None, importar=importar_lista):
+        self.nombre = nombre
+        self.recien_creada = self._registrar(archivo_json, importar)
+
+    def _registrar(self, archivo_json, importar):
+        """Da de alta la colección e importa su JSON antiguo la primera vez."""
+        con = conexion()
+        if con.execute("SELECT 1 FROM colecciones WHERE nombre = ?", (self.nombre,)).fetchone():
+            return False
+
+        with transaccion():
+            cursor = con.execute("INSERT OR IGNORE INTO colecciones (nombre) VALUES (?)", (self.nombre,))
+            if cursor.rowcount == 0:
+                return False  # Otro proceso la registró primero
+            if not archivo_json or not os.path.exists(archivo_json):
+                return True
+            with open(archivo_json, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            self._insertar_varios(con, importar(datos))
+        return False
+
+    def _insertar(self, con, clave, registro, grupo):
+        if clave is None:
+            clave = uuid.uuid4().hex
+        con.execute(
+            "INSERT INTO registros (coleccion, clave, grupo, datos) VALUES (?, ?, ?, ?)",
+            (self.nombre, str(clave), grupo, json.dumps(registro, ensure_ascii=False))
+        )
+        self._nueva_version(con)
+        return str(clave)
+
+    def _insertar_varios(self, con, tuplas):
+        filas = (
+            (self.nombre, uuid.uuid4().hex if clave is None else str(clave), grupo,
+             json.dumps(registro, ensure_ascii=False))
+            for clave, registro, grupo in tuplas
+        )
+        cursor = con.executemany(
+            "INSERT INTO registros (coleccion, clave, grupo, datos) VALUES (?, ?, ?, ?)", filas
+        )
+        if cursor.rowcount:
+            self._nueva_version(con)
+        return cursor.rowcount
+
+    def _nueva_version(self, con):
+        con.execute("UPDATE colecciones SET version = version + 1 WHERE nombre = ?", (self.nombre,))
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def version(self):
+        """Versión actual de la colección (cambia con cada escritura)."""
+        return conexion().execute(
+            "SELECT version FROM colecciones WHERE nombre = ?", (self.nombre,)
+        ).fetchone()[0]
+
+    def obtener(self, clave):
+        """Devuelve el registro con esa clave o None."""
+        fila = conexion().execute(
+            "SELECT datos FROM registros WHERE coleccion = ? AND clave = ?",
+            (self.nombre, str(clave))
+        ).fetchone()
+        return json.loads(fila[0]) if fila else None
+
+    def obtener_con_revision(self, clave):
+        """Devuelve (registro, revisión) del registro con esa clave, o (None, None)."""
+        fila = conexion().execute(
+            "SELECT datos, revision FROM registros WHERE coleccion = ? AND clave = ?",
+            (self.nombre, str(clave))
+        ).fetchone()
+        return (json.loads(fila[0]), fila[1]) if fila else (None, None)
+
+    def items(self, grupo=None):
+        """Lista de (clave, registro) en orden de inserción."""
+        if grupo is None:
+            filas = conexion().execute(
+                "SELECT clave, datos FROM registros WHERE coleccion = ? ORDER BY orden",
+                (self.nombre,)
+            )
+        else:
+            filas = conexion().execute(
+                "SELECT clave, datos FROM registros WHERE coleccion = ? AND grupo = ? ORDER BY orden",
+                (self.nombre, str(grupo))
+            )
+        return [(clave, json.loads(datos)) for clave, datos in filas]
+
+    def todos(self, grupo=None):
+        """Lista de registros en orden de inserción."""
+        return [registro for _, registro in self.items(grupo)]
+
+    def contar(self, grupo=None):
+        """Número de registros (de un grupo, si se indica)."""
+        if grupo is None:
+            fila = conexion().execute(
+                "SELECT COUNT(*) FROM registros WHERE coleccion = ?", (self.nombre,)
+            ).fetchone()
+        else:
+            fila = conexion().execute(
+                "SELECT COUNT(*) FROM registros WHERE coleccion = ? AND grupo = ?",
+                (self.nombre, str(grupo))
+            ).fetchone()
+        return fila[0]
+
+    def pagina(self, inicio, cantidad, grupo=None):
+        """Hasta *cantidad* registros a partir de la posición *inicio*, en orden de inserción."""
+        if grupo is None:
+            filas = conexion().execute(
+                "SELECT datos FROM registros WHERE coleccion = ? ORDER BY orden LIMIT ? OFFSET ?",
+                (self.nombre, cantidad, inicio)
+            )
+        else:
+            filas = conexion().execute(
+                "SELECT datos FROM registros WHERE coleccion = ? AND grupo = ? ORDER BY orden LIMIT ? OFFSET ?",
+                (self.nombre, str(grupo), cantidad, inicio)
+            )
+        return [json.loads(datos) for datos, in filas]
+
+    def nuevo_id(self):
+        """
+        Reserva el siguiente id numérico de la colección.
+
+        Usa la secuencia con el nombre de la colección; la primera vez parte de
+        la mayor clave numérica existente. Nunca devuelve un id ya usado.
+        """
+        def mayor_clave():
+            fila = conexion().execute(
+                "SELECT MAX(CAST(clave AS INTEGER)) FROM registros WHERE coleccion = ?", (self.nombre,)
+            ).fetchone()
+            return fila[0] or 0
+
+        return siguiente_valor(self.nombre, mayor_clave)
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def insertar(self, registro, clave=None, grupo=None):
+        """Inserta un registro nuevo y devuelve su clave."""
+        with transaccion() as con:
+            return self._insertar(con, clave, registro, grupo)
+
+    def insertar_varios(self, tuplas):
+        """
+        Inserta muchos registros en una sola transacción.
+
+        Args:
+            tuplas (iterable): (clave, registro, grupo), como las de los
+                importadores; se consumen sin guardarlas todas en memoria.
+
+        Returns:
+            int: Número de registros insertados.
+        """
+        with transaccion() as con:
+            return self._insertar_varios(con, tuplas)
+
+    def actualizar(self, clave, registro):
+        """Reemplaza los datos de un registro existente. Devuelve True si existía."""
+        with transaccion() as con:
+            cursor = con.execute(
+                "UPDATE registros SET datos = ?, revision = revision + 1 WHERE coleccion = ? AND clave = ?",
+                (json.dumps(registro, ensure_ascii=False), self.nombre, str(clave))
+            )
+            if cursor.rowcount:
+                self._nueva_version(con)
+        return cursor.rowcount > 0
+
+    def reemplazar_si(self, clave, registro, revision):
+        """
+        Reemplaza un registro solo si sigue en la revisión *revision* (compare-and-swap).
+
+        Returns:
+            bool: False si otro proceso lo cambió o lo eliminó después de leerlo.
+        """
+        with transaccion() as con:
+            cursor = con.execute(
+                "UPDATE registros SET datos = ?, revision = revision + 1 "
+                "WHERE coleccion = ? AND clave = ? AND revision = ?",
+                (json.dumps(registro, ensure_ascii=False), self.nombre, str(clave), revision)
+            )
+            if cursor.rowcount:
+                self._nueva_version(con)
+        return cursor.rowcount > 0
+
+    def modificar(self, clave, cambio, intentos=MAX_INTENTOS):
+        """
+        Lee, modifica y guarda un registro sin pisar cambios de otros procesos.
+
+        *cambio* recibe la versión más reciente del registro y la modifica en
+        el sitio. Puede devolver un motivo (cualquier valor distinto de None)
+        para no guardar nada, p. ej. "llena" si la sala ya no tiene plazas. Si
+        otro proceso cambió el registro entre la lectura y la escritura, se
+        vuelve a leer y se llama otra vez a *cambio*, así que las
+        comprobaciones que haga siempre ven datos actuales.
+
+        Returns:
+            tuple: (registro, motivo). registro es None si no existe; motivo es
+            None si el cambio se guardó.
+
+        Raises:
+            ConflictoConcurrencia: Si el registro cambió en todos los intentos.
+        """
+        for intento in range(intentos):
+            registro, revision = self.obtener_con_revision(clave)
+            if registro is None:
+                return None, None
+            motivo = cambio(registro)
+            if motivo is not None:
+                return registro, motivo
+            if self.reemplazar_si(clave, registro, revision):
+                return registro, None
+            # Espera aleatoria creciente para no chocar otra vez con el mismo proceso
+            time.sleep(random.uniform(0, 0.002 * (intento + 1)))
+        raise ConflictoConcurrencia(f"No se pudo modificar '{clave}' en {self.nombre}")
+
+    def guardar(self, clave, registro, grupo=None):
+        """Inserta o actualiza el registro con esa clave."""
+        with transaccion() as con:
+            con.execute(
+                "INSERT INTO registros (coleccion, clave, grupo, datos) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (coleccion, clave) DO UPDATE SET datos = excluded.datos, revision = revision + 1",
+                (self.nombre, str(clave), grupo, json.dumps(registro, ensure_ascii=False))
+            )
+            self._nueva_version(con)
+
+    def renombrar(self, clave, nueva_clave):
+        """Cambia la clave de un registro. Devuelve False si la nueva ya existe."""
+        try:
+            with transaccion() as con:
+                cursor = con.execute(
+                    "UPDATE registros SET clave = ?, revision = revision + 1 WHERE coleccion = ? AND clave = ?",
+                    (str(nueva_clave), self.nombre, str(clave))
+                )
+                if cursor.rowcount:
+                    self._nueva_version(con)
+        except sqlite3.IntegrityError:
+            return False
+        return cursor.rowcount > 0
+
+    def eliminar(self, clave):
+        """Elimina el registro con esa clave. Devuelve True si existía."""
+        with transaccion() as con:
+            cursor = con.execute(
+                "DELETE FROM registros WHERE coleccion = ? AND clave = ?",
+                (self.nombre, str(clave))
+            )
+            if cursor.rowcount:
+                self._nueva_version(con)
+        return cursor.rowcount > 0
+
+    def eliminar_grupo(self, grupo):
+        """Elimina todos los registros de un grupo. Devuelve cuántos había."""
+        with transaccion() as con:
+            cursor = con.execute(
+                "DELETE FROM registros WHERE coleccion = ? AND grupo = ?",
+                (self.nombre, str(grupo))
+            )
+            if cursor.rowcount:
+                self._nueva_version(con)
+        return cursor.rowcount
+
+# -----------------------------------------------------------------------------
+# Colección en caché
+# -----------------------------------------------------------------------------
+
+def version_datos():
+    """
+    Contador que cambia cuando otra conexión (otro proceso) confirma cambios.
+
+    Es PRAGMA data_version: no lee ningún registro y no cambia con las
+    escrituras de la propia conexión.
+    """
+    return conexion().execute("PRAGMA data_version").fetchone()[0]
+
+
+class ColeccionEnCache:
+    """
+    Copia en memoria de una colección completa, con la misma interfaz que Coleccion.
+
+    Las lecturas se sirven desde un diccionario (sin consultas ni JSON). Las
+    escrituras hechas a través de esta clase actualizan la base y la copia a
+    la vez. Para detectar cambios de otros procesos:
+      - si PRAGMA data_version no cambió, nadie más escribió: la copia vale;
+      - si cambió, se compara la versión de la colección y solo se vuelve a
+        leer si otro proceso modificó precisamente esta colección.
+
+    Los registros devueltos son los de la caché: si se modifican hay que
+    guardarlos con actualizar() o guardar().
+    """
+
+    def __init__(self, coleccion):
+        self.coleccion = coleccion
+        self.nombre = coleccion.nombre
+        self.registros = None
+        self.version_datos = None
+        self.version = None
+
+    def _vigente(self):
+        version_actual = version_datos()
+        if self.registros is None:
+            self._cargar(version_actual)
+        elif version_actual != self.version_datos:
+            self.version_datos = version_actual
+            if self.coleccion.version() != self.version:
+                self._cargar(version_actual)
+        return self.registros
+
+    def _cargar(self, version_actual):
+        self.version = self.coleccion.version()
+        self.registros = dict(self.coleccion.items())
+        self.version_datos = version_actual
+
+    def _escrito(self):
+        """Cada escritura propia que cambia datos sube la versión de la colección en uno."""
+        self.version += 1
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def obtener(self, clave):
+        """Devuelve el registro con esa clave o None."""
+        return self._vigente().get(str(clave))
+
+    def items(self, grupo=None):
+        """Lista de (clave, registro) en orden de inserción."""
+        if grupo is not None:
+            return self.coleccion.items(grupo)
+        return list(self._vigente().items())
+
+    def todos(self, grupo=None):
+        """Lista de registros en orden de inserción."""
+        if grupo is not None:
+            return self.coleccion.todos(grupo)
+        return list(self._vigente().values())
+
+    def version_vigente(self):
+        """Versión de la colección, tras comprobar si otro proceso la cambió."""
+        self._vigente()
+        return self.version
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def insertar(self, registro, clave=None, grupo=None):
+        """Inserta un registro nuevo y devuelve su clave."""
+        registros = self._vigente()
+        clave = self.coleccion.insertar(registro, clave, grupo)
+        self._escrito()
+        registros[clave] = registro
+        return clave
+
+    def actualizar(self, clave, registro):
+        """Reemplaza los datos de un registro existente. Devuelve True si existía."""
+        registros = self._vigente()
+        if not self.coleccion.actualizar(clave, registro):
+            return False
+        self._escrito()
+        registros[str(clave)] = registro
+        return True
+
+    def guardar(self, clave, registro, grupo=None):
+        """Inserta o actualiza el registro con esa clave."""
+        registros = self._vigente()
+        self.coleccion.guardar(clave, registro, grupo)
+        self._escrito()
+        registros[str(clave)] = registro
+
+    def modificar(self, clave, cambio, intentos=MAX_INTENTOS):
+        """Lee, modifica y guarda un registro sin pisar cambios de otros procesos (ver Coleccion.modificar)."""
+        registros = self._vigente()
+        registro, motivo = self.coleccion.modificar(clave, cambio, intentos)
+        if registro is None:
+            registros.pop(str(clave), None)
+        elif motivo is None:
+            self._escrito()
+            registros[str(clave)] = registro
+        return registro, motivo
+
+    def renombrar(self, clave, nueva_clave):
+        """Cambia la clave de un registro. Devuelve False si la nueva ya existe."""
+        registros = self._vigente()
+        if not self.coleccion.renombrar(clave, nueva_clave):
+            return False
+        self._escrito()
+        # Mantener el orden de inserción, como en la base
+        clave, nueva_clave = str(clave), str(nueva_clave)
+        self.registros = {nueva_clave if k == clave else k: v for k, v in registros.items()}
+        return True
+
+    def eliminar(self, clave):
+        """Elimina el registro con esa clave. Devuelve True si existía."""
+        registros = self._vigente()
+        if not self.coleccion.eliminar(clave):
+            return False
+        self._escrito()
+        registros.pop(str(clave), None)
+        return True
+
+# -----------------------------------------------------------------------------
+# Bitácora de solo anexar
+# -----------------------------------------------------------------------------
+
+class Bitacora:
+    """
+    Archivo de solo anexar con un registro JSON por línea.
+
+    Cada registro se identifica por su offset en bytes dentro del archivo, así
+    que se puede leer directamente sin recorrer el resto. También permite leer
+    los últimos registros (desde el final hacia atrás) y solo lo añadido
+    después de un offset conocido.
+
+    Los anexos de varios procesos no se mezclan: anexar() toma el bloqueo del
+    archivo, y bloqueada() permite leer el final y anexar sin que otro
+    proceso escriba en medio. La lectura no necesita bloqueo.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def existe(self):
+        return os.path.exists(self.ruta)
+
+    def tamano(self):
+        """Offset del final del archivo."""
+        return os.path.getsize(self.ruta)
+
+    def bloqueada(self):
+        """
+        Bloqueo exclusivo de esta bitácora frente a otros procesos (ver bloquear_archivo).
+
+        Es por archivo, así que escribir en una sala no hace esperar a las
+        demás. Crea el archivo si no existe.
+        """
+        return bloquear_archivo(self.ruta)
+
+    def anexar(self, registro):
+        """Añade un registro al final y devuelve su offset."""
+        linea = (json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.bloqueada() as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset:
+                f.seek(offset - 1)
+                if f.read(1) != b"\n":
+                    # Una caída dejó la última línea a medias: queda aparte y los lectores la saltan
+                    linea = b"\n" + linea
+                    offset += 1
+            f.write(linea)
+            f.flush()
+        _bitacoras_sin_sincronizar.add(self.ruta)
+        return offset
+
+    def leer(self, offsets):
+        """Devuelve los registros ubicados en los offsets indicados."""
+        registros = []
+        with open(self.ruta, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                registros.append(json.loads(f.readline()))
+        return registros
+
+    def leer_desde(self, offset):
+        """
+        Registros completos escritos a partir de *offset*.
+
+        Devuelve (registros, nuevo_offset). Una línea a medio escribir se
+        ignora hasta que esté completa.
+        """
+        with open(self.ruta, "rb") as f:
+            f.seek(offset)
+            datos = f.read()
+        fin = datos.rfind(b"\n") + 1
+        return _decodificar(datos[:fin].split(b"\n")), offset + fin
+
+    def leer_anteriores(self, offset, cantidad, bloque=8192):
+        """
+        Hasta *cantidad* registros que terminan justo antes de *offset*.
+
+        Lee el archivo hacia atrás por bloques, así que el coste depende de lo
+        leído y no del tamaño total. Devuelve (registros, offset_del_primero).
+        """
+        if cantidad <= 0 or offset <= 0:
+            return [], offset
+        with open(self.ruta, "rb") as f:
+            inicio = offset
+            datos = b""
+            while inicio > 0 and datos.count(b"\n") < cantidad + 1:
+                paso = min(bloque, inicio)
+                inicio -= paso
+                f.seek(inicio)
+                datos = f.read(paso) + datos
+
+        *lineas, resto = datos.split(b"\n")  # resto: una línea a medio escribir, si la hay
+        if inicio > 0:
+            lineas = lineas[1:]  # La primera puede estar cortada por el bloque
+        lineas = lineas[-cantidad:]
+        primero = offset - len(resto) - sum(len(linea) + 1 for linea in lineas)
+        return _decodificar(lineas), primero
+
+
+def _decodificar(lineas):
+    """Registros de las líneas JSON completas; las vacías o cortadas por una caída se saltan."""
+    registros = []
+    for linea in lineas:
+        try:
+            registros.append(json.loads(linea))
+        except ValueError:
+            continue
+    return registros
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-import json
-import os
+from storage import Coleccion
 
 # -----------------------------------------------------------------------------
 # team_crud.py – CRUD de Equipos para Teamder
@@ -10,7 +9,7 @@ import os
 # leer, actualizar y eliminar equipos dentro de la aplicación Teamder.
 # Cada equipo está compuesto por un id numérico, un nombre, una descripción,
 # el nombre del usuario creador y la lista de miembros.
-# Se guarda todo en un archivo local JSON (equipos.json) para simplificar.
+# Se guarda en la colección "equipos" de storage.py (importada de equipos.json).
 # El estilo y patrón de código imitan al resto del proyecto para encajar con
 # los otros *_window.py.
 # -----------------------------------------------------------------------------
@@ -21,19 +20,34 @@ ARCHIVO_EQUIPOS = "equipos.json"
 # Funciones de persistencia
 # -----------------------------------------------------------------------------
 
+def _coleccion_equipos():
+    """Colección de equipos (clave = id del equipo)."""
+    return Coleccion("equipos", ARCHIVO_EQUIPOS)
+
+
 def _cargar_equipos():
-    """Devuelve la lista de equipos almacenados en equipos.json."""
-    if not os.path.exists(ARCHIVO_EQUIPOS):
-        with open(ARCHIVO_EQUIPOS, "w", encoding="utf-8") as f:
-            json.dump([], f, ensure_ascii=False, indent=4)
-    with open(ARCHIVO_EQUIPOS, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Devuelve la lista de equipos almacenados."""
+    return _coleccion_equipos().todos()
+
+
+def _guardar_equipo(equipo):
+    """Guarda solo el equipo indicado."""
+    _coleccion_equipos().guardar(equipo["id"], equipo)
+
 
+def _modificar_equipo(equipo, cambio):
+    """
+    Aplica *cambio* a la versión guardada más reciente del equipo y lo guarda.
 
-def _guardar_equipos(equipos):
-    """Sobrescribe equipos.json con la lista dada."""
-    with open(ARCHIVO_EQUIPOS, "w", encoding="utf-8") as f:
-        json.dump(equipos, f, ensure_ascii=False, indent=4)
+    Así no se pierden los cambios de otro usuario hechos a la vez (ver
+    Coleccion.modificar). Devuelve (equipo o None si ya no existe, motivo).
+    """
+    return _coleccion_equipos().modificar(equipo["id"], cambio)
+
+
+def _borrar_equipo(equipo):
+    """Elimina el equipo indicado del almacenamiento."""
+    _coleccion_equipos().eliminar(equipo["id"])
 
 # -----------------------------------------------------------------------------
 # Ventana principal del CRUD
@@ -66,14 +80,14 @@ def abrir_crud_equipos(master: tk.Tk | tk.Toplevel, usuario_actual: str) -> None
             return
         descripcion = simpledialog.askstring("Nuevo Equipo", "Descripción del equipo:", parent=ventana) or ""
         nuevo = {
-            "id": max([eq["id"] for eq in equipos] + [0]) + 1,
+            "id": _coleccion_equipos().nuevo_id(),
             "nombre": nombre,
             "descripcion": descripcion,
             "creador": usuario_actual,
             "miembros": [usuario_actual],
         }
         equipos.append(nuevo)
-        _guardar_equipos(equipos)
+        _guardar_equipo(nuevo)
         _refrescar_listbox()
 
     def _seleccionar_equipo() -> dict | None:
@@ -83,6 +97,14 @@ def abrir_crud_equipos(master: tk.Tk | tk.Toplevel, usuario_actual: str) -> None
             return None
         return equipos[sel[0]]
 
+    def _aplicar(equipo, cambio):
+        """Guarda *cambio* sobre el equipo actual, refresca la lista y devuelve el motivo si no se aplicó."""
+        actual, motivo = _modificar_equipo(equipo, cambio)
+        if actual is None:
+            messagebox.showerror("Error", "El equipo ya no existe.")
+        _refrescar_listbox()
+        return motivo
+
     def _editar_equipo():
         equipo = _seleccionar_equipo()
         if not equipo:
@@ -94,10 +116,12 @@ def abrir_crud_equipos(master: tk.Tk | tk.Toplevel, usuario_actual: str) -> None
         if not nuevo_nombre:
             return
         nueva_desc = simpledialog.askstring("Editar Equipo", "Nueva descripción:", initialvalue=equipo["descripcion"], parent=ventana) or equipo["descripcion"]
-        equipo["nombre"] = nuevo_nombre
-        equipo["descripcion"] = nueva_desc
-        _guardar_equipos(equipos)
-        _refrescar_listbox()
+
+        def editar(actual):
+            actual["nombre"] = nuevo_nombre
+            actual["descripcion"] = nueva_desc
+
+        _aplicar(equipo, editar)
 
     def _eliminar_equipo():
         equipo = _seleccionar_equipo()
@@ -109,19 +133,21 @@ def abrir_crud_equipos(master: tk.Tk | tk.Toplevel, usuario_actual: str) -> None
             return
         if messagebox.askyesno("Confirmar", f"¿Eliminar el equipo '{equipo['nombre']}' definitivamente?"):
             equipos.remove(equipo)
-            _guardar_equipos(equipos)
+            _borrar_equipo(equipo)
             _refrescar_listbox()
 
     def _unirse_equipo():
         equipo = _seleccionar_equipo()
         if not equipo:
             return
-        if usuario_actual in equipo["miembros"]:
+        # Se comprueba sobre el equipo actual: otro usuario puede haberse unido entretanto
+        def unirse(actual):
+            if usuario_actual in actual["miembros"]:
+                return "miembro"
+            actual["miembros"].append(usuario_actual)
+
+        if _aplicar(equipo, unirse) == "miembro":
             messagebox.showinfo("Info", "Ya formas parte de este equipo.")
-            return
-        equipo["miembros"].append(usuario_actual)
-        _guardar_equipos(equipos)
-        _refrescar_listbox()
 
     def _salir_equipo():
         equipo = _seleccionar_equipo()
@@ -133,9 +159,13 @@ def abrir_crud_equipos(master: tk.Tk | tk.Toplevel, usuario_actual: str) -> None
         if usuario_actual == equipo["creador"]:
             messagebox.showerror("Error", "El creador no puede salir: debe eliminar el equipo o transferir la propiedad.")
             return
-        equipo["miembros"].remove(usuario_actual)
-        _guardar_equipos(equipos)
-        _refrescar_listbox()
+
+        def salir(actual):
+            if usuario_actual not in actual["miembros"]:
+                return "no_miembro"
+            actual["miembros"].remove(usuario_actual)
+
+        _aplicar(equipo, salir)
 
     # ---------------------------------------------------------------------
     # Ventana y widgets
@@ -0,0 +1,188 @@
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+# -----------------------------------------------------------------------------
+# treeview_virtual.py – Treeview que solo crea las filas visibles
+# -----------------------------------------------------------------------------
+# Un ttk.Treeview normal necesita un item por fila: con decenas de miles de
+# temas, cambiar de filtro supone borrar e insertar todas las filas. Aquí la
+# lista completa es solo una lista de claves (p. ej. el índice de temas de un
+# juego) y el Treeview contiene únicamente las filas que caben en pantalla.
+# Al desplazarse se reemplazan esas pocas filas por las siguientes, así que
+# cambiar de lista y hacer scroll cuesta O(filas visibles).
+#
+# Se usa como un Treeview: heading(), column(), selection(), selection_set() y
+# bind("<<TreeviewSelect>>", ...). Los iid son las claves convertidas a str.
+# Las claves van ordenadas de menor a mayor (como las listas de IndiceJuegos),
+# así que selection_set() encuentra la fila por búsqueda binaria.
+# -----------------------------------------------------------------------------
+
+ALTO_FILA_PREDETERMINADO = 20
+
+
+class TreeviewVirtual(ttk.Frame):
+    """
+    Treeview virtualizado con su propia barra de desplazamiento.
+
+    Args:
+        master (tk.Misc): Widget contenedor.
+        valores (callable): Recibe una clave y devuelve la tupla de valores de
+            su fila.
+        clave_de_iid (callable): Convierte un iid (str) en la clave que
+            representa. Por defecto int.
+        **opciones: Se pasan al ttk.Treeview interno (columns, show...).
+    """
+
+    def __init__(self, master, valores, clave_de_iid=int, **opciones):
+        super().__init__(master)
+        self.valores = valores
+        self.clave_de_iid = clave_de_iid
+        self.claves = []
+        self.inicio = 0
+        self.filas_visibles = 1
+        self.seleccionada = None
+        self.al_seleccionar = []
+
+        self.tree = ttk.Treeview(self, selectmode="browse", **opciones)
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.barra.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._al_cambiar_seleccion)
+        self.tree.bind("<MouseWheel>", self._al_girar_rueda)
+        self.tree.bind("<Button-4>", lambda e: self._desplazar("scroll", -3, "units"))
+        self.tree.bind("<Button-5>", lambda e: self._desplazar("scroll", 3, "units"))
+        self.tree.bind("<Up>", lambda e: self._mover_seleccion(e, -1))
+        self.tree.bind("<Down>", lambda e: self._mover_seleccion(e, 1))
+        self.tree.bind("<Prior>", lambda e: self._mover_seleccion(e, -self.filas_visibles))
+        self.tree.bind("<Next>", lambda e: self._mover_seleccion(e, self.filas_visibles))
+
+    # ------------------------------------------------------------------
+    # Interfaz compatible con ttk.Treeview
+    # ------------------------------------------------------------------
+    def heading(self, columna, **opciones):
+        return self.tree.heading(columna, **opciones)
+
+    def column(self, columna, **opciones):
+        return self.tree.column(columna, **opciones)
+
+    def bind(self, secuencia=None, funcion=None, add=None):
+        """<<TreeviewSelect>> solo se emite cuando el usuario cambia la selección."""
+        if secuencia == "<<TreeviewSelect>>":
+            self.al_seleccionar.append(funcion)
+            return None
+        return self.tree.bind(secuencia, funcion, add)
+
+    def selection(self):
+        return (self.seleccionada,) if self.seleccionada is not None else ()
+
+    def selection_set(self, iid):
+        """Selecciona la fila con ese iid y la desplaza a la vista si hace falta."""
+        clave = self.clave_de_iid(iid)
+        posicion = bisect.bisect_left(self.claves, clave)
+        if posicion < len(self.claves) and self.claves[posicion] == clave:
+            self.seleccionada = str(iid)
+            self._asegurar_visible(posicion)
+            self._dibujar()
+
+    # ------------------------------------------------------------------
+    # Contenido
+    # ------------------------------------------------------------------
+    def mostrar(self, claves):
+        """
+        Reemplaza la lista de filas por *claves* y vuelve al principio.
+
+        *claves* debe estar ordenada de menor a mayor. La lista no se copia:
+        quien la pasa debe reemplazarla o volver a llamar a mostrar() cuando
+        cambie.
+        """
+        self.claves = claves
+        self.inicio = 0
+        self.seleccionada = None
+        self._dibujar()
+
+    def _dibujar(self):
+        """Crea únicamente las filas de la ventana [inicio, inicio + filas_visibles)."""
+        self.tree.delete(*self.tree.get_children())
+        fin = min(len(self.claves), self.inicio + self.filas_visibles)
+        for clave in self.claves[self.inicio:fin]:
+            self.tree.insert("", tk.END, iid=str(clave), values=self.valores(clave))
+
+        if self.seleccionada is not None and self.tree.exists(self.seleccionada):
+            self.tree.selection_set(self.seleccionada)
+
+        total = len(self.claves)
+        if total:
+            self.barra.set(self.inicio / total, fin / total)
+        else:
+            self.barra.set(0, 1)
+
+    def _asegurar_visible(self, posicion):
+        if posicion < self.inicio:
+            self.inicio = posicion
+        elif posicion >= self.inicio + self.filas_visibles:
+            self.inicio = posicion - self.filas_visibles + 1
+
+    def _limitar_inicio(self, inicio):
+        return max(0, min(inicio, len(self.claves) - self.filas_visibles))
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+    def _al_redimensionar(self, event):
+        hijos = self.tree.get_children()
+        caja = self.tree.bbox(hijos[0]) if hijos else None
+        if caja:
+            cabecera, alto_fila = caja[1], caja[3]
+        else:
+            cabecera, alto_fila = 25, ALTO_FILA_PREDETERMINADO
+        filas = max(1, (event.height - cabecera) // alto_fila)
+        if filas != self.filas_visibles:
+            self.filas_visibles = filas
+            self.inicio = self._limitar_inicio(self.inicio)
+            self._dibujar()
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra: ("moveto", fracción) o ("scroll", n, "units"|"pages")."""
+        if accion == "moveto":
+            inicio = int(float(cantidad) * len(self.claves))
+        else:
+            paso = self.filas_visibles if unidad == "pages" else 1
+            inicio = self.inicio + int(cantidad) * paso
+        inicio = self._limitar_inicio(inicio)
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._dibujar()
+        return "break"
+
+    def _al_girar_rueda(self, event):
+        return self._desplazar("scroll", -3 if event.delta > 0 else 3, "units")
+
+    def _al_cambiar_seleccion(self, event):
+        # Al redibujar, el Treeview también emite este evento; solo interesa
+        # cuando el usuario elige una fila distinta.
+        seleccion = self.tree.selection()
+        if seleccion and seleccion[0] != self.seleccionada:
+            self.seleccionada = seleccion[0]
+            for funcion in self.al_seleccionar:
+                funcion(event)
+
+    def _mover_seleccion(self, event, paso):
+        if not self.claves:
+            return "break"
+        hijos = self.tree.get_children()
+        if self.seleccionada in hijos:
+            posicion = self.inicio + hijos.index(self.seleccionada) + paso
+        else:
+            posicion = self.inicio
+        posicion = max(0, min(posicion, len(self.claves) - 1))
+
+        iid = str(self.claves[posicion])
+        self._asegurar_visible(posicion)
+        self._dibujar()
+        self.tree.focus(iid)
+        if iid != self.seleccionada:
+            self.tree.selection_set(iid)
+        return "break"
@@ -1,47 +1,154 @@
-import json
+import hashlib
+import hmac
 import os
 import re
+from storage import Coleccion, ColeccionEnCache, importar_diccionario
 
 ARCHIVO_USUARIOS = "usuarios.json"
 
+# -----------------------------------------------------------------------------
+# Contraseñas
+# -----------------------------------------------------------------------------
+# Las claves se guardan como "scrypt$n$r$p$sal$hash" (hex). Si la versión de
+# OpenSSL no trae scrypt se usa "pbkdf2_sha256$iteraciones$sal$hash".
+# El coste se ajusta con estas constantes (o las variables de entorno
+# TEAMDER_SCRYPT_N / TEAMDER_PBKDF2_ITERACIONES); benchmarks/bench_claves.py
+# mide la latencia de login para elegirlo. Las claves en texto plano o con
+# otro coste se vuelven a hashear en el siguiente login correcto.
+#
+# Un login con un usuario que no existe se comprueba contra un hash ficticio
+# con el mismo coste, para que el tiempo de respuesta no revele qué usuarios
+# existen. Una clave guardada que no se puede interpretar cuenta como
+# contraseña incorrecta.
+
+SCRYPT_N = int(os.environ.get("TEAMDER_SCRYPT_N", 2 ** 14))
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERACIONES = int(os.environ.get("TEAMDER_PBKDF2_ITERACIONES", 200_000))
+BYTES_SAL = 16
+
+_HAY_SCRYPT = hasattr(hashlib, "scrypt")
+_ESQUEMAS = ("scrypt", "pbkdf2_sha256")
+_hash_ficticio = None
+
+def _scrypt(clave, sal, n, r, p):
+    return hashlib.scrypt(clave.encode("utf-8"), salt=sal, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=32)
+
+def _pbkdf2(clave, sal, iteraciones):
+    return hashlib.pbkdf2_hmac("sha256", clave.encode("utf-8"), sal, iteraciones)
+
+def hashear_clave(clave, n=None, iteraciones=None):
+    """Devuelve la clave con sal y hash, lista para guardar."""
+    sal = os.urandom(BYTES_SAL)
+    if _HAY_SCRYPT:
+        n = n or SCRYPT_N
+        resumen = _scrypt(clave, sal, n, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${sal.hex()}${resumen.hex()}"
+    iteraciones = iteraciones or PBKDF2_ITERACIONES
+    return f"pbkdf2_sha256${iteraciones}${sal.hex()}${_pbkdf2(clave, sal, iteraciones).hex()}"
+
+def verificar_clave(clave, guardada):
+    """
+    Comprueba *clave* contra lo guardado (hash o, en datos antiguos, texto plano).
+
+    Devuelve False si lo guardado no se puede interpretar.
+    """
+    if not isinstance(guardada, str):
+        return False
+    partes = guardada.split("$")
+    try:
+        if partes[0] == "scrypt" and len(partes) == 6:
+            n, r, p = (int(x) for x in partes[1:4])
+            calculado = _scrypt(clave, bytes.fromhex(partes[4]), n, r, p)
+            return hmac.compare_digest(calculado.hex(), partes[5])
+        if partes[0] == "pbkdf2_sha256" and len(partes) == 4:
+            calculado = _pbkdf2(clave, bytes.fromhex(partes[2]), int(partes[1]))
+            return hmac.compare_digest(calculado.hex(), partes[3])
+    except (ValueError, OverflowError, MemoryError):
+        return False  # Parámetros o hexadecimal corruptos
+    if partes[0] in _ESQUEMAS:
+        return False  # Hash con un número de campos incorrecto
+    return hmac.compare_digest(clave.encode("utf-8"), guardada.encode("utf-8"))
+
+def simular_verificacion(clave):
+    """Gasta lo mismo que verificar_clave() con el coste actual (para usuarios inexistentes)."""
+    global _hash_ficticio
+    if _hash_ficticio is None:
+        _hash_ficticio = hashear_clave(os.urandom(BYTES_SAL).hex())
+    verificar_clave(clave, _hash_ficticio)
+
+def necesita_rehash(guardada):
+    """True si la clave guardada está en texto plano o con un coste distinto del actual."""
+    partes = guardada.split("$")
+    if _HAY_SCRYPT:
+        return partes[:4] != ["scrypt", str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+    return partes[:2] != ["pbkdf2_sha256", str(PBKDF2_ITERACIONES)]
+
+# -----------------------------------------------------------------------------
+# Usuarios
+# -----------------------------------------------------------------------------
+
+_usuarios = None
+
+def coleccion_usuarios():
+    """
+    Usuarios del proceso (clave = nombre de usuario).
+
+    Todas las ventanas comparten la misma caché en memoria, así que consultar
+    un perfil no lee la base salvo que otro proceso haya escrito en ella.
+    """
+    global _usuarios
+    if _usuarios is None:
+        _usuarios = ColeccionEnCache(Coleccion("usuarios", ARCHIVO_USUARIOS, importar_diccionario))
+    return _usuarios
+
 class UserManager:
+    """
+    Registro, login y permisos de usuarios.
+
+    Consulta la caché compartida de coleccion_usuarios(): cada búsqueda es un
+    acceso a diccionario y los datos (incluido el flag "admin") se invalidan
+    cuando cambian, ya sea desde este proceso o desde otro.
+    """
     def __init__(self):
-        self.usuarios = self.cargar_usuarios()
-        if not os.path.exists(ARCHIVO_USUARIOS):
-            with open(ARCHIVO_USUARIOS, "w") as f:
-                json.dump({}, f)
+        self.coleccion = coleccion_usuarios()
 
     def cargar_usuarios(self):
-        with open(ARCHIVO_USUARIOS, "r") as f:
-            return json.load(f)
+        return dict(self.coleccion.items())
 
-    def guardar_usuarios(self, usuarios):
-        with open(ARCHIVO_USUARIOS, "w") as f:
-            json.dump(usuarios, f, indent=4)
+    def guardar_usuario(self, usuario, datos):
+        self.coleccion.guardar(usuario, datos)
 
     def es_email_valido(self, email):
         patron = r'^[\w\.-]+@[\w\.-]+\.\w+$'
         return re.match(patron, email)
 
     def registrar(self, usuario, email, clave):
-        usuarios = self.cargar_usuarios()
-
-        if usuario in usuarios:
+        if self.coleccion.obtener(usuario) is not None:
             return "Usuario ya existe"
         if not self.es_email_valido(email):
             return "Email inválido"
 
-        usuarios[usuario] = {
+        self.guardar_usuario(usuario, {
             "email": email,
-            "clave": clave
-        }
-
-        self.guardar_usuarios(usuarios)
+            "clave": hashear_clave(clave)
+        })
         return "OK"
 
     def verificar_login(self, usuario, clave):
-        usuarios = self.cargar_usuarios()
-        return usuario in usuarios and usuarios[usuario]["clave"] == clave
+        datos = self.coleccion.obtener(usuario)
+        if datos is None:
+            simular_verificacion(clave)
+            return False
+        if not verificar_clave(clave, datos.get("clave")):
+            return False
+        # Migrar claves en texto plano (o con otro coste) al formato actual
+        if necesita_rehash(datos["clave"]):
+            datos["clave"] = hashear_clave(clave)
+            self.coleccion.actualizar(usuario, datos)
+        return True
 
     def es_admin(self, usuario):
-        return self.usuarios.get(usuario, {}).get("admin", False)
\ No newline at end of file
+        datos = self.coleccion.obtener(usuario)
+        return bool(datos and datos.get("admin", False))